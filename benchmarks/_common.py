@@ -0,0 +1,30 @@
+""" బెంచ్ మార్క్ లకు కామన్ సెటప్: రిపో రూట్ ని path లో పెట్టి, Kivy ని హెడ్ లెస్ గా లోడ్ చేస్తుంది """
+import os
+import sys
+import json
+import time
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+os.environ.setdefault("KIVY_NO_FILELOG", "1")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def timeit(fn, repeat=5):
+    """ fn ని repeat సార్లు నడిపి అత్యుత్తమ సమయం (ms) ఇస్తుంది """
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - t0) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 3)
+
+
+def report(name, results):
+    """ ఫలితాలను JSON గా ప్రింట్ చేస్తుంది (ఇతర స్క్రిప్ట్ లు కూడా వాడుకోవచ్చు) """
+    print(json.dumps({"benchmark": name, "results": results}, indent=2))
+    return results
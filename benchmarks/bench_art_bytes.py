@@ -0,0 +1,38 @@
+""" get_art లోని byte[] -> bytes మార్పిడి: పాత ఒక్కో-బైట్ లూప్ vs java_bytes_to_py (డివైస్ అవసరం లేదు) """
+import random
+from array import array
+
+import _common
+from main import java_bytes_to_py
+
+
+def legacy(art):
+    return bytes([b % 256 for b in art])
+
+
+def fake_byte_arrays(size):
+    """ pyjnius రెండు రకాలుగా byte[] ఇస్తుంది: పాత వెర్షన్లు సైన్డ్ int లిస్ట్, కొత్తవి బఫర్ ఉన్న ByteArray """
+    raw = random.Random(size).randbytes(size)
+    signed = array('b', raw)
+    return raw, signed.tolist(), signed
+
+
+def run(sizes=(256 * 1024, 1024 * 1024, 3 * 1024 * 1024)):
+    results = []
+    for size in sizes:
+        raw, as_list, as_buffer = fake_byte_arrays(size)
+        assert legacy(as_list) == raw == java_bytes_to_py(as_list) == java_bytes_to_py(as_buffer)
+        row = {
+            "bytes": size,
+            "legacy_list_ms": _common.timeit(lambda: legacy(as_list), repeat=3),
+            "bulk_list_ms": _common.timeit(lambda: java_bytes_to_py(as_list)),
+            "bulk_buffer_ms": _common.timeit(lambda: java_bytes_to_py(as_buffer)),
+        }
+        row["speedup_list"] = round(row["legacy_list_ms"] / max(row["bulk_list_ms"], 1e-6), 1)
+        row["speedup_buffer"] = round(row["legacy_list_ms"] / max(row["bulk_buffer_ms"], 1e-6), 1)
+        results.append(row)
+    return _common.report("art_bytes", results)
+
+
+if __name__ == "__main__":
+    run()
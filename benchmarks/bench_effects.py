@@ -0,0 +1,52 @@
+""" ట్రాక్ మారినప్పుడు ఆడియో ఎఫెక్ట్స్ సెటప్: పాత విధానం (ప్రతి load కి 3 release + 3 కొత్తవి) vs AudioEffects చైన్ రీయూజ్.
+స్పేషియల్ ఆడియో సెట్టింగ్ పాటలు మారినా నిలుస్తుందో కూడా చూస్తుంది. """
+import time
+
+import _common
+from fakes import FakeMediaPlayer, FakeEffect
+from bench_track_loading import pump
+import main
+
+
+def legacy_switch(state, session_id):
+    """ పాత release_effects + setup_effects - Virtualizer ఎప్పుడూ ఆఫ్ తో మొదలయ్యేది """
+    for effect in state:
+        effect.release()
+    state[:] = [FakeEffect(0, session_id), FakeEffect(0, session_id), FakeEffect(0, session_id)]
+    state[0].setEnabled(True)
+    return state[1].enabled
+
+
+def run(tracks=20, latency=0.008):
+    FakeEffect.create_latency = latency
+    FakeMediaPlayer.prepare_latency = 0.01
+    results = {"tracks": tracks, "effect_create_latency_ms": latency * 1000}
+
+    FakeEffect.created = FakeEffect.released = 0
+    state, spatial_kept = [], True
+    t0 = time.perf_counter()
+    for i in range(tracks):
+        spatial_kept = legacy_switch(state, 1001) and spatial_kept
+    elapsed = time.perf_counter() - t0
+    results["legacy_rebuild"] = {"setup_ms_per_switch": round(elapsed * 1000 / tracks, 2),
+                                 "native_objects_created": FakeEffect.created,
+                                 "native_objects_released": FakeEffect.released,
+                                 "spatial_kept": spatial_kept}
+
+    FakeEffect.created = FakeEffect.released = 0
+    effects = main.AudioEffects(FakeEffect, FakeEffect, FakeEffect)
+    effects.set_spatial(True)
+    player = main.NativeAudioPlayer(media_player_cls=FakeMediaPlayer, effects=effects)
+    for i in range(tracks):
+        player.load(f"/storage/emulated/0/Music/{i:02}.mp3")
+        while not player.is_prepared: pump(0.005)
+    results["shared_chain"] = {"setup_ms_per_switch": round(effects.total_setup_ms / tracks, 2),
+                               "chain_setups": effects.setups,
+                               "native_objects_created": FakeEffect.created,
+                               "native_objects_released": FakeEffect.released,
+                               "spatial_kept": bool(effects.virtualizer and effects.virtualizer.enabled)}
+    return _common.report("effects", results)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,60 @@
+""" ఫుల్ ప్లేయర్ ఓవర్ లే ని 100 సార్లు ఓపెన్ / క్లోజ్ చేసి విడ్జెట్ లు, current_title బైండింగ్ లు, మెమరీ పెరుగుతున్నాయో చూస్తుంది.
+యాప్ నిజంగా నడుస్తుంది (హెడ్ లెస్ విండో), రన్ టైమ్ ఫైల్స్ టెంప్ ఫోల్డర్ లోకి వెళ్తాయి. """
+import gc
+import os
+import tempfile
+import tracemalloc
+
+import _common
+import main
+from kivy.clock import Clock
+from kivy.uix.widget import Widget
+
+
+def live_widgets():
+    return sum(1 for obj in gc.get_objects() if issubclass(type(obj), Widget))
+
+
+def tree_size(widget):
+    return sum(1 for _ in widget.walk())
+
+
+def run(cycles=100):
+    os.chdir(tempfile.mkdtemp(prefix="vault_bench_"))
+    main.toast = lambda *a, **k: None
+    app = main.PrasadProApp()
+    samples = {}
+
+    def snapshot(label):
+        gc.collect()
+        samples[label] = {"live_widgets": live_widgets(),
+                          "overlay_widgets": tree_size(app.modal),
+                          "current_title_observers": len(app.get_property_observers('current_title')),
+                          "traced_kb": round(tracemalloc.get_traced_memory()[0] / 1024, 1)}
+
+    def cycle(n):
+        """ ఒక ఫ్రేమ్ లో ఓపెన్, తర్వాతి ఫ్రేమ్ లలో క్లోజ్ - యానిమేషన్లు కూడా పూర్తవుతాయి """
+        if n == 1: snapshot("after_1")
+        if n == cycles:
+            snapshot(f"after_{cycles}")
+            tracemalloc.stop()
+            app.stop()
+            return
+        app.open_full_player()
+        app.current_title = f"Track {n}"
+        Clock.schedule_once(lambda dt: app.modal.dismiss(), 0.3)
+        Clock.schedule_once(lambda dt: cycle(n + 1), 0.6)
+
+    def go(dt):
+        tracemalloc.start()
+        cycle(0)
+
+    Clock.schedule_once(go, 1)
+    app.run()
+    first, last = samples["after_1"], samples[f"after_{cycles}"]
+    samples["growth"] = {key: round(last[key] - first[key], 1) for key in first}
+    return _common.report("full_player", samples)
+
+
+if __name__ == "__main__":
+    run()
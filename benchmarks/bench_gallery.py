@@ -0,0 +1,108 @@
+""" గ్యాలరీ గ్రిడ్: 20k ఫోటోల DCIM ఫోల్డర్ - ఫుల్ డీకోడ్ vs draft థంబ్ నెయిల్, డిస్క్ క్యాష్ హిట్,
+లిస్ట్ చేయడం, స్క్రోలింగ్ లో ఒక్కో ఫ్రేమ్ కి మెయిన్ థ్రెడ్ పని (టెక్స్చర్ అప్ లోడ్ లు) మరియు టెక్స్చర్ LRU పరిమితి. """
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+import _common
+import main
+import synthetic
+
+PHOTOS = 20000
+ORIGINALS = 16
+COLS = 4
+ROWS_VISIBLE = 7
+FRAME_S = 1 / 60.0
+
+
+class FrameThumbnails(main.GalleryThumbnails):
+    """ Clock బదులు - బెంచ్ మార్క్ ప్రతి ఫ్రేమ్ లో _upload ని నేరుగా పిలుస్తుంది """
+    def _schedule_upload(self):
+        pass
+
+
+def make_folder(folder, photos):
+    """ కొన్ని నిజమైన 1600x1200 JPEG లు, మిగతావి hardlink లు (వేరే path -> వేరే క్యాష్ కీ) """
+    os.makedirs(folder)
+    originals = []
+    for i in range(ORIGINALS):
+        path = os.path.join(folder, f"IMG_{i:05}.jpg")
+        with open(path, "wb") as out: out.write(synthetic.real_jpeg((1600, 1200), seed=i))
+        originals.append(path)
+    for i in range(ORIGINALS, photos):
+        os.link(originals[i % ORIGINALS], os.path.join(folder, f"IMG_{i:05}.jpg"))
+
+
+def decode_ms(folder, work):
+    """ ఒక్కో ఫోటోకి: Pillow ఫుల్ డీకోడ్ + resize vs draft మోడ్ render vs క్యాష్ హిట్ """
+    from PIL import Image
+    paths = [os.path.join(folder, f"IMG_{i:05}.jpg") for i in range(ORIGINALS)]
+    def full():
+        for path in paths:
+            with Image.open(path) as img: img.convert('RGB').resize((256, 256))
+    thumbs = main.GalleryThumbnails(main.ArtCache(os.path.join(work, "decode_cache")))
+    out = os.path.join(work, "thumb.jpg")
+    def draft():
+        for path in paths: thumbs.render(path, out)
+    for path in paths: thumbs.cache.fetch(path, thumbs.render)
+    def hit():
+        for path in paths: thumbs.cache.fetch(path, thumbs.render)
+    result = {name: round(_common.timeit(fn, 3) / len(paths), 3) for name, fn in (("full_decode_ms", full), ("draft_render_ms", draft), ("cache_hit_ms", hit))}
+    result["thumb_kb"] = round(os.path.getsize(out) / 1024, 1)
+    thumbs._pool.shutdown()
+    return result
+
+
+def scroll(paths, cache_dir, frames, rows_per_frame):
+    """ వేగంగా స్క్రోల్: ప్రతి ఫ్రేమ్ లో కనిపించే టైల్స్ అడుగుతాయి, వెళ్ళిపోయినవి రద్దు చేస్తాయి """
+    thumbs = FrameThumbnails(main.ArtCache(cache_dir, main.GalleryThumbnails.CACHE_BUDGET))
+    shown = {}
+    def show(path, texture): shown[path] = texture
+    visible = set()
+    upload_ms, filled = [], []
+    for frame in range(frames):
+        top = int(frame * rows_per_frame) * COLS
+        now = set(paths[top:top + COLS * ROWS_VISIBLE])
+        t0 = time.perf_counter()
+        for path in visible - now: thumbs.cancel(path, show)
+        for path in now - visible:
+            if thumbs.request(path, show) is not None: shown[path] = True
+        thumbs._upload(0)
+        upload_ms.append((time.perf_counter() - t0) * 1000)
+        visible = now
+        filled.append(sum(1 for path in now if shown.get(path)) / len(now))
+        time.sleep(FRAME_S)
+    decoded = thumbs.decoded
+    thumbs._pool.shutdown()
+    ordered = sorted(upload_ms)
+    return {"frames": frames, "main_thread_p50_ms": round(statistics.median(ordered), 3),
+            "main_thread_p95_ms": round(ordered[int(len(ordered) * 0.95)], 3), "main_thread_max_ms": round(ordered[-1], 3),
+            "tiles_filled_pct": round(statistics.mean(filled) * 100, 1), "decoded": decoded,
+            "textures": len(thumbs.textures), "texture_limit": thumbs.max_textures}
+
+
+def run(photos=PHOTOS):
+    work = tempfile.mkdtemp(prefix="vault_gallery_")
+    try:
+        folder = os.path.join(work, "DCIM", "Camera")
+        make_folder(folder, photos)
+        results = {"photos": photos, "decode": decode_ms(folder, work)}
+        loader = main.GalleryLoader()
+        listed = []
+        loader._post = lambda callback, *args: listed.append(args[1])
+        results["list_folder_ms"] = _common.timeit(lambda: loader._run(folder), 3)
+        paths = listed[-1]
+        cache_dir = os.path.join(work, "cache")
+        # నెమ్మదిగా (ఫ్రేమ్ కి 1/10 వరుస), వేగంగా ఫ్లింగ్ (ఫ్రేమ్ కి 2 వరుసలు), మళ్ళీ పైకి - అప్పుడు డిస్క్ క్యాష్ హిట్ లు
+        results["scroll_slow"] = scroll(paths, cache_dir, 240, 0.1)
+        results["scroll_fling"] = scroll(paths, cache_dir, 240, 2)
+        results["scroll_slow_cached"] = scroll(paths, cache_dir, 240, 0.1)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return _common.report("gallery_grid", results)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,91 @@
+""" పాటల మధ్య గ్యాప్: పాత 1 సెకన్ పోలింగ్ + సింక్ prepare vs completion ఈవెంట్ + prepareAsync vs గ్యాప్ లెస్ (setNextMediaPlayer).
+ఒక పాట 'complete' అయిన దగ్గర్నుండి తర్వాతి 'start' వరకు నిశ్శబ్దాన్ని, ముందే కత్తిరించిన భాగాన్ని కొలుస్తుంది. """
+import time
+
+import _common
+from fakes import FakeMediaPlayer
+from bench_track_loading import legacy_load, pump
+import main
+
+
+def transitions(timeline):
+    """ timeline నుండి ప్రతి మార్పుకి (నిశ్శబ్దం ms) లెక్కిస్తుంది """
+    gaps = []
+    ended = None
+    for stamp, kind, source in timeline:
+        if kind in ('complete', 'cut'): ended = stamp
+        elif kind == 'start' and ended is not None:
+            gaps.append(round((stamp - ended) * 1000, 1))
+            ended = None
+    return gaps
+
+
+def run_legacy(paths, poll=1.0):
+    """ పాత update_music_state: ప్రతి సెకనుకి pos >= dur - 1200 చూసి, UI థ్రెడ్ లో prepare చేసి మార్చేది """
+    fake = FakeMediaPlayer()
+    cut = []
+    legacy_load(fake, paths[0]); fake.start()
+    for path in paths[1:]:
+        while True:
+            time.sleep(poll)
+            pos = fake.getCurrentPosition()
+            if pos >= fake.duration_ms - 1200 or fake.state == 'completed': break
+        if fake.state != 'completed':
+            cut.append(fake.duration_ms - pos)
+            FakeMediaPlayer.timeline.append((time.monotonic(), 'cut', fake.source))
+        legacy_load(fake, path); fake.start()
+    fake.stop()
+    return cut
+
+
+def run_player(paths, gapless):
+    player = main.NativeAudioPlayer(media_player_cls=FakeMediaPlayer)
+    queue = list(paths)
+    played = [queue.pop(0)]
+
+    def ready(path):
+        player.play()
+        if gapless and queue: player.preload_next(queue[0])
+
+    def complete():
+        if queue:
+            played.append(queue.pop(0))
+            player.load(played[-1], on_ready=ready)
+
+    def changed(path):
+        played.append(queue.pop(0))
+        assert path == played[-1], (path, played)
+        if queue: player.preload_next(queue[0])
+
+    player.on_complete = complete
+    player.on_track_changed = changed
+    player.load(played[0], on_ready=ready)
+    while len(played) < len(paths) or player.player.state != 'completed':
+        pump(0.05)
+    return player
+
+
+def run(tracks=4, track_ms=2500, latency=0.25):
+    FakeMediaPlayer.prepare_latency = latency
+    FakeMediaPlayer.duration_ms = track_ms
+    paths = [f"/storage/emulated/0/Music/album/{i:02}.flac" for i in range(tracks)]
+    results = {"tracks": tracks, "track_ms": track_ms, "prepare_latency_ms": latency * 1000}
+
+    FakeMediaPlayer.timeline = []
+    cut = run_legacy(paths)
+    results["legacy_poll_sync_prepare"] = {"silence_ms": transitions(FakeMediaPlayer.timeline), "cut_early_ms": cut}
+
+    FakeMediaPlayer.timeline = []
+    run_player(paths, gapless=False)
+    results["completion_event_prepare_async"] = {"silence_ms": transitions(FakeMediaPlayer.timeline)}
+
+    FakeMediaPlayer.timeline = []
+    player = run_player(paths, gapless=True)
+    results["gapless_next_player"] = {"silence_ms": transitions(FakeMediaPlayer.timeline),
+                                      "shared_session": player.player.getAudioSessionId() == player.session_id}
+    FakeMediaPlayer.timeline = None
+    return _common.report("gapless", results)
+
+
+if __name__ == "__main__":
+    run()
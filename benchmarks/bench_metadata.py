@@ -0,0 +1,48 @@
+""" MetadataPipeline: వర్కర్ల సంఖ్య పెరిగితే సింథటిక్ 10k లైబ్రరీ మీద throughput ఎలా మారుతుందో కొలుస్తుంది.
+
+డెస్క్ టాప్ పేజ్ క్యాష్ నుండి చదవడం ఫోన్ FUSE స్టోరేజ్ కంటే చాలా వేగం, అందుకే --io-latency-ms తో
+ప్రతి ఫైల్ ఓపెన్ కి స్టోరేజ్ ఆలస్యాన్ని (sleep, GIL విడుదల అవుతుంది) అనుకరించవచ్చు.
+"""
+import argparse
+import shutil
+import tempfile
+import time
+
+import _common
+import synthetic
+import main
+
+
+def run(count=10000, workers=(1, 2, 4, 8), io_latency_ms=0.0):
+    root = tempfile.mkdtemp(prefix="vault-meta-")
+    original = main.read_tags
+    try:
+        paths = synthetic.build_audio_library(root, count)
+        if io_latency_ms:
+            def slow_read_tags(path, *args, **kwargs):
+                time.sleep(io_latency_ms / 1000.0)
+                return original(path, *args, **kwargs)
+            main.read_tags = slow_read_tags
+        results = []
+        for n in workers:
+            pipeline = main.MetadataPipeline(workers=n)
+            t0 = time.perf_counter()
+            done = pipeline.process(paths)
+            elapsed = time.perf_counter() - t0
+            results.append({"workers": n, "files": done, "seconds": round(elapsed, 3),
+                            "files_per_sec": round(done / elapsed, 1)})
+        base = results[0]["files_per_sec"]
+        for row in results:
+            row["scaling"] = round(row["files_per_sec"] / base, 2)
+        return _common.report("metadata_pipeline", {"io_latency_ms": io_latency_ms, "runs": results})
+    finally:
+        main.read_tags = original
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--io-latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    run(args.count, io_latency_ms=args.io_latency_ms)
@@ -0,0 +1,50 @@
+""" టైమింగ్ స్పాన్ ల ఖర్చు: డెకరేటర్ / span() లేకుండా vs మెట్రిక్స్ ఆఫ్ vs ఆన్ (ఒక్కో కాల్ కి ns).
+నకిలీ MediaPlayer తో NativeAudioPlayer.load కూడా - ఆఫ్ లో తేడా కనిపించకూడదు. """
+import time
+
+import _common
+import main
+from fakes import FakeMediaPlayer
+
+CALLS = 200000
+
+
+def per_call_ns(fn, calls=CALLS):
+    best = None
+    for _ in range(5):
+        t0 = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = (time.perf_counter() - t0) * 1e9 / calls
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 1)
+
+
+def work():
+    return None
+
+
+def run():
+    metrics = main.Metrics()
+    timed = metrics.timed('bench.work')(work)
+
+    def spanned():
+        with metrics.span('bench.span'): return None
+
+    results = {"plain_ns": per_call_ns(work)}
+    results["off"] = {"timed_ns": per_call_ns(timed), "span_ns": per_call_ns(spanned)}
+    metrics.enabled = True      # enable() ఫ్రేమ్ టైమర్ ని కూడా పెడుతుంది - ఇక్కడ స్పాన్ లు మాత్రమే
+    results["on"] = {"timed_ns": per_call_ns(timed), "span_ns": per_call_ns(spanned), "buffered": len(metrics.spans)}
+    results["summary_ms"] = _common.timeit(metrics.summary, 5)
+
+    FakeMediaPlayer.prepare_latency = 0
+    player = main.NativeAudioPlayer(media_player_cls=FakeMediaPlayer)
+    for state in (False, True):
+        main.metrics.enabled = state
+        results[f"player_load_{'on' if state else 'off'}_us"] = round(per_call_ns(lambda: player.load("/music/a.mp3"), 20000) / 1000, 2)
+    main.metrics.enabled = False
+    return _common.report("metrics_overhead", results)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,98 @@
+""" ప్లేబ్యాక్ స్టేట్: పాత 1 సెకన్ update_music_state పోలింగ్ vs ఈవెంట్లు + కాష్ చేసిన పొజిషన్.
+ప్లే అవుతుండగా టైమర్ వేకప్ లు, JNI (MediaPlayer) కాల్స్, కాష్ పొజిషన్ ఎంత తేడాగా ఉందో కొలుస్తుంది. """
+import _common
+from fakes import FakeMediaPlayer
+from bench_track_loading import pump
+import main
+
+
+class CountingMediaPlayer(FakeMediaPlayer):
+    """ ప్రతి స్టేట్ క్వెరీని ఒక JNI కాల్ గా లెక్కిస్తుంది """
+    calls = 0
+
+    def getCurrentPosition(self):
+        CountingMediaPlayer.calls += 1
+        return super().getCurrentPosition()
+
+    def getDuration(self):
+        CountingMediaPlayer.calls += 1
+        return super().getDuration()
+
+    def isPlaying(self):
+        CountingMediaPlayer.calls += 1
+        return super().isPlaying()
+
+
+class Widget:
+    max = 0
+    value = 0
+    text = ""
+
+
+def legacy_tick(player):
+    """ పాత update_music_state: is_complete (2 కాల్స్) + get_pos + get_duration """
+    mp = player.player
+    pos, dur = mp.getCurrentPosition(), mp.getDuration()
+    if dur > 0 and pos >= dur - 1200: return
+    mp.getCurrentPosition(); mp.getDuration()
+
+
+def prepared_player():
+    player = main.NativeAudioPlayer(media_player_cls=CountingMediaPlayer)
+    player.load("/storage/emulated/0/Music/long.flac")
+    pump(FakeMediaPlayer.prepare_latency * 2)
+    player.play()
+    return player
+
+
+def measure(seconds, setup):
+    CountingMediaPlayer.calls = 0
+    wakeups = []
+    teardown = setup(wakeups)
+    pump(seconds)
+    result = {"wakeups_per_min": round(len(wakeups) * 60.0 / seconds, 1),
+              "jni_calls_per_min": round(CountingMediaPlayer.calls * 60.0 / seconds, 1)}
+    teardown()
+    return result
+
+
+def run(seconds=3.0):
+    FakeMediaPlayer.prepare_latency = 0.05
+    FakeMediaPlayer.duration_ms = 600000
+    results = {"seconds": seconds}
+
+    player = prepared_player()
+    def legacy(wakeups):
+        def tick(dt):
+            wakeups.append(dt); legacy_tick(player)
+        event = main.Clock.schedule_interval(tick, 1)
+        return event.cancel
+    results["legacy_poll_any_screen"] = measure(seconds, legacy)
+
+    app = main.PrasadProApp()
+    app.player = prepared_player()
+    app.seek_slider, app.lbl_time = Widget(), Widget()
+    original = app.update_music_state
+    def counted(dt):
+        counted.wakeups.append(dt); original(dt)
+    app.update_music_state = counted
+
+    def hidden(wakeups):
+        counted.wakeups = wakeups
+        app.is_playing = True
+        return lambda: None
+    results["events_full_player_hidden"] = measure(seconds, hidden)
+
+    def visible(wakeups):
+        counted.wakeups = wakeups
+        app.set_full_player_visible(True)
+        return lambda: app.set_full_player_visible(False)
+    results["events_full_player_visible"] = measure(seconds, visible)
+
+    real = app.player.player.getCurrentPosition() / 1000.0
+    results["cached_position_error_ms"] = round(abs(app.player.get_pos() - real) * 1000, 2)
+    return _common.report("playback_tick", results)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,65 @@
+""" ప్లే క్యూ: పాత all_songs_list (in + index) vs PlayQueue (path -> స్థానం ఇండెక్స్).
+50k పాటలపై ట్యాప్ / next / prev / shuffle ఖర్చు, సేవ్ చేసే state సైజ్, రీస్టోర్ తర్వాత అదే ఆర్డర్ వస్తుందో చూస్తుంది. """
+import json
+import random
+
+import _common
+import main
+
+
+def legacy_tap(songs, path):
+    """ పాత play_song_from_list - రెండు లీనియర్ స్కాన్ లు """
+    if path in songs:
+        return songs.index(path)
+
+
+def check_behaviour(paths):
+    queue = main.PlayQueue()
+    queue.set_tracks(paths)
+    queue.jump(paths[10])
+    assert queue.advance() == paths[11]
+    queue.add_next(paths[500])
+    assert queue.peek_next() == paths[500] and queue.advance() == paths[500]
+    assert queue.advance() == paths[12]                      # up_next తర్వాత ఆగిన చోటు నుండి
+    assert queue.retreat() == paths[500] and queue.retreat() == paths[11]
+    queue.repeat = 'one'
+    assert queue.advance(auto=True) == paths[11]
+    queue.repeat = 'off'
+    queue.jump(paths[-1])
+    assert queue.advance(auto=True) is None and queue.advance() == paths[0]
+    queue.repeat = 'all'
+    queue.jump(paths[-1])
+    assert queue.advance(auto=True) == paths[0]
+
+    queue.set_shuffle(True)
+    played = [queue.current] + [queue.advance() for _ in range(len(paths) - 1)]
+    assert sorted(played) == sorted(paths)                   # ప్రతి పాట ఒక్కసారే
+    restored = main.PlayQueue()
+    restored.restore(json.loads(json.dumps(queue.state())))
+    restored.set_tracks(paths)
+    assert restored.order == queue.order and restored.cursor == queue.cursor
+    assert len(queue.history) == main.PlayQueue.HISTORY_LIMIT
+
+
+def run(count=50000, taps=200):
+    paths = [f"/storage/emulated/0/Music/Artist {i % 700}/Album {i % 3000}/{i:05}.mp3" for i in range(count)]
+    picks = [random.choice(paths) for _ in range(taps)]
+    check_behaviour(paths[:2000])
+
+    queue = main.PlayQueue()
+    build_ms = _common.timeit(lambda: queue.set_tracks(paths), 3)
+    results = {"tracks": count,
+               "legacy_tap_ms": round(_common.timeit(lambda: [legacy_tap(paths, p) for p in picks], 3) / taps, 4),
+               "queue_tap_ms": round(_common.timeit(lambda: [queue.jump(p) for p in picks], 3) / taps, 5),
+               "queue_next_ms": round(_common.timeit(lambda: [queue.advance() for _ in range(taps)], 3) / taps, 5),
+               "queue_prev_ms": round(_common.timeit(lambda: [queue.retreat() for _ in range(taps)], 3) / taps, 5),
+               "index_build_ms": build_ms}
+    queue.jump(paths[count // 2])
+    results["shuffle_build_ms"] = _common.timeit(lambda: queue.set_shuffle(True), 3)
+    results["shuffled_next_ms"] = round(_common.timeit(lambda: [queue.advance() for _ in range(taps)], 3) / taps, 5)
+    results["saved_state_bytes"] = len(json.dumps(queue.state()))
+    return _common.report("play_queue", results)
+
+
+if __name__ == "__main__":
+    run()
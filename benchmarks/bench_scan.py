@@ -0,0 +1,51 @@
+""" లైబ్రరీ స్కాన్: పాత సెటప్ (DCIM తో సహా అన్ని రూట్ లు, exclude లేదు, ఒకే వాకర్) vs ScanRules డిఫాల్ట్ లు + రూట్ కి ఒక వాకర్.
+ఫోన్ స్టోరేజ్ లాంటి సింథటిక్ ట్రీ మీద మొదటి స్కాన్, మార్పు లేని రీ-స్కాన్ సమయం, చదివిన ఫోల్డర్లు, దొరికిన పాటలు. """
+import os
+import shutil
+import tempfile
+
+import _common
+import main
+import synthetic
+
+
+def scan(rules, walkers, db_path):
+    """ కొత్త ఇండెక్స్ మీద మొదటి స్కాన్ + రెండో (మార్పు లేని) స్కాన్ """
+    index = main.LibraryIndex(db_path)
+    progress = []
+
+    class Scanner(main.LibraryScanner):
+        WALKERS = walkers
+        def _post(self, callback, *args):
+            if callback is not None: callback(*args)
+
+    def make():
+        return Scanner(index, rules, main.MEDIA_TYPES['audio'], on_batch=None, on_progress=lambda *a: progress.append(a))
+    first_ms = _common.timeit(make()._run, 1)
+    dirs_listed = progress[-1][1]
+    rescan_ms = _common.timeit(make()._run, 3)
+    result = {"first_scan_ms": first_ms, "rescan_ms": rescan_ms, "dirs_listed": dirs_listed, "tracks": len(index.all_tracks())}
+    index.close()
+    return result
+
+
+def run(scale=1):
+    root = tempfile.mkdtemp(prefix="vault_scan_")
+    try:
+        # స్కాన్ కి పేర్లు, size, mtime మాత్రమే - కవర్లు లేకుండా, చిన్న ఫోటోలతో
+        paths = synthetic.build_device_tree(os.path.join(root, "storage"), audio=1300 * scale, images=6000 * scale, videos=300 * scale,
+                                            other=200 * scale, covers=False, image_px=(32, 24))['roots']
+        legacy_roots = [paths[name] for name in ('music', 'download', 'whatsapp', 'recordings', 'snaptube', 'dcim')]
+        new_roots = legacy_roots[:-1]
+        results = {
+            "legacy_all_roots_1_walker": scan(main.ScanRules(legacy_roots, excludes=()), 1, os.path.join(root, "a.db")),
+            "rules_1_walker": scan(main.ScanRules(new_roots), 1, os.path.join(root, "b.db")),
+            "rules_parallel_walkers": scan(main.ScanRules(new_roots), main.LibraryScanner.WALKERS, os.path.join(root, "c.db")),
+        }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return _common.report("library_scan", results)
+
+
+if __name__ == "__main__":
+    run()
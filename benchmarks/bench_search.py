@@ -0,0 +1,78 @@
+""" లైబ్రరీ సెర్చ్: ప్రతి కీస్ట్రోక్ కి లిస్ట్ మొత్తం స్కాన్ vs SearchIndex (పదజాలం + prefix bisect).
+100k సింథటిక్ ఎంట్రీలపై ఇండెక్స్ కట్టే సమయం, ఒక్కో కీస్ట్రోక్ క్వెరీ సమయం (median / max) కొలుస్తుంది. """
+import random
+import statistics
+import time
+
+import _common
+import main
+
+ARTISTS = ["Arijit Singh", "S. P. Balasubrahmanyam", "K. S. Chithra", "Shreya Ghoshal", "Sid Sriram",
+           "A. R. Rahman", "Ilaiyaraaja", "Devi Sri Prasad", "Thaman S", "Anirudh Ravichander",
+           "సిరివెన్నెల", "ఘంటసాల", "Beyoncé", "Daft Punk", "Coldplay"]
+WORDS = ["love", "night", "dream", "heart", "rain", "moon", "fire", "road", "sky", "song", "prema", "manasu",
+         "priya", "vennela", "ప్రేమ", "పాట", "వెన్నెల", "kadhal", "dil", "ishq", "zindagi", "saathiya"]
+
+
+def synthetic_records(count, seed=7):
+    rnd = random.Random(seed)
+    records = []
+    for i in range(count):
+        artist = rnd.choice(ARTISTS)
+        album = f"{rnd.choice(WORDS).title()} {rnd.choice(WORDS).title()} {i % 900}"
+        title = " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(1, 4))).title()
+        folder = f"/storage/emulated/0/Music/{artist}/{album}"
+        records.append({'title': title, 'artist': artist, 'album': album,
+                        'name': f"{i:06} - {title}.mp3", 'folder': folder})
+    return records
+
+
+def track_store(records):
+    store = main.TrackStore()
+    for rec in records:
+        store.add(f"{rec['folder']}/{rec['name']}", rec['folder'], rec['title'], rec['artist'], rec['album'])
+    return store
+
+
+def linear_search(store, query):
+    """ ఇండెక్స్ లేకుండా: ప్రతి ఎంట్రీ టెక్స్ట్ లో substring వెతకడం """
+    needle = query.casefold()
+    return [row for row in range(len(store.paths)) if needle in " ".join(filter(None, store.search_fields(row))).casefold()]
+
+
+def keystrokes(phrase):
+    return [phrase[:n] for n in range(1, len(phrase) + 1)]
+
+
+def run(count=100000):
+    store = track_store(synthetic_records(count))
+    index = main.SearchIndex()
+    t0 = time.perf_counter()
+    index.build(store.search_fields(row) for row in range(len(store.paths)))
+    build_ms = round((time.perf_counter() - t0) * 1000, 1)
+
+    phrases = ["arijit love", "sid sriram manasu", "ప్రేమ", "beyonce", "coldplay sky 12", "zzz nothing"]
+    indexed, linear, matches = [], [], {}
+    for phrase in phrases:
+        for query in keystrokes(phrase):
+            t0 = time.perf_counter()
+            found = index.search(query)
+            indexed.append((time.perf_counter() - t0) * 1000)
+            matches[query] = len(found or ())
+        t0 = time.perf_counter()
+        linear_search(store, phrase)
+        linear.append((time.perf_counter() - t0) * 1000)
+
+    assert matches["arijit love"] > 0 and matches["ప్రేమ"] > 0 and matches["beyonce"] > 0
+    assert matches["zzz nothing"] == 0
+    return _common.report("library_search", {
+        "entries": count, "vocabulary": len(index.vocab), "index_build_ms": build_ms,
+        "keystrokes": len(indexed),
+        "indexed_query_ms": {"median": round(statistics.median(indexed), 3), "p95": round(sorted(indexed)[int(len(indexed) * 0.95)], 3),
+                             "max": round(max(indexed), 3)},
+        "linear_scan_query_ms": {"median": round(statistics.median(linear), 1), "max": round(max(linear), 1)},
+        "matches": {phrase: matches[phrase] for phrase in phrases}})
+
+
+if __name__ == "__main__":
+    run()
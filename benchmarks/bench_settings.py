@@ -0,0 +1,76 @@
+""" సెట్టింగ్స్ / ప్లేబ్యాక్ స్టేట్: ప్రతి put కి JsonStore ఫైల్ మొత్తం రాయడం vs SettingsStore (మెమరీ + కలిపిన atomic flush).
+10 నిమిషాల ప్లే (ప్రతి 2 సెకన్లకు పొజిషన్), కొన్ని సెట్టింగ్ మార్పులు, PIN చెక్ లు - సమయం, డిస్క్ రైట్ ల సంఖ్య. """
+import os
+import shutil
+import tempfile
+import time
+
+import _common
+import main
+from kivy.storage.jsonstore import JsonStore
+
+SECONDS = 600
+PLAYBACK_SAVE = 2.0
+
+
+class SimulatedStore(main.SettingsStore):
+    """ Clock బదులు సిమ్యులేట్ చేసిన సమయం - గడువు దాటితే flush (యాప్ లో Clock చేసేదే) """
+    now = 0.0
+
+    def _schedule(self, delay):
+        self._dirty = True
+        if self._due is None or self.now + delay < self._due: self._due = self.now + delay
+
+    def advance(self, now):
+        self.now = now
+        if self._due is not None and now >= self._due:
+            self._due = None
+            self.flush()
+
+
+def workload(store, clock=None):
+    """ (మొత్తం ms, put ల సంఖ్య); clock(t) = ఆ క్షణం వరకు టైమర్ లు నడిపించడం """
+    store.put('security', user_pin="1234", master_pin="9999")
+    store.put('queue', current="/music/a.mp3", shuffle=False, repeat='off', seed=1, anchor=None, up_next=[], history=[])
+    puts = 2
+    t0 = time.perf_counter()
+    for tick in range(int(SECONDS / PLAYBACK_SAVE)):
+        now = tick * PLAYBACK_SAVE
+        put = getattr(store, 'put_lazy', store.put)
+        put('playback', path="/music/a.mp3", title="A", position=now, volume=1.0)
+        puts += 1
+        if tick % 60 == 0:
+            store.put('ui', sort_mode=('added', 'title')[tick % 2], spatial_audio=bool(tick % 3))
+            puts += 1
+        if tick % 30 == 0:
+            # check_pin_logic
+            store.exists('security') and store.get('security')['user_pin']
+        if clock: clock(now)
+    return round((time.perf_counter() - t0) * 1000, 1), puts
+
+
+def run():
+    root = tempfile.mkdtemp(prefix="vault_settings_")
+    try:
+        writes = {'json': 0}
+        json_store = JsonStore(os.path.join(root, "a.json"))
+        sync = json_store.store_sync
+        def counted_sync():
+            writes['json'] += 1
+            sync()
+        json_store.store_sync = counted_sync
+        json_ms, puts = workload(json_store)
+
+        store = SimulatedStore(os.path.join(root, "b.json"))
+        settings_ms, _ = workload(store, store.advance)
+        store.flush()
+        results = {"simulated_s": SECONDS, "puts": puts,
+                   "jsonstore": {"total_ms": json_ms, "file_writes": writes['json']},
+                   "settings_store": {"total_ms": settings_ms, "file_writes": store.writes}}
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return _common.report("settings_store", results)
+
+
+if __name__ == "__main__":
+    run()
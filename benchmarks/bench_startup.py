@@ -0,0 +1,90 @@
+""" స్టార్టప్: ప్రాసెస్ మొదలు నుండి లాక్ స్క్రీన్ మొదటి ఫ్రేమ్ వరకు (ఇంపోర్ట్, build, first frame) ఎంత సమయం.
+ప్రతి రన్ కొత్త ప్రాసెస్ లో (హెడ్ లెస్ విండో, టెంప్ ఫోల్డర్, నకిలీ MediaPlayer). library ఇస్తే ఆ డేటాబేస్ తో - లిస్ట్ లోడ్ అయ్యే వరకు (ready).
+పాత వెర్షన్ తో పోల్చడానికి: python bench_startup.py <main.py ఉన్న ఫోల్డర్> """
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import _common
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child(repo):
+    """ సబ్ ప్రాసెస్ లో నడుస్తుంది - ఒక్క స్టార్టప్ కొలిచి JSON గా ప్రింట్ చేస్తుంది """
+    t0 = time.perf_counter()
+    sys.path.insert(0, repo)
+    import main
+    t_import = time.perf_counter()
+    from kivy.clock import Clock
+    from kivy.core.window import Window
+    main.toast = lambda *a, **k: None
+    if 'media_player_cls' in main.NativeAudioPlayer.__init__.__code__.co_varnames:
+        from fakes import FakeMediaPlayer
+        native = main.NativeAudioPlayer
+        main.NativeAudioPlayer = lambda: native(media_player_cls=FakeMediaPlayer)
+    app = main.PrasadProApp()
+    marks = {}
+
+    def flip(*args):
+        if 'first_frame' in marks: return
+        marks['first_frame'] = time.perf_counter()
+        marks['widgets'] = sum(1 for screen in app.root.screens for _ in screen.walk())
+        marks['file_managers'] = sum(1 for name in vars(app) if name.startswith('fm_')) + len(getattr(app, 'file_managers', ()))
+
+    build = app.build
+    def timed_build():
+        start = time.perf_counter()
+        root = build()
+        marks['build_ms'] = (time.perf_counter() - start) * 1000
+        return root
+    app.build = timed_build
+    Window.bind(on_flip=flip)
+    def stop(dt):
+        # ఐడిల్ స్టెప్ లు ఉన్న వెర్షన్ అయితే 'ready' వరకు, లేకపోతే 2 సెకన్లు
+        elapsed = time.perf_counter() - t0
+        if 'ready' in getattr(app, 'startup_times', {}) or elapsed > 15 or (elapsed > 2 and not hasattr(app, 'run_startup_step')):
+            app.stop()
+            return False
+    Clock.schedule_interval(stop, 0.05)
+    app.run()
+    print(json.dumps({"import_ms": (t_import - t0) * 1000, "build_ms": marks['build_ms'],
+                      "first_frame_ms": (marks['first_frame'] - t0) * 1000,
+                      "widgets_before_first_frame": marks['widgets'], "file_managers_at_start": marks['file_managers'],
+                      "app_marks_ms": getattr(app, 'startup_times', {})}))
+
+
+def run(repo=REPO, runs=5, library=None):
+    env = dict(os.environ, KIVY_NO_ARGS="1", KIVY_NO_CONSOLELOG="1")
+    samples = []
+    for _ in range(runs):
+        cwd = tempfile.mkdtemp(prefix="vault_bench_")
+        if library: shutil.copy(library, os.path.join(cwd, "vault_library.db"))
+        try:
+            out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", repo], env=env, cwd=cwd,
+                                 capture_output=True, text=True, check=True).stdout
+        finally:
+            shutil.rmtree(cwd, ignore_errors=True)
+        samples.append(json.loads(out.strip().splitlines()[-1]))
+    results = {"main_py": os.path.join(repo, "main.py"), "runs": runs}
+    for key in ("import_ms", "build_ms", "first_frame_ms"):
+        results[key] = round(statistics.median(s[key] for s in samples), 1)
+    if all('ready' in s["app_marks_ms"] for s in samples):
+        results["ready_ms"] = round(statistics.median(s["app_marks_ms"]['ready'] for s in samples), 1)
+    last = samples[-1]
+    results["widgets_before_first_frame"] = last["widgets_before_first_frame"]
+    results["file_managers_at_start"] = last["file_managers_at_start"]
+    results["app_marks_ms"] = last["app_marks_ms"]
+    return _common.report("startup", results)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        child(sys.argv[2])
+    else:
+        run(os.path.abspath(sys.argv[1]) if len(sys.argv) > 1 else REPO)
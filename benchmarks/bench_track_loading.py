@@ -0,0 +1,61 @@
+""" ట్రాక్ లోడింగ్: పాత సింక్రోనస్ prepare() vs prepareAsync + coalescing.
+వేగంగా వరుస ట్యాప్ లు చేస్తే UI థ్రెడ్ ఎంత సేపు బ్లాక్ అవుతుంది, ఎన్ని prepare లు జరుగుతాయి అని కొలుస్తుంది. """
+import time
+
+import _common
+from fakes import FakeMediaPlayer
+import main
+from kivy.clock import Clock
+
+
+def legacy_load(player, path):
+    """ పాత NativeAudioPlayer.load - reset / setDataSource / prepare అన్నీ UI థ్రెడ్ లో """
+    player.reset()
+    player.setDataSource(path)
+    player.prepare()
+
+
+def pump(seconds):
+    """ Kivy Clock ని చేత్తో తిప్పుతుంది (యాప్ లూప్ లేకుండా) """
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        Clock.tick()
+        time.sleep(0.005)
+
+
+def run(taps=10, tap_gap=0.03, latency=0.25):
+    FakeMediaPlayer.prepare_latency = latency
+    paths = [f"/storage/emulated/0/Music/track_{i}.flac" for i in range(taps)]
+
+    # పాత విధానం
+    fake = FakeMediaPlayer()
+    blocked = 0.0
+    for path in paths:
+        t0 = time.perf_counter()
+        legacy_load(fake, path)
+        blocked += time.perf_counter() - t0
+    legacy = {"ui_blocked_ms": round(blocked * 1000, 1), "prepares": fake.prepare_calls,
+              "prepared": len(fake.prepared_sources)}
+
+    # కొత్త విధానం: ప్రతి ట్యాప్ load() ని పిలుస్తుంది, చివరిది మాత్రమే సిద్ధమవ్వాలి
+    player = main.NativeAudioPlayer(media_player_cls=FakeMediaPlayer)
+    ready = []
+    player.on_ready = lambda path: ready.append((path, time.perf_counter()))
+    blocked = 0.0
+    for path in paths:
+        t0 = time.perf_counter()
+        player.load(path)
+        blocked += time.perf_counter() - t0
+        pump(tap_gap)
+    last_tap = time.perf_counter()
+    pump(latency * 2)
+    async_result = {"ui_blocked_ms": round(blocked * 1000, 3), "prepares_started": player.player.prepare_calls,
+                    "prepared": len(player.player.prepared_sources), "ready_callbacks": [p for p, _ in ready],
+                    "latest_ready_after_last_tap_ms": round((ready[-1][1] - last_tap) * 1000, 1) if ready else None}
+    assert [p for p, _ in ready] == [paths[-1]], ready
+    return _common.report("track_loading", {"taps": taps, "prepare_latency_ms": latency * 1000,
+                                            "legacy_sync_prepare": legacy, "prepare_async": async_result})
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,88 @@
+""" ట్రాక్ లిస్ట్ మెమరీ: పాత dict-per-track లేఅవుట్ (tracks + ఐటమ్ dict లు + ListProperty కాపీ) vs TrackStore + లేజీ వ్యూ.
+డేటాబేస్ వరుసలని స్ట్రీమ్ చేసి (sqlite కర్సర్ లాగా) tracemalloc తో మిగిలిన మెమరీ, కట్టే సమయం కొలుస్తుంది. """
+import gc
+import os
+import time
+import tracemalloc
+
+import _common
+from bench_search import synthetic_records
+import main
+from kivy.event import EventDispatcher
+from kivy.properties import ListProperty
+
+
+class LegacyModel(EventDispatcher):
+    """ పాత RecycleDataModel / music_list_data లాగా ListProperty """
+    data = ListProperty([])
+
+
+def db_rows(records):
+    """ all_tracks() వరుసలు - ప్రతి వరుసలో కొత్త str ఆబ్జెక్ట్ లు (sqlite ఇచ్చినట్టే) """
+    for i, rec in enumerate(records):
+        folder = "".join(rec['folder'])
+        yield (f"{folder}/{rec['name']}", folder, "".join(rec['name']), "".join(rec['title']),
+               "".join(rec['artist']), "".join(rec['album']), i % 20 + 1, 180.0 + i % 120)
+
+
+def legacy_item(rec):
+    details = [value for value in (rec.get('artist'), rec.get('album')) if value]
+    secondary = " • ".join(details) if details else os.path.basename(rec['folder'])
+    if rec.get('duration'):
+        mins, secs = divmod(int(rec['duration']), 60)
+        secondary += f"  ({mins}:{secs:02})"
+    return {'text': rec.get('title') or rec['name'], 'secondary_text': secondary, 'path': rec['path']}
+
+
+def legacy(rows):
+    """ 015 వరకు ఉన్న load_library + refresh_track_list """
+    tracks = {}
+    for path, folder, name, title, artist, album, track_no, duration in rows:
+        tracks[path] = {'path': path, 'folder': folder, 'name': name, 'title': title, 'artist': artist,
+                        'album': album, 'track_no': track_no, 'duration': duration}
+    records = list(tracks.values())
+    items = [legacy_item(rec) for rec in records]
+    data = list(items)
+    model = LegacyModel()
+    model.data = data
+    return tracks, records, items, data, model
+
+
+def columnar(rows):
+    store = main.TrackStore()
+    for path, folder, name, title, artist, album, track_no, duration in rows:
+        store.add(path, folder, title, artist, album, track_no, duration)
+    rows = store.rows()
+    view = main.TrackListView(store, main.array('i', rows))
+    model = main.TrackDataModel()
+    model.data = view
+    return store, rows, view, model
+
+
+def measure(build, records):
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    kept = build(db_rows(records))
+    elapsed = time.perf_counter() - t0
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return {"retained_mb": round(current / 1048576, 2), "peak_mb": round(peak / 1048576, 2),
+            "bytes_per_track": round(current / len(records)), "build_ms": round(elapsed * 1000, 1)}
+
+
+def run(count=100000):
+    records = synthetic_records(count)
+    results = {"tracks": count, "dict_per_track": measure(legacy, records), "track_store": measure(columnar, records)}
+    store, rows, view, model = columnar(db_rows(records[:1000]))
+    t0 = time.perf_counter()
+    visible = [view[i] for i in range(12)]
+    results["visible_items_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+    assert visible[0]['path'] == store.paths[0]
+    return _common.report("track_store", results)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,88 @@
+""" వీడియో లైబ్రరీ: ప్రతి ఓపెన్ లో స్టోరేజ్ ట్రీ నడవడం (పాత ఫైల్ పికర్) vs VideoIndex.
+మొదటి ఓపెన్ (స్కాన్ + పోస్టర్ / నిడివి, వర్కర్ల సంఖ్య ప్రకారం), తర్వాతి ఓపెన్ (ఇండెక్స్ నుండి లిస్ట్ + మారని ఫోల్డర్ల రీ-స్కాన్).
+పోస్టర్ బ్యాకెండ్ StubVideoFrames - latency ఫోన్ లో MediaMetadataRetriever ఒక్కో ఫైల్ కి తీసుకునే సమయం లాంటిది. """
+import os
+import shutil
+import tempfile
+import time
+
+import _common
+import main
+import synthetic
+
+VIDEOS = 500
+RETRIEVER_LATENCY = 0.03
+
+
+class DirectScanner(main.LibraryScanner):
+    def _post(self, callback, *args):
+        if callback is not None: callback(*args)
+
+
+def walk_tree(storage):
+    """ పాత దారి: ప్రతి ఓపెన్ లో వీడియోల కోసం ట్రీ మొత్తం """
+    found = 0
+    for folder, dirs, files in os.walk(storage):
+        found += sum(1 for name in files if name.lower().endswith(main.MEDIA_TYPES['video']))
+    return found
+
+
+def video_rules(storage):
+    return main.ScanRules([os.path.join(storage, os.path.relpath(root, "/storage/emulated/0")) for root in main.VIDEO_ROOTS])
+
+
+def first_open(storage, work, workers):
+    """ ఖాళీ ఇండెక్స్ / క్యాష్: స్కాన్ + అన్ని పోస్టర్లు, నిడివులు """
+    index = main.VideoIndex(os.path.join(work, f"videos_{workers}.db"))
+    cache = main.ArtCache(os.path.join(work, f"posters_{workers}"), main.VideoPosterPipeline.CACHE_BUDGET)
+    frames = main.StubVideoFrames(latency=RETRIEVER_LATENCY)
+    rules = video_rules(storage)
+    t0 = time.perf_counter()
+    DirectScanner(index, rules, main.MEDIA_TYPES['video'], on_batch=None)._run()
+    scan_ms = (time.perf_counter() - t0) * 1000
+    pipeline = main.VideoPosterPipeline(index, cache, frames, workers=workers)
+    t0 = time.perf_counter()
+    count = pipeline.process(index.untagged_paths())
+    posters_ms = (time.perf_counter() - t0) * 1000
+    with_duration = sum(1 for row in index.all_videos() if row[2])
+    return index, cache, rules, {"scan_ms": round(scan_ms, 1), "posters_ms": round(posters_ms, 1), "indexed": count,
+                                 "with_duration": with_duration, "extract_calls": frames.calls}
+
+
+def next_open(index, cache, rules):
+    """ app.load_videos చేసే పని (డేటాబేస్ -> RecycleView వరుసలు) + మారని ఫోల్డర్ల రీ-స్కాన్ + మిగిలిన పోస్టర్లు """
+    def rows():
+        data = []
+        for path, name, duration, poster in index.all_videos():
+            data.append({'path': path, 'title': os.path.splitext(name)[0], 'info': f"{duration}",
+                         'poster': os.path.join(cache.cache_dir, poster) if poster else ""})
+        return data
+    frames = main.StubVideoFrames(latency=RETRIEVER_LATENCY)
+    results = {"list_from_index_ms": _common.timeit(rows, 5),
+               "rescan_ms": _common.timeit(DirectScanner(index, rules, main.MEDIA_TYPES['video'], on_batch=None)._run, 3)}
+    main.VideoPosterPipeline(index, cache, frames).process(index.untagged_paths())
+    results["extract_calls"] = frames.calls
+    results["posters_on_disk"] = sum(1 for row in rows() if row['poster'] and os.path.exists(row['poster']))
+    return results
+
+
+def run(videos=VIDEOS):
+    work = tempfile.mkdtemp(prefix="vault_videos_")
+    try:
+        storage = os.path.join(work, "storage", "emulated", "0")
+        synthetic.build_device_tree(storage, audio=300, images=600, videos=videos, other=200, covers=False)
+        results = {"videos": videos, "retriever_latency_ms": RETRIEVER_LATENCY * 1000,
+                   "walk_tree_ms": _common.timeit(lambda: walk_tree(storage), 3)}
+        for workers in (1, 2, 4):
+            index, cache, rules, first = first_open(storage, work, workers)
+            results[f"first_open_{workers}_workers"] = first
+            if workers == main.VideoPosterPipeline.WORKERS:
+                results["next_open"] = next_open(index, cache, rules)
+            index.close()
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return _common.report("video_library", results)
+
+
+if __name__ == "__main__":
+    run()
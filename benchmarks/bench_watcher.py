@@ -0,0 +1,102 @@
+""" లైవ్ లైబ్రరీ: కొత్త ఫైల్ కనిపించడానికి మళ్ళీ స్కాన్ (LibraryScanner) vs LibraryWatcher (inotify / పోలింగ్).
+సింథటిక్ ఫోల్డర్ ట్రీ మీద: ఫైల్ రాసినప్పటి నుండి బ్యాచ్ వచ్చే వరకు సమయం, diff అప్లై సమయం, ఏమీ మారనప్పుడు CPU వాడకం. """
+import os
+import shutil
+import tempfile
+import time
+
+import _common
+import main
+
+EXTENSIONS = ('.mp3',)
+
+
+class TimedWatcher(main.LibraryWatcher):
+    """ బ్యాచ్ లను Clock లేకుండా నేరుగా అందిస్తుంది, _apply సమయం కొలుస్తుంది """
+    DEBOUNCE = 0.2
+    POLL_MIN = 0.5
+    POLL_MAX = 2.0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.apply_ms = []
+
+    def _post(self, callback, *args):
+        if callback: callback(*args)
+
+    def _apply(self, dirty):
+        t0 = time.perf_counter()
+        super()._apply(dirty)
+        self.apply_ms.append((time.perf_counter() - t0) * 1000)
+
+
+def make_tree(root, dirs, files):
+    for d in range(dirs):
+        folder = os.path.join(root, f"Artist {d % 40}", f"Album {d}")
+        os.makedirs(folder)
+        for f in range(files):
+            with open(os.path.join(folder, f"{f:02} - Track.mp3"), "wb") as out: out.write(b"\0" * (1000 + f))
+    return os.path.join(root, "Artist 0", "Album 0")
+
+
+def idle_cpu_ms(seconds):
+    """ మెయిన్ థ్రెడ్ నిద్రపోతుండగా ప్రాసెస్ వాడిన CPU - అంటే వాచర్ థ్రెడ్ ది """
+    before = os.times()
+    time.sleep(seconds)
+    after = os.times()
+    return round((after.user - before.user + after.system - before.system) * 1000, 1)
+
+
+def measure_watcher(index, rules, target, polling, idle):
+    batches = []
+    watcher = TimedWatcher(index, rules, EXTENSIONS, on_batch=lambda *batch: batches.append((time.perf_counter(), batch)))
+    if polling:
+        def no_inotify(): raise OSError("inotify disabled for benchmark")
+        watcher._run_inotify = no_inotify
+    t0 = time.perf_counter()
+    watcher.start()
+    while watcher.backend is None or (not polling and len(watcher._path_wds) < len(index.load_dirs())):
+        time.sleep(0.01)
+    setup_ms = (time.perf_counter() - t0) * 1000
+    time.sleep(0.3)
+    result = {"backend": watcher.backend, "setup_ms": round(setup_ms, 1), "idle_cpu_ms": idle_cpu_ms(idle)}
+
+    latencies = []
+    for n in range(3):
+        path = os.path.join(target, f"new {polling} {n}.mp3")
+        start = time.perf_counter()
+        with open(path, "wb") as out: out.write(b"\0" * 777)
+        while not any(path in [rec['path'] for rec in batch[0]] for _, batch in batches):
+            time.sleep(0.005)
+            if time.perf_counter() - start > 10: raise RuntimeError("watcher missed a new file")
+        latencies.append((batches[-1][0] - start) * 1000)
+    watcher.cancel()
+    result["new_file_visible_ms"] = round(sum(latencies) / len(latencies), 1)
+    result["apply_ms"] = round(sum(watcher.apply_ms) / len(watcher.apply_ms), 2)
+    return result
+
+
+def run(dirs=500, files=20, idle=3.0):
+    root = tempfile.mkdtemp(prefix="vault_watch_")
+    try:
+        target = make_tree(os.path.join(root, "Music"), dirs, files)
+        index = main.LibraryIndex(os.path.join(root, "lib.db"))
+        rules = main.ScanRules([os.path.join(root, "Music")])
+        main.LibraryScanner(index, rules, EXTENSIONS, on_batch=None)._run()
+        results = {"dirs": dirs, "tracks": len(index.all_tracks())}
+
+        # పాత పద్ధతి: యూజర్ మళ్ళీ SCAN నొక్కితేనే - మార్పు లేని ఫోల్డర్లకూ stat
+        with open(os.path.join(target, "rescan.mp3"), "wb") as out: out.write(b"\0" * 555)
+        scanner = main.LibraryScanner(index, rules, EXTENSIONS, on_batch=None)
+        results["rescan_ms"] = _common.timeit(scanner._run, 1)
+
+        results["inotify"] = measure_watcher(index, rules, target, False, idle)
+        results["polling"] = measure_watcher(index, rules, target, True, idle)
+        index.close()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return _common.report("library_watcher", results)
+
+
+if __name__ == "__main__":
+    run()
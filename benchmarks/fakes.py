@@ -0,0 +1,148 @@
+""" ఫోన్ లేకుండా ఆడియో పాత్ ని నడపడానికి android.media.MediaPlayer లాంటి నకిలీ క్లాస్ """
+import threading
+import time
+
+
+class FakeMediaPlayer:
+    """ prepare / prepareAsync ఆలస్యాన్ని అనుకరిస్తుంది; లిస్నర్లను Timer థ్రెడ్ లో పిలుస్తుంది (ఆండ్రాయిడ్ లాగే వేరే థ్రెడ్) """
+    prepare_latency = 0.25   # సెకన్లు
+    duration_ms = 180000
+    _next_session = 100
+    timeline = None     # list ఇస్తే (time, 'start'/'complete', source) లు రికార్డ్ అవుతాయి
+
+    def __init__(self):
+        self.source = None
+        self.state = 'idle'
+        self.volume = (1.0, 1.0)
+        self.prepared_sources = []
+        self.prepare_calls = 0
+        self._timer = None
+        self._end_timer = None
+        self._started_at = None
+        self._position = 0
+        self.on_prepared = None
+        self.on_error = None
+        self.on_completion = None
+        self.next_player = None
+        FakeMediaPlayer._next_session += 1
+        self.session_id = FakeMediaPlayer._next_session
+
+    # లిస్నర్లు
+    def setOnPreparedListener(self, listener): self.on_prepared = listener
+    def setOnErrorListener(self, listener): self.on_error = listener
+    def setOnCompletionListener(self, listener): self.on_completion = listener
+
+    def reset(self):
+        if self._timer: self._timer.cancel()
+        self._timer = None
+        self._cancel_end()
+        self.next_player = None
+        self.source = None
+        self.state = 'idle'
+        self._started_at = None
+        self._position = 0
+
+    def release(self):
+        self.reset()
+        self.state = 'end'
+
+    def setDataSource(self, path):
+        self.source = path
+        self.state = 'initialized'
+
+    def prepare(self):
+        self.prepare_calls += 1
+        time.sleep(self.prepare_latency)
+        self._prepared()
+
+    def prepareAsync(self):
+        self.prepare_calls += 1
+        self.state = 'preparing'
+        source = self.source
+        def done():
+            if self.source == source and self.state == 'preparing':
+                self._prepared()
+                if self.on_prepared: self.on_prepared.onPrepared(self)
+        self._timer = threading.Timer(self.prepare_latency, done)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _prepared(self):
+        self.state = 'prepared'
+        self.prepared_sources.append(self.source)
+
+    def start(self):
+        self.state = 'started'
+        self._started_at = time.monotonic()
+        self._log('start')
+        # పాట చివరికి వచ్చినప్పుడు completion - setNextMediaPlayer ఉంటే దాన్ని వెంటనే మొదలుపెడుతుంది
+        self._cancel_end()
+        self._end_timer = threading.Timer((self.duration_ms - self._position) / 1000.0, self._complete)
+        self._end_timer.daemon = True
+        self._end_timer.start()
+
+    def _complete(self):
+        if self.state != 'started': return
+        self._position = self.duration_ms
+        self._started_at = None
+        self.state = 'completed'
+        self._log('complete')
+        if self.next_player is not None and self.next_player.state == 'prepared':
+            self.next_player.start()
+        if self.on_completion: self.on_completion.onCompletion(self)
+
+    def _cancel_end(self):
+        if self._end_timer: self._end_timer.cancel()
+        self._end_timer = None
+
+    def _log(self, kind):
+        if FakeMediaPlayer.timeline is not None:
+            FakeMediaPlayer.timeline.append((time.monotonic(), kind, self.source))
+
+    def pause(self):
+        self._cancel_end()
+        self._position = self.getCurrentPosition()
+        self._started_at = None
+        self.state = 'paused'
+
+    def stop(self):
+        self._cancel_end()
+        self.state = 'stopped'
+        self._started_at = None
+
+    def isPlaying(self): return self.state == 'started'
+
+    def seekTo(self, ms):
+        self._position = ms
+        if self._started_at is not None: self.start()
+
+    def getCurrentPosition(self):
+        if self._started_at is None: return self._position
+        return min(self.duration_ms, self._position + int((time.monotonic() - self._started_at) * 1000))
+
+    def getDuration(self): return self.duration_ms
+    def getAudioSessionId(self): return self.session_id
+    def setAudioSessionId(self, session_id): self.session_id = session_id
+    def setNextMediaPlayer(self, player): self.next_player = player
+    def setVolume(self, left, right): self.volume = (left, right)
+
+
+class FakeEffect:
+    """ android.media.audiofx ఎఫెక్ట్ లాంటిది - కన్స్ట్రక్టర్ నేటివ్ ఆబ్జెక్ట్ కట్టే ఆలస్యాన్ని అనుకరిస్తుంది """
+    create_latency = 0.008
+    created = 0
+    released = 0
+
+    def __init__(self, priority, session_id):
+        time.sleep(self.create_latency)
+        FakeEffect.created += 1
+        self.session_id = session_id
+        self.enabled = False
+        self.strength = 0
+
+    def setEnabled(self, state): self.enabled = state
+    def getStrengthSupported(self): return True
+    def setStrength(self, strength): self.strength = strength
+
+    def release(self):
+        FakeEffect.released += 1
@@ -0,0 +1,222 @@
+""" ఆఫ్ లైన్ బెంచ్ మార్క్ సూట్: ఫోన్ లేకుండా, ఒకే సింథటిక్ /storage/emulated/0 ట్రీ మీద
+స్కానర్ + ట్యాగ్ లు, ఆల్బమ్ ఆర్ట్ (extract_art -> ArtCache -> థంబ్ నెయిల్స్), music_list_data లిస్ట్ కట్టడం,
+నకిలీ ఆడియో బ్యాకెండ్ తో PrasadProApp స్టార్టప్. ఫలితాలు JSON ఫైల్ లో (git రివిజన్, Python, ప్లాట్ ఫామ్ తో).
+
+    python suite.py --out results/2.1.json
+    python suite.py --quick --baseline results/2.0.json --threshold 15    # రిగ్రెషన్ ఉంటే exit 1
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import _common
+import main
+import synthetic
+import bench_startup
+from fakes import FakeMediaPlayer
+
+PRESETS = {
+    'full': {'audio': 1000, 'images': 3000, 'videos': 200, 'other': 300, 'depth': 2},
+    'quick': {'audio': 200, 'images': 500, 'videos': 40, 'other': 60, 'depth': 2},
+}
+SCENARIOS = ('scan', 'art', 'list', 'startup')
+
+
+def ms_since(t0):
+    return round((time.perf_counter() - t0) * 1000, 2)
+
+
+def spread(samples):
+    ordered = sorted(samples)
+    return {"median_ms": round(statistics.median(ordered), 3), "p95_ms": round(ordered[int(len(ordered) * 0.95)], 3),
+            "total_ms": round(sum(ordered), 1)}
+
+
+class DirectScanner(main.LibraryScanner):
+    """ Clock లేకుండా - కాల్ బ్యాక్ లు నేరుగా """
+    def _post(self, callback, *args):
+        if callback is not None: callback(*args)
+
+
+def device_rules(storage):
+    """ ScanRules డిఫాల్ట్ రూట్ లు, /storage/emulated/0 బదులు సింథటిక్ ట్రీ కింద """
+    return main.ScanRules([os.path.join(storage, os.path.relpath(root, "/storage/emulated/0")) for root in main.ScanRules.DEFAULT_ROOTS])
+
+
+def bench_scan(storage, db_path):
+    """ మొదటి స్కాన్, మార్పు లేని రీ-స్కాన్, ట్యాగ్ పైప్ లైన్ - డేటాబేస్ మిగతా సీనారియోలకు మిగులుతుంది """
+    index = main.LibraryIndex(db_path)
+    rules = device_rules(storage)
+    progress = []
+    make = lambda: DirectScanner(index, rules, main.MEDIA_TYPES['audio'], on_batch=None, on_progress=lambda *a: progress.append(a))
+    results = {"first_scan_ms": _common.timeit(make()._run, 1), "dirs_listed": progress[-1][1] if progress else 0,
+               "rescan_ms": _common.timeit(make()._run, 3)}
+    paths = index.untagged_paths()
+    t0 = time.perf_counter()
+    results["tagged"] = main.MetadataPipeline(index).process(paths)
+    results["tags_ms"] = ms_since(t0)
+    results["tracks"] = len(index.all_tracks())
+    index.close()
+    return results
+
+
+def bench_art(tree, cache_dir, count):
+    """ ఒక్కో పాటకి: ట్యాగ్ నుండి కవర్ తీసి క్యాష్ లో పెట్టడం (cold), థంబ్ నెయిల్స్, మళ్ళీ అడిగితే (warm).
+    ఆండ్రాయిడ్ రిట్రీవర్ ఫాల్ బ్యాక్ (player.get_art) ఇక్కడ లేదు - ట్యాగ్ రీడర్ దారి మాత్రమే """
+    cache = main.ArtCache(cache_dir)
+    thumbnailer = main.ArtThumbnailer(cache)
+    paths = tree['audio'][:count]
+    cold, thumbs, warm = [], [], []
+    found = 0
+    for path in paths:
+        t0 = time.perf_counter()
+        cached = cache.fetch(path, main.extract_art)
+        cold.append((time.perf_counter() - t0) * 1000)
+        if not cached: continue
+        found += 1
+        t0 = time.perf_counter()
+        thumbnailer.build(cached)
+        thumbs.append((time.perf_counter() - t0) * 1000)
+    for path in paths:
+        t0 = time.perf_counter()
+        cached = cache.fetch(path, main.extract_art)
+        if cached: thumbnailer.build(cached)
+        warm.append((time.perf_counter() - t0) * 1000)
+    return {"tracks": len(paths), "with_art": found, "cache_mb": round(cache.total / 1048576, 2),
+            "extract_cold": spread(cold), "thumbnails": spread(thumbs or [0]), "warm": spread(warm)}
+
+
+def bench_list(db_path):
+    """ app.load_library: డేటాబేస్ -> TrackStore -> TrackListView -> music_list_data, ప్రతి sort మోడ్ లో """
+    app = main.PrasadProApp()
+    app.library = main.LibraryIndex(db_path)
+    app.queue = main.PlayQueue()
+    app.track_model = main.TrackDataModel()
+    app.player = main.NativeAudioPlayer(media_player_cls=FakeMediaPlayer)
+    results = {}
+    for mode in app.SORT_MODES:
+        app.sort_mode = mode
+        results[f"load_library_{mode}_ms"] = _common.timeit(app.load_library, 3)
+    t0 = time.perf_counter()
+    visible = [app.track_model.data[i] for i in range(min(12, len(app.track_model.data)))]
+    results["first_screen_ms"] = ms_since(t0)
+    results["rows"] = len(app.track_model.data)
+    assert len(visible) == min(12, results["rows"])
+    app.library.close()
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=_common.ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def metadata(config):
+    import kivy
+    return {"timestamp": datetime.datetime.now().isoformat(timespec='seconds'), "git": git_revision(),
+            "python": platform.python_version(), "platform": platform.platform(), "kivy": kivy.__version__,
+            "cpus": os.cpu_count(), "tree": config}
+
+
+def timings(results, prefix=""):
+    """ {'scan.first_scan_ms': 12.3, ...} - '_ms' తో ముగిసే అన్ని సంఖ్యలు (తక్కువ అయితే మంచిది) """
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict): flat.update(timings(value, name + "."))
+        elif key.endswith("_ms") and isinstance(value, (int, float)): flat[name] = value
+    return flat
+
+
+def compare(current, baseline, threshold, floor_ms=1.0):
+    """ baseline కంటే threshold% కంటే ఎక్కువ (మరియు floor_ms కంటే ఎక్కువ) నెమ్మదైన కొలతలు """
+    old = timings(baseline.get("results", {}))
+    regressions = []
+    for name, value in timings(current).items():
+        before = old.get(name)
+        if before is None or value - before < floor_ms: continue
+        if value > before * (1 + threshold / 100):
+            regressions.append({"metric": name, "baseline_ms": before, "current_ms": value,
+                                "change_pct": round((value - before) / before * 100, 1) if before else None})
+    return regressions
+
+
+def run(config, only=SCENARIOS, art_tracks=100, startup_runs=3, keep=False):
+    work = tempfile.mkdtemp(prefix="vault_suite_")
+    storage = os.path.join(work, "storage", "emulated", "0")
+    db_path = os.path.join(work, "vault_library.db")
+    results = {}
+    try:
+        t0 = time.perf_counter()
+        tree = synthetic.build_device_tree(storage, **config)
+        results["generate"] = {"generate_tree_s": round(time.perf_counter() - t0, 2),
+                               **{kind: len(tree[kind]) for kind in ('audio', 'images', 'videos', 'other')}}
+        # లిస్ట్ / స్టార్టప్ కి స్కాన్ చేసిన డేటాబేస్ కావాలి
+        scanned = bench_scan(storage, db_path)
+        if 'scan' in only: results["scan"] = scanned
+        if 'art' in only: results["art"] = bench_art(tree, os.path.join(work, "art"), art_tracks)
+        if 'list' in only: results["list"] = bench_list(db_path)
+        if 'startup' in only:
+            results["startup_empty"] = bench_startup.run(runs=startup_runs)
+            results["startup_library"] = bench_startup.run(runs=startup_runs, library=db_path)
+    finally:
+        if keep: print(f"Synthetic tree kept at {work}")
+        else: shutil.rmtree(work, ignore_errors=True)
+    return results
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="చిన్న ట్రీ (CI / త్వరిత చెక్)")
+    for key in ('audio', 'images', 'videos', 'other', 'depth'):
+        parser.add_argument(f"--{key}", type=int)
+    parser.add_argument("--no-covers", action="store_true")
+    parser.add_argument("--only", default=",".join(SCENARIOS), help="కామాతో: " + ",".join(SCENARIOS))
+    parser.add_argument("--art-tracks", type=int, default=100)
+    parser.add_argument("--startup-runs", type=int, default=3)
+    parser.add_argument("--out", help="ఫలితాల JSON ఫైల్")
+    parser.add_argument("--baseline", help="పాత ఫలితాల JSON - దానితో పోలుస్తుంది")
+    parser.add_argument("--threshold", type=float, default=10.0, help="ఎంత శాతం నెమ్మదైతే రిగ్రెషన్")
+    parser.add_argument("--keep", action="store_true", help="సింథటిక్ ట్రీని తొలగించకు")
+    args = parser.parse_args(argv)
+
+    config = dict(PRESETS['quick' if args.quick else 'full'])
+    for key in config:
+        if getattr(args, key) is not None: config[key] = getattr(args, key)
+    config['covers'] = not args.no_covers
+    only = tuple(name.strip() for name in args.only.split(",") if name.strip())
+    unknown = set(only) - set(SCENARIOS)
+    if unknown: parser.error(f"unknown scenario: {', '.join(sorted(unknown))}")
+
+    # stdout లో చివరి JSON మాత్రమే - మధ్యలో వచ్చే ప్రింట్ లు stderr కి (Kivy sys.stderr ని లాగర్ కి మళ్ళిస్తుంది, అందుకే __stderr__)
+    with contextlib.redirect_stdout(sys.__stderr__):
+        results = run(config, only, args.art_tracks, args.startup_runs, args.keep)
+    report = {"suite": "vault", "meta": metadata(config), "results": results}
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = compare(results, json.load(f), args.threshold)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    for item in report.get("regressions", ()):
+        print(f"REGRESSION {item['metric']}: {item['baseline_ms']} -> {item['current_ms']} ms ({item['change_pct']}%)", file=sys.__stderr__)
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,200 @@
+""" బెంచ్ మార్క్ ల కోసం నిజమైన ట్యాగ్ హెడర్లు ఉన్న నకిలీ ఆడియో ఫైల్స్, JPEG లు, MP4 కంటైనర్లు, ఫోన్ స్టోరేజ్ లాంటి ట్రీ తయారు చేస్తుంది (ఆడియో డేటా సున్నాలు) """
+import io
+import os
+import struct
+
+# MPEG1 Layer III, 128 kbps, 44.1 kHz, stereo
+MP3_FRAME_HEADER = b'\xff\xfb\x90\x00'
+MP3_FRAME_BYTES = 417
+
+
+def _syncsafe(n):
+    return bytes([(n >> 21) & 0x7F, (n >> 14) & 0x7F, (n >> 7) & 0x7F, n & 0x7F])
+
+
+def id3_tag(title, artist, album, track, cover=b'', padding=256):
+    """ ID3v2.3 ట్యాగ్: TIT2/TPE1/TALB/TRCK + (ఉంటే) APIC front cover """
+    def frame(fid, data):
+        return fid + struct.pack('>I', len(data)) + b'\x00\x00' + data
+    body = (frame(b'TIT2', b'\x03' + title.encode('utf-8')) +
+            frame(b'TPE1', b'\x01' + artist.encode('utf-16')) +
+            frame(b'TALB', b'\x03' + album.encode('utf-8')) +
+            frame(b'TRCK', b'\x00' + str(track).encode('ascii')))
+    if cover:
+        body += frame(b'APIC', b'\x00image/jpeg\x00\x03\x00' + cover)
+    body += b'\x00' * padding
+    return b'ID3\x03\x00\x00' + _syncsafe(len(body)) + body
+
+
+def mp3_bytes(title, artist, album, track, cover=b'', frames=40):
+    return id3_tag(title, artist, album, track, cover) + (MP3_FRAME_HEADER + b'\x00' * (MP3_FRAME_BYTES - 4)) * frames
+
+
+def _vorbis_comment(fields):
+    vendor = b'vault-synthetic'
+    items = [f"{key}={value}".encode('utf-8') for key, value in fields.items()]
+    return (struct.pack('<I', len(vendor)) + vendor + struct.pack('<I', len(items)) +
+            b''.join(struct.pack('<I', len(item)) + item for item in items))
+
+
+def _flac_picture(cover):
+    mime = b'image/jpeg'
+    return (struct.pack('>II', 3, len(mime)) + mime + struct.pack('>I', 0) + b'\x00' * 16 +
+            struct.pack('>I', len(cover)) + cover)
+
+
+def flac_bytes(title, artist, album, track, cover=b'', seconds=180, rate=44100):
+    streaminfo = b'\x00' * 10 + ((rate << 44) | (1 << 41) | (15 << 36) | (rate * seconds)).to_bytes(8, 'big') + b'\x00' * 16
+    blocks = [(0, streaminfo), (4, _vorbis_comment({'TITLE': title, 'ARTIST': artist, 'ALBUM': album, 'TRACKNUMBER': track}))]
+    if cover:
+        blocks.append((6, _flac_picture(cover)))
+    out = b'fLaC'
+    for i, (kind, data) in enumerate(blocks):
+        out += bytes([(0x80 if i == len(blocks) - 1 else 0) | kind]) + len(data).to_bytes(3, 'big') + data
+    return out + b'\x00' * 4096
+
+
+def fake_jpeg(size):
+    """ JPEG SOI/EOI మార్కర్ల మధ్య నకిలీ డేటా - పార్సర్/క్యాష్ బెంచ్ లకు చాలు """
+    return b'\xff\xd8\xff\xe0' + os.urandom(max(0, size - 6)) + b'\xff\xd9'
+
+
+def build_audio_library(root, count, cover=b'', albums=50, artists=20, flac_every=5):
+    """ root లో count ఫైల్స్ (ప్రతి flac_every వ ఫైల్ FLAC, మిగతావి MP3); paths లిస్ట్ ఇస్తుంది """
+    paths = []
+    for i in range(count):
+        artist = f"Artist {i % artists:02}"
+        album = f"Album {i % albums:03}"
+        folder = os.path.join(root, artist, album)
+        os.makedirs(folder, exist_ok=True)
+        title = f"Track {i:05}"
+        if flac_every and i % flac_every == 0:
+            path = os.path.join(folder, f"{i:05}.flac")
+            data = flac_bytes(title, artist, album, i % 12 + 1, cover)
+        else:
+            path = os.path.join(folder, f"{i:05}.mp3")
+            data = mp3_bytes(title, artist, album, i % 12 + 1, cover)
+        with open(path, 'wb') as f:
+            f.write(data)
+        paths.append(path)
+    return paths
+
+
+def real_jpeg(size, seed=0, quality=85):
+    """ Pillow తో నిజంగా డీకోడ్ అయ్యే JPEG - రంగు + నాయిస్ (ఫ్లాట్ రంగు కంటే నిజమైన ఫోటో సైజ్ కి దగ్గర).
+    size = px లేదా (w, h); Pillow లేకపోతే fake_jpeg """
+    width, height = (size, size) if isinstance(size, int) else size
+    try: from PIL import Image
+    except ImportError: return fake_jpeg(width * height // 8)
+    noise = Image.effect_noise((width, height), 30 + seed % 50).convert('RGB')
+    color = Image.new('RGB', (width, height), ((seed * 53) % 256, (seed * 97) % 256, (seed * 31) % 256))
+    out = io.BytesIO()
+    Image.blend(color, noise, 0.4).save(out, 'JPEG', quality=quality)
+    return out.getvalue()
+
+
+def mp4_bytes(seconds, timescale=1000, payload=4096):
+    """ ftyp + moov/mvhd (నిడివి) + mdat - వీడియో ఫ్రేమ్ లు లేవు, కానీ కంటైనర్ పార్సర్లకు నిజమైన అటమ్ లు """
+    def atom(kind, data):
+        return struct.pack('>I', len(data) + 8) + kind + data
+    mvhd = b'\x00' * 12 + struct.pack('>II', timescale, int(seconds * timescale)) + b'\x00\x01\x00\x00\x01\x00' + b'\x00' * 74
+    return (atom(b'ftyp', b'isom\x00\x00\x02\x00isomiso2mp41') + atom(b'moov', atom(b'mvhd', mvhd)) +
+            atom(b'mdat', b'\x00' * payload))
+
+
+def _nested(base, index, depth, labels, fanout=6):
+    """ index వ లీఫ్ ఫోల్డర్ - depth స్థాయిల లోతు (ప్రతి స్థాయిలో fanout ఫోల్డర్లు) """
+    parts = [base]
+    for level in range(depth):
+        label = labels[min(level, len(labels) - 1)]
+        parts.append(f"{label} {index // fanout ** (depth - level - 1) % fanout:02}")
+    return os.path.join(*parts)
+
+
+def _write(folder, name, data):
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, name)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return path
+
+
+# ఆడియో / ఫోటోలు / వీడియోలు ఫోన్ లో సాధారణంగా ఎక్కడ ఉంటాయో; *_SPLIT = ఏ రూట్ కి ఎంత భాగం
+ROOTS = {
+    'music': ('Music',), 'download': ('Download',), 'whatsapp': ('WhatsApp', 'Media', 'WhatsApp Audio'),
+    'recordings': ('Recordings',), 'snaptube': ('Snaptube', 'download'), 'dcim': ('DCIM',),
+    'pictures': ('Pictures',), 'movies': ('Movies',), 'whatsapp_images': ('WhatsApp', 'Media', 'WhatsApp Images'),
+    'whatsapp_video': ('WhatsApp', 'Media', 'WhatsApp Video'), 'statuses': ('WhatsApp', 'Media', '.Statuses'),
+    'android_data': ('Android', 'data'),
+}
+AUDIO_SPLIT = (('music', 0.7), ('download', 0.1), ('whatsapp', 0.1), ('recordings', 0.05), ('snaptube', 0.05))
+IMAGE_SPLIT = (('camera', 0.5), ('thumbnails', 0.2), ('screenshots', 0.15), ('whatsapp_images', 0.15))
+VIDEO_SPLIT = (('camera', 0.3), ('movies', 0.2), ('whatsapp_video', 0.2), ('statuses', 0.2), ('snaptube', 0.1))
+
+
+def _split(count, shares):
+    """ count ని shares ప్రకారం పంచుతుంది (మిగిలినవి మొదటిదానికి) """
+    parts = [(name, int(count * share)) for name, share in shares]
+    return [(parts[0][0], parts[0][1] + count - sum(n for _, n in parts))] + parts[1:]
+
+
+def build_device_tree(root, audio=1000, images=3000, videos=200, other=300, depth=2, covers=True,
+                      cover_px=500, image_px=(320, 240), flac_every=5, per_folder=12):
+    """ /storage/emulated/0 లాంటి ట్రీ: Music (Artist/Album... depth లోతు), Download, WhatsApp (హిడెన్ .Statuses తో),
+    DCIM కెమెరా + .thumbnails, Pictures, Movies, Android/data.
+    పాటలు నిజమైన ID3v2 / FLAC ట్యాగ్ లతో (covers=True అయితే ఒక్కో ఆల్బమ్ కి ఒక ఎంబెడెడ్ JPEG కవర్),
+    ఫోటోలు Pillow JPEG లు, వీడియోలు mvhd నిడివి ఉన్న MP4 కంటైనర్లు, other = pdf/apk లాంటి మీడియా కాని ఫైల్స్.
+    {'roots': {పేరు: path}, 'audio': [...], 'images': [...], 'videos': [...], 'other': [...]} ఇస్తుంది """
+    roots = {name: os.path.join(root, *parts) for name, parts in ROOTS.items()}
+    tree = {'roots': roots, 'audio': [], 'images': [], 'videos': [], 'other': []}
+    album_covers = {}
+    n = 0
+    for where, count in _split(audio, AUDIO_SPLIT):
+        for i in range(count):
+            if where == 'music':
+                leaf = i // per_folder
+                folder = _nested(roots['music'], leaf, depth, ('Artist', 'Album', 'Disc'))
+                artist, album = f"Artist {leaf // 6 % 40:02}", f"Album {leaf:03}"
+            else:
+                leaf = where
+                folder = roots[where] if where != 'whatsapp' else os.path.join(roots[where], f"2024{i // 50 % 12 + 1:02}")
+                artist, album = f"Artist {i % 40:02}", ""
+            if covers and leaf not in album_covers:
+                album_covers[leaf] = real_jpeg(cover_px, seed=len(album_covers))
+            cover = album_covers.get(leaf, b'')
+            title = f"Track {n:05}"
+            if flac_every and n % flac_every == 0:
+                name, data = f"{n:05} - {title}.flac", flac_bytes(title, artist, album, i % per_folder + 1, cover)
+            else:
+                name, data = f"{n:05} - {title}.mp3", mp3_bytes(title, artist, album, i % per_folder + 1, cover)
+            tree['audio'].append(_write(folder, name, data))
+            n += 1
+
+    # ఒకే రకం ఫోటోలు చాలా - కొన్ని నిజమైన JPEG లను మార్చి మార్చి రాస్తాం
+    photos = [real_jpeg(image_px, seed=s) for s in range(8)] if images else []
+    thumbs = [real_jpeg((96, 72), seed=s) for s in range(4)] if images else []
+    for where, count in _split(images, IMAGE_SPLIT):
+        for i in range(count):
+            if where == 'camera':
+                folder = _nested(os.path.join(roots['dcim'], 'Camera'), i // 100, max(depth - 1, 0), ('Month',))
+                name, data = f"IMG_{i:05}.jpg", photos[i % 8]
+            elif where == 'thumbnails':
+                folder, name, data = os.path.join(roots['dcim'], '.thumbnails'), f"{i:05}.jpg", thumbs[i % 4]
+            elif where == 'screenshots':
+                folder, name, data = os.path.join(roots['pictures'], 'Screenshots'), f"Screenshot_{i:05}.jpg", photos[i % 8]
+            else:
+                folder, name, data = roots['whatsapp_images'], f"IMG-{i:05}-WA0000.jpg", photos[i % 8]
+            tree['images'].append(_write(folder, name, data))
+
+    for where, count in _split(videos, VIDEO_SPLIT):
+        for i in range(count):
+            folder = os.path.join(roots['dcim'], 'Camera') if where == 'camera' else roots[where]
+            tree['videos'].append(_write(folder, f"VID_{where}_{i:04}.mp4", mp4_bytes(15 + i % 600)))
+
+    for i in range(other):
+        if i % 3 == 2:
+            folder, name = os.path.join(roots['android_data'], f"com.app{i % 10}", 'cache'), f"blob {i}.bin"
+        else:
+            folder, name = roots['download'], f"file {i}.{('pdf', 'apk')[i % 3]}"
+        tree['other'].append(_write(folder, name, name.encode('utf-8') * 16))
+    return tree
@@ -4,6 +4,7 @@ package.name = prasad_vault
 package.domain = org.prasad
 source.dir = .
 source.include_exts = py,png,jpg,kv,atlas
+source.exclude_dirs = benchmarks, tests
 version = 3.5
 requirements = python3,kivy==2.3.0,kivymd==1.2.0,pillow,android,pyjnius
 orientation = portrait
@@ -1,126 +1,615 @@
 import os
 import time
+# స్టార్టప్ కొలతలు ఇక్కడి నుండి - ఇంపోర్ట్ ఖర్చు కూడా లెక్కలోకి వస్తుంది
+STARTUP_T0 = time.perf_counter()
+import abc
 import random
 import sys
 import traceback
+import threading
+import select
+import struct
+import ctypes
+import errno
+import sqlite3
+import io
+import json
+import base64
 import hashlib # For enhanced security
+import re
+import fnmatch
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from kivymd.app import MDApp
 from kivy.lang import Builder
-from kivy.uix.screenmanager import ScreenManager, Screen, NoTransition
-from kivymd.uix.filemanager import MDFileManager
 from kivymd.toast import toast
-from kivymd.uix.boxlayout import MDBoxLayout
-from kivymd.uix.floatlayout import MDFloatLayout
-from kivymd.uix.gridlayout import MDGridLayout
-from kivymd.uix.card import MDCard
-from kivymd.uix.label import MDLabel
-from kivymd.uix.button import MDIconButton, MDRaisedButton, MDFillRoundFlatButton, MDFlatButton
-from kivymd.uix.slider import MDSlider
-from kivymd.uix.selectioncontrol import MDSwitch
-from kivymd.uix.fitimage import FitImage
-from kivymd.uix.list import TwoLineAvatarIconListItem, IconLeftWidget
-from kivymd.uix.dialog import MDDialog
-from kivymd.uix.textfield import MDTextField
-from kivy.uix.modalview import ModalView
+from kivymd.uix.list import TwoLineAvatarIconListItem
+# మిగతా KivyMD విడ్జెట్ లు KV లో Factory ద్వారా, లేదా వాడే మెథడ్ లోనే ఇంపోర్ట్ అవుతాయి (డైలాగ్ లు, ఫైల్ మేనేజర్, ఫుల్ ప్లేయర్)
 from kivy.utils import platform
-from kivy.properties import StringProperty, ListProperty, BooleanProperty, NumericProperty
+from kivy.properties import StringProperty, ListProperty, BooleanProperty, NumericProperty, ObjectProperty
 from kivy.clock import Clock
 from kivy.core.window import Window
-from kivy.storage.jsonstore import JsonStore 
+from kivy.metrics import dp
+from kivy.event import EventDispatcher
+from kivy.uix.recycleview.datamodel import RecycleDataModelBehavior
+from kivy.uix.behaviors import ButtonBehavior
+from kivy.uix.widget import Widget
 
 # --- 1. SYSTEM STABILITY & CRASH HANDLER ---
 # యాప్ ఎప్పుడైనా క్రాష్ అయితే, అది ఎందుకు జరిగిందో ఒక ఫైల్ లో రాస్తుంది.
 # దీనివల్ల యూజర్ కి వెంటనే తెలియకపోయినా, డెవలపర్ కి ఉపయోగపడుతుంది.
+# ఫైల్ రాయడం బ్యాక్ గ్రౌండ్ థ్రెడ్ లో (append, JSON లైన్లు), సైజ్ దాటితే .1 / .2 / .3 గా రొటేట్ - పాత క్రాష్ లు పోవు.
+# స్క్రీన్ మార్పులు, పాట లోడ్ లు, స్కాన్ ప్రోగ్రెస్ లాంటి చివరి ఈవెంట్లు మెమరీ లోనే (రింగ్ బఫర్) - క్రాష్ తో పాటే డిస్క్ కి.
+class EventLog:
+    LOG_DIR = "/storage/emulated/0/PrasadApp"
+    MAX_BYTES = 256 * 1024
+    BACKUPS = 3
+    RECENT = 200    # క్రాష్ తో పాటు రాసే చివరి ఈవెంట్లు
+
+    def __init__(self, folder=LOG_DIR, name="vault_log.jsonl", max_bytes=MAX_BYTES, backups=BACKUPS, recent=RECENT):
+        self.path = os.path.join(folder, name)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.recent = deque(maxlen=recent)     # (time, kind, text)
+        self._pending = []
+        self._queued = 0
+        self._written = 0
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def event(self, kind, text=""):
+        """ ఏ థ్రెడ్ నుండైనా - మెమరీ లో మాత్రమే, డిస్క్ I/O లేదు """
+        self.recent.append((time.time(), kind, str(text)))
+
+    def write(self, level, message, exc=None, thread=None, with_recent=False):
+        """ రికార్డ్ ని క్యూ లో పెడుతుంది; traceback ఫార్మాట్ చేయడం, ఫైల్ రాయడం రైటర్ థ్రెడ్ లో """
+        record = {'time': time.strftime('%Y-%m-%d %H:%M:%S'), 'level': level, 'message': message,
+                  'thread': thread or threading.current_thread().name}
+        if with_recent:
+            record['recent'] = [{'time': round(t, 3), 'kind': kind, 'text': text} for t, kind, text in list(self.recent)]
+        with self._cond:
+            self._pending.append((record, exc))
+            self._queued += 1
+            self._cond.notify_all()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="vault-log", daemon=True)
+                self._thread.start()
+
+    def crash(self, ex_type, ex_value, ex_traceback, thread=None):
+        self.write('crash', f"{ex_type.__name__}: {ex_value}", (ex_type, ex_value, ex_traceback), thread, with_recent=True)
+
+    def watch(self, future):
+        """ ThreadPoolExecutor పనుల ఎక్సెప్షన్లు threading.excepthook కి రావు (future లోనే ఉండిపోతాయి) - వాటిని కూడా రాస్తుంది """
+        def done(f):
+            if f.cancelled(): return
+            e = f.exception()
+            if e is not None: self.crash(type(e), e, e.__traceback__)
+        future.add_done_callback(done)
+        return future
+
+    def flush(self, timeout=1.0):
+        """ క్యూ లో ఉన్నవన్నీ డిస్క్ కి చేరే వరకు (గరిష్ఠం timeout) - ప్రాసెస్ ముగిసే ముందు మాత్రమే """
+        with self._cond:
+            target = self._queued
+            return self._cond.wait_for(lambda: self._written >= target, timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+                batch, self._pending = self._pending, []
+            lines = []
+            for record, exc in batch:
+                if exc: record['traceback'] = "".join(traceback.format_exception(*exc))
+                lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.writelines(lines)
+                    size = f.tell()
+                if size > self.max_bytes: self._rotate()
+            except Exception as e:
+                print(f"Log Error: {str(e)}")
+            with self._cond:
+                self._written += len(batch)
+                self._cond.notify_all()
+
+    def _rotate(self):
+        for n in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{n}"): os.replace(f"{self.path}.{n}", f"{self.path}.{n + 1}")
+        os.replace(self.path, self.path + ".1")
+
+event_log = EventLog()
+
+
 def global_exception_handler(ex_type, ex_value, ex_traceback):
     error_msg = "".join(traceback.format_exception(ex_type, ex_value, ex_traceback))
     print(f"CRASH LOG: {error_msg}")
-    try:
-        # Saving log to internal storage for safety
-        log_path = "/storage/emulated/0/PrasadApp/crash_log.txt"
-        with open(log_path, "w") as f:
-            f.write(error_msg)
-    except:
-        pass
+    event_log.crash(ex_type, ex_value, ex_traceback)
+    # మెయిన్ థ్రెడ్ క్రాష్ అంటే ప్రాసెస్ ముగుస్తోంది - రైటర్ పూర్తి చేసే వరకు కొద్దిసేపు ఆగుతాం
+    event_log.flush(1.0)
+
+
+def thread_exception_handler(args):
+    """ వర్కర్ థ్రెడ్ లలో (స్కానర్, మెటాడేటా, ఆర్ట్...) పట్టని ఎక్సెప్షన్లు - యాప్ కొనసాగుతుంది """
+    if args.exc_type is SystemExit: return
+    print(f"THREAD CRASH ({args.thread.name if args.thread else '?'}): {args.exc_type.__name__}: {args.exc_value}")
+    event_log.crash(args.exc_type, args.exc_value, args.exc_traceback, args.thread.name if args.thread else None)
 
 sys.excepthook = global_exception_handler
+threading.excepthook = thread_exception_handler
 
 # బ్లాక్ స్క్రీన్ తో స్టార్ట్ అయితే గ్లిచ్ లు కనిపించవు
 Window.clearcolor = (0, 0, 0, 1)
 
+# --- METRICS (TIMING SPANS) ---
+# హాట్ పాత్ ల చుట్టూ తేలికైన టైమింగ్ స్పాన్ లు, మెమరీ లోని రింగ్ బఫర్ లో (నిండితే పాతవి పోతాయి) + Kivy ఫ్రేమ్ సమయాలు.
+# ఆఫ్ లో ఉంటే ఒక్క enabled చెక్ మాత్రమే; ఫ్రేమ్ టైమర్ ఆన్ చేసినప్పుడే షెడ్యూల్ అవుతుంది.
+# సెట్టింగ్స్ లో Performance Overlay ('debug' కీ) లేదా VAULT_METRICS=1 తో ఆన్ అవుతుంది.
+class _NullSpan:
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+
+class _Span:
+    __slots__ = ('metrics', 'name', 'start')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.record(self.name, self.start)
+        return False
+
+
+class Metrics:
+    CAPACITY = 2000         # స్పాన్ లు
+    FRAME_CAPACITY = 600    # ఫ్రేమ్ లు (60 fps లో 10 సెకన్లు)
+    JANK_MS = 33.4          # రెండు vsync లు దాటిన ఫ్రేమ్
+    EXPORT_PATH = "/storage/emulated/0/PrasadApp/metrics.json"
+    NULL_SPAN = _NullSpan()
+
+    def __init__(self, capacity=CAPACITY):
+        self.enabled = False
+        self.spans = deque(maxlen=capacity)     # (name, start - STARTUP_T0 నుండి ms, ms, thread)
+        self.frames = deque(maxlen=self.FRAME_CAPACITY)
+        self._frame_event = None
+
+    def enable(self, state):
+        self.enabled = bool(state)
+        if self.enabled and self._frame_event is None:
+            self._frame_event = Clock.schedule_interval(self._on_frame, 0)
+        elif not self.enabled and self._frame_event is not None:
+            self._frame_event.cancel()
+            self._frame_event = None
+
+    def _on_frame(self, dt):
+        # ప్రతి ఫ్రేమ్ కి ఒకసారి - dt = ముందు ఫ్రేమ్ నుండి సమయం (మెయిన్ థ్రెడ్ ఆగితే పెద్దదవుతుంది)
+        self.frames.append(dt * 1000)
+
+    def span(self, name):
+        """ with metrics.span('name'): ... - ఆఫ్ లో ఉంటే ఏమీ చేయని షేర్డ్ ఆబ్జెక్ట్ """
+        if not self.enabled: return self.NULL_SPAN
+        return _Span(self, name)
+
+    def timed(self, name):
+        """ మెథడ్ డెకరేటర్ - ఆఫ్ లో ఉంటే నేరుగా పిలుస్తుంది """
+        def wrap(fn):
+            def timed_call(*args, **kwargs):
+                if not self.enabled: return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try: return fn(*args, **kwargs)
+                finally: self.record(name, start)
+            timed_call.__name__ = fn.__name__
+            timed_call.__doc__ = fn.__doc__
+            return timed_call
+        return wrap
+
+    def record(self, name, start, end=None):
+        """ start (perf_counter) నుండి ఇప్పటి వరకు - వేరే థ్రెడ్ / కాల్ బ్యాక్ లో ముగిసే పనులకు కూడా """
+        if not self.enabled: return
+        if end is None: end = time.perf_counter()
+        self.spans.append((name, round((start - STARTUP_T0) * 1000, 1), (end - start) * 1000, threading.current_thread().name))
+
+    def summary(self):
+        """ పేరు వారీగా count / mean / p95 / max / last (ms) + ఫ్రేమ్ గణాంకాలు """
+        groups = {}
+        for name, _, ms, _ in list(self.spans):
+            groups.setdefault(name, []).append(ms)
+        spans = {}
+        for name, values in groups.items():
+            last = values[-1]
+            values.sort()
+            spans[name] = {'count': len(values), 'mean_ms': round(sum(values) / len(values), 2),
+                           'p95_ms': round(values[int(len(values) * 0.95)], 2), 'max_ms': round(values[-1], 2), 'last_ms': round(last, 2)}
+        frames = sorted(self.frames)
+        stats = {'count': len(frames)}
+        if frames:
+            total = sum(frames)
+            stats.update(fps=round(len(frames) * 1000 / total, 1) if total else 0, p50_ms=round(frames[len(frames) // 2], 2),
+                         p95_ms=round(frames[int(len(frames) * 0.95)], 2), max_ms=round(frames[-1], 2),
+                         janky=sum(1 for ms in frames if ms > self.JANK_MS))
+        return {'spans': spans, 'frames': stats}
+
+    def export(self, path=EXPORT_PATH, **extra):
+        """ సారాంశం + రింగ్ బఫర్ లోని స్పాన్ లు + ఫ్రేమ్ సమయాలు JSON గా (tmp లో రాసి replace) """
+        data = {'exported_at': time.strftime('%Y-%m-%d %H:%M:%S'), 'summary': self.summary(),
+                'spans': [{'name': name, 'at_ms': at, 'ms': round(ms, 3), 'thread': thread} for name, at, ms, thread in list(self.spans)],
+                'frames_ms': [round(ms, 2) for ms in list(self.frames)]}
+        data.update(extra)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f: json.dump(data, f, indent=1)
+        os.replace(tmp, path)
+        return path
+
+metrics = Metrics()
+if os.environ.get("VAULT_METRICS") == "1": metrics.enable(True)
+
 # --- 2. ADVANCED SPATIAL AUDIO ENGINE ---
-class NativeAudioPlayer:
-    def __init__(self):
-        self.player = None
+# MediaPlayer ఈవెంట్లు (prepared / completion / error) ఆండ్రాయిడ్ UI థ్రెడ్ లో వస్తాయి; ఇక్కడి నుండి Kivy థ్రెడ్ కి పంపుతాం.
+# ప్రతి MediaPlayer కి సొంత PlayerEvents - గ్యాప్ లెస్ స్వాప్ తర్వాత కూడా ఏ ప్లేయర్ నుండి వచ్చిందో తెలుస్తుంది.
+class PlayerEvents:
+    def __init__(self, owner, player=None):
+        self.owner = owner
+        self.player = player
+
+    def onPrepared(self, mp):
+        self.owner._on_prepared(self.player)
+
+    def onCompletion(self, mp):
+        self.owner._on_completion(self.player)
+
+    def onError(self, mp, what, extra):
+        return self.owner._on_error(self.player, what, extra)
+
+
+_java_listener_class = None
+
+def java_player_listener(events):
+    """ PlayerEvents ని Java MediaPlayer లిస్నర్ ఇంటర్ ఫేస్ లలో చుడుతుంది (ఆండ్రాయిడ్ మాత్రమే) """
+    global _java_listener_class
+    if _java_listener_class is None:
+        from jnius import PythonJavaClass, java_method
+
+        class MediaPlayerListener(PythonJavaClass):
+            __javainterfaces__ = ['android/media/MediaPlayer$OnPreparedListener',
+                                  'android/media/MediaPlayer$OnCompletionListener',
+                                  'android/media/MediaPlayer$OnErrorListener']
+
+            def __init__(self, events):
+                super().__init__()
+                self.events = events
+
+            @java_method('(Landroid/media/MediaPlayer;)V')
+            def onPrepared(self, mp):
+                self.events.onPrepared(mp)
+
+            @java_method('(Landroid/media/MediaPlayer;)V')
+            def onCompletion(self, mp):
+                self.events.onCompletion(mp)
+
+            @java_method('(Landroid/media/MediaPlayer;II)Z')
+            def onError(self, mp, what, extra):
+                return self.events.onError(mp, what, extra)
+
+        _java_listener_class = MediaPlayerListener
+    return _java_listener_class(events)
+
+
+class AudioEffects:
+    """ ఒకే Equalizer / Virtualizer / BassBoost చైన్ - ప్రతి పాటకీ కొత్తవి కట్టకుండా,
+        ఆడియో సెషన్ నిజంగా మారినప్పుడు మాత్రమే మళ్ళీ అటాచ్ చేస్తుంది. యూజర్ సెట్టింగ్స్ ఇక్కడే ఉంటాయి. """
+    SPATIAL_STRENGTH = 1000     # Virtualizer మాక్సిమం స్ట్రెంత్
+
+    def __init__(self, equalizer_cls=None, virtualizer_cls=None, bass_boost_cls=None):
+        self.Equalizer = equalizer_cls
+        self.Virtualizer = virtualizer_cls
+        self.BassBoost = bass_boost_cls
         self.equalizer = None
-        self.virtualizer = None 
+        self.virtualizer = None
         self.bass_boost = None
+        self.session_id = None
+        self.spatial = False
+        # ఎన్నిసార్లు చైన్ కట్టాం, ఎంత సమయం పట్టింది (ms)
+        self.setups = 0
+        self.setup_ms = 0.0
+        self.total_setup_ms = 0.0
+
+    def attach(self, session_id):
+        """ అదే సెషన్ అయితే ఉన్న చైన్ నే వాడుతుంది; కొత్త సెషన్ అయితే మాత్రమే మళ్ళీ కడుతుంది """
+        if self.Equalizer is None: return False
+        if session_id == self.session_id and self.equalizer is not None: return False
+        start = time.perf_counter()
+        self.release()
+        try:
+            self.equalizer = self.Equalizer(0, session_id)
+            self.equalizer.setEnabled(True)
+            self.virtualizer = self.Virtualizer(0, session_id)
+            self.bass_boost = self.BassBoost(0, session_id)
+            self.bass_boost.setEnabled(False)
+            self.session_id = session_id
+            self.apply_spatial()
+        except Exception as e:
+            print(f"Effects Error: {str(e)}")
+        self.setups += 1
+        self.setup_ms = (time.perf_counter() - start) * 1000
+        self.total_setup_ms += self.setup_ms
+        metrics.record('player.setup_effects', start)
+        return True
+
+    def set_spatial(self, state):
+        self.spatial = bool(state)
+        return self.apply_spatial()
+
+    def apply_spatial(self):
+        if not self.virtualizer: return False
+        try:
+            self.virtualizer.setEnabled(self.spatial)
+            if self.spatial and self.virtualizer.getStrengthSupported():
+                self.virtualizer.setStrength(self.SPATIAL_STRENGTH)
+            return True
+        except: return False
+
+    def release(self):
+        """ నేటివ్ ఎఫెక్ట్స్ ని విడుదల చేస్తుంది (సెషన్ మారినప్పుడు / యాప్ మూసేటప్పుడు) """
+        for effect in (self.equalizer, self.virtualizer, self.bass_boost):
+            if effect is not None:
+                try: effect.release()
+                except: pass
+        self.equalizer = self.virtualizer = self.bass_boost = None
+        self.session_id = None
+
+
+class NativeAudioPlayer:
+    def __init__(self, media_player_cls=None, effects=None):
+        self.player = None
+        self.next_player = None     # గ్యాప్ లెస్: తర్వాతి పాటను ముందే prepare చేసే రెండో ప్లేయర్
+        self.effects = effects or AudioEffects()
         self.is_prepared = False
         self.session_id = 0
         self.device_optimized = False
+        self.loading_path = None
+        self.next_path = None
+        self.next_ready = False     # next_player సిద్ధమై setNextMediaPlayer తో జత అయిందా
+        # పొజిషన్ / నిడివి Python వైపే ఉంచుతాం - సీక్ బార్ ప్రతి టిక్ కి JNI కాల్ చేయనక్కర్లేదు
+        self.duration_ms = 0
+        self.next_duration_ms = 0
+        self._pos_ms = 0
+        self._pos_at = None     # ప్లే అవుతుంటే _pos_ms ఏ క్షణంలో నమోదైందో (monotonic)
+        self.on_ready = None    # on_ready(path) - ట్రాక్ సిద్ధమైనప్పుడు (మెయిన్ థ్రెడ్)
+        self.on_error = None    # on_error(path, what, extra)
+        self.on_complete = None         # on_complete() - పాట అయిపోయింది, తర్వాతిది సిద్ధంగా లేదు
+        self.on_track_changed = None    # on_track_changed(path) - గ్యాప్ లెస్ గా తర్వాతి పాటకి మారింది
+        self._token = 0
+        self._next_token = 0
+        self._load_started = 0.0    # prepare స్పాన్ కోసం - load నుండి సిద్ధమయ్యే వరకు
+        self.volume = 1.0           # MediaPlayer.setVolume (0..1) - రెండు ప్లేయర్లకూ అదే
+        # _lock టోకెన్ / path / స్టేట్ మార్పులకు మాత్రమే - MediaPlayer కాల్స్ లాక్ బయట (లిస్నర్ థ్రెడ్ ఆగకుండా)
+        self._lock = threading.Lock()
+        self._resetting = None      # ఇప్పుడు reset అవుతున్న ప్లేయర్ - దాని పాత prepare / error లిస్నర్లు వదిలేస్తాం
+        self._fake = media_player_cls is not None
+        self._listeners = []    # Java లిస్నర్లు GC అవ్వకుండా పట్టుకుంటాం
         
+        if media_player_cls is not None:
+            # టెస్ట్ / బెంచ్ మార్క్ ల కోసం నకిలీ MediaPlayer
+            self.MediaPlayer = media_player_cls
+            self.player = self._new_player()
         # ఆండ్రాయిడ్ నేటివ్ లైబ్రరీలను లోడ్ చేయడం
-        if platform == 'android':
+        elif platform == 'android':
             try:
                 from jnius import autoclass
                 self.MediaPlayer = autoclass('android.media.MediaPlayer')
-                self.AudioEffect = autoclass('android.media.audiofx.AudioEffect')
-                self.Equalizer = autoclass('android.media.audiofx.Equalizer')
-                self.Virtualizer = autoclass('android.media.audiofx.Virtualizer')
-                self.BassBoost = autoclass('android.media.audiofx.BassBoost')
-                self.player = self.MediaPlayer()
+                if effects is None:
+                    self.effects = AudioEffects(autoclass('android.media.audiofx.Equalizer'),
+                                                autoclass('android.media.audiofx.Virtualizer'),
+                                                autoclass('android.media.audiofx.BassBoost'))
+                self.player = self._new_player()
                 self.device_optimized = True
             except Exception as e:
+                self.player = None
                 print(f"Audio Engine Warning: {str(e)}")
 
-    def load(self, path):
-        """ మ్యూజిక్ ఫైల్ ని లోడ్ చేసి ప్లే చేయడానికి సిద్ధం చేస్తుంది """
-        if self.player:
-            try:
-                self.release_effects()
-                self.player.reset()
-                self.player.setDataSource(path)
-                self.player.prepare()
-                self.is_prepared = True
-                self.session_id = self.player.getAudioSessionId()
-                self.setup_effects()
-            except Exception as e:
-                self.is_prepared = False
-                print(f"Load Error: {str(e)}")
+    def _new_player(self):
+        player = self.MediaPlayer()
+        events = PlayerEvents(self, player)
+        listener = events if self._fake else java_player_listener(events)
+        player.setOnPreparedListener(listener)
+        player.setOnCompletionListener(listener)
+        player.setOnErrorListener(listener)
+        self._listeners.append(listener)
+        self._apply_volume(player)
+        return player
 
-    def setup_effects(self):
-        """ 3D ఆడియో ఎఫెక్ట్స్ ని హార్డ్ వేర్ లెవల్ లో సెట్ చేస్తుంది """
-        if platform == 'android' and self.player:
-            try:
-                self.equalizer = self.Equalizer(0, self.session_id)
-                self.equalizer.setEnabled(True)
-                
-                self.virtualizer = self.Virtualizer(0, self.session_id)
-                self.virtualizer.setEnabled(False)
-                
-                self.bass_boost = self.BassBoost(0, self.session_id)
-                self.bass_boost.setEnabled(False)
-            except: pass
+    def _apply_volume(self, player):
+        try: player.setVolume(self.volume, self.volume)
+        except Exception: pass
+
+    def set_volume(self, level):
+        self.volume = min(1.0, max(0.0, float(level)))
+        for player in (self.player, self.next_player):
+            if player is not None: self._apply_volume(player)
 
-    def release_effects(self):
-        """ పాత ఎఫెక్ట్స్ ని మెమరీ నుండి తొలగిస్తుంది """
+    @metrics.timed('player.load')
+    def load(self, path, on_ready=None):
+        """ మ్యూజిక్ ఫైల్ ని prepareAsync తో లోడ్ చేస్తుంది - UI థ్రెడ్ బ్లాక్ అవ్వదు.
+            సిద్ధమైనప్పుడు on_ready(path) వస్తుంది; మధ్యలో కొత్త load వస్తే పాతది రద్దవుతుంది. """
+        if not self.player: return False
+        self.cancel_next()
+        with self._lock:
+            self._token += 1
+            token = self._token
+            self._load_started = time.perf_counter()
+            self.is_prepared = False
+            self.loading_path = path
+            self.duration_ms = 0
+            self._mark(0, False)
+            if on_ready is not None: self.on_ready = on_ready
+            player = self._resetting = self.player
         try:
-            if self.equalizer: self.equalizer.release()
-            if self.virtualizer: self.virtualizer.release()
-            if self.bass_boost: self.bass_boost.release()
-        except: pass
+            # reset() జరుగుతున్న prepareAsync ని కూడా రద్దు చేస్తుంది
+            self._reset(player)
+            player.setDataSource(path)
+            player.prepareAsync()
+            return True
+        except Exception as e:
+            with self._lock:
+                if token == self._token: self.loading_path = None
+            print(f"Load Error: {str(e)}")
+            return False
 
-    def toggle_spatial_audio(self, state):
-        """ 9.1 వర్చువల్ సరౌండ్ సౌండ్ ని ఆన్/ఆఫ్ చేస్తుంది """
-        if not self.virtualizer: self.setup_effects()
-        if self.virtualizer:
-            try:
-                self.virtualizer.setEnabled(state)
-                if state and self.virtualizer.getStrengthSupported():
-                    # మాక్సిమం స్ట్రెంత్ (1000) ఇస్తుంది
-                    self.virtualizer.setStrength(1000)
+    def preload_next(self, path):
+        """ తర్వాతి పాటను రెండో ప్లేయర్ లో అదే ఆడియో సెషన్ తో ముందే prepare చేస్తుంది.
+            సిద్ధమయ్యాక setNextMediaPlayer తో జత చేస్తాం - పాట అయిపోగానే ఆండ్రాయిడ్ దాన్ని గ్యాప్ లేకుండా మొదలుపెడుతుంది. """
+        if not self.player or not self.is_prepared or not path: return False
+        if path == self.next_path: return True
+        self.cancel_next()
+        if self.next_player is None:
+            self.next_player = self._new_player()
+        with self._lock:
+            self._next_token += 1
+            token = self._next_token
+            self.next_path = path
+            player = self._resetting = self.next_player
+        try:
+            self._reset(player)
+            # ఒకే సెషన్ అయితే ఎఫెక్ట్స్ అలాగే కొనసాగుతాయి, మళ్ళీ సెటప్ అక్కర్లేదు
+            try: player.setAudioSessionId(self.session_id)
+            except Exception: pass
+            player.setDataSource(path)
+            player.prepareAsync()
+            return True
+        except Exception as e:
+            with self._lock:
+                if token == self._next_token: self.next_path = None
+            print(f"Preload Error: {str(e)}")
+            return False
+
+    def cancel_next(self):
+        """ ముందే సిద్ధం చేసిన తర్వాతి పాటను వదిలేస్తుంది (యూజర్ వేరే పాట ఎంచుకున్నప్పుడు) """
+        with self._lock:
+            self._next_token += 1
+            detach = self.next_ready and self.is_prepared
+            player = self.next_player if self.next_path is not None else None
+            if player is not None: self._resetting = player
+            self.next_ready = False
+            self.next_path = None
+        if detach:
+            try: self.player.setNextMediaPlayer(None)
+            except Exception: pass
+        if player is not None:
+            try: self._reset(player)
+            except Exception: pass
+
+    def _reset(self, player):
+        """ పిలిచేవారు లాక్ లో _resetting = player పెట్టాక - reset అయ్యే వరకు దాని లిస్నర్లు పాతవి """
+        try: player.reset()
+        finally:
+            with self._lock:
+                if self._resetting is player: self._resetting = None
+
+    def _on_prepared(self, player):
+        """ ఏ థ్రెడ్ లోనైనా రావచ్చు - టోకెన్ తో పాటు Kivy థ్రెడ్ కి పంపుతాం """
+        with self._lock:
+            if player is self._resetting: return
+            if player is self.next_player:
+                token, path = self._next_token, self.next_path
+                Clock.schedule_once(lambda dt: self._finish_preload(token, path))
+                return
+            token, path = self._token, self.loading_path
+        Clock.schedule_once(lambda dt: self._finish_prepare(token, path))
+
+    def _finish_prepare(self, token, path):
+        if token != self._token or path is None: return   # ఈలోపు వేరే పాట అడిగారు
+        try:
+            self.is_prepared = True
+            self.loading_path = None
+            self.session_id = self.player.getAudioSessionId()
+            self.duration_ms = max(0, self.player.getDuration())
+            # reset() తర్వాత కూడా సెషన్ అదే - ఎఫెక్ట్స్ చైన్ ని మళ్ళీ వాడుకుంటాం
+            self.effects.attach(self.session_id)
+        except Exception as e:
+            print(f"Prepare Error: {str(e)}")
+        metrics.record('player.prepare', self._load_started)
+        if self.on_ready: self.on_ready(path)
+
+    def _finish_preload(self, token, path):
+        if token != self._next_token or path is None or not self.is_prepared: return
+        try:
+            duration = max(0, self.next_player.getDuration())
+            self.player.setNextMediaPlayer(self.next_player)
+        except Exception as e:
+            print(f"Gapless Error: {str(e)}")
+            return
+        with self._lock:
+            if token != self._next_token: return
+            self.next_duration_ms = duration
+            self.next_ready = True
+
+    def _on_completion(self, player):
+        Clock.schedule_once(lambda dt: self._handle_completion(player))
+
+    def _handle_completion(self, player):
+        if player is not self.player or not self.is_prepared: return
+        self._mark(self.duration_ms, False)
+        if self.next_ready:
+            self._handoff()
+        elif self.on_complete:
+            self.on_complete()
+
+    def _handoff(self):
+        """ ఆండ్రాయిడ్ ఇప్పటికే next_player ని మొదలుపెట్టింది - ఇక్కడ రిఫరెన్స్ లు మాత్రమే మారుస్తాం, పూర్తి load లేదు """
+        with self._lock:
+            finished = self.player
+            self.player, self.next_player = self.next_player, finished
+            path = self.next_path
+            self.next_path = None
+            self.next_ready = False
+            self._token += 1
+            self._next_token += 1
+            self.duration_ms = self.next_duration_ms
+            self._mark(0, True)
+            self._resetting = finished
+        session = self.session_id
+        try: session = self.player.getAudioSessionId()
+        except Exception: pass
+        if session != self.session_id:
+            # సెషన్ షేర్ అవ్వలేదు (పాత డివైస్ లు) - ఎఫెక్ట్స్ ని కొత్త సెషన్ కి మారుస్తాం
+            self.session_id = session
+            self.effects.attach(session)
+        try: self._reset(finished)
+        except Exception: pass
+        if self.on_track_changed: self.on_track_changed(path)
+
+    def _on_error(self, player, what, extra):
+        with self._lock:
+            if player is self._resetting: return True
+            if player is self.next_player:
+                # ముందే లోడ్ చేస్తున్న పాట పాడైతే గ్యాప్ లెస్ వదిలేస్తాం; ప్రస్తుత పాట ఆగదు
+                self._next_token += 1
+                self.next_path = None
+                self.next_ready = False
                 return True
-            except: return False
-        return False
+            token, path = self._token, self.loading_path
+        def report(dt):
+            if token != self._token: return
+            self.is_prepared = False
+            self.loading_path = None
+            if self.on_error: self.on_error(path, what, extra)
+        Clock.schedule_once(report)
+        return True
+
+    def toggle_spatial_audio(self, state):
+        """ 9.1 వర్చువల్ సరౌండ్ సౌండ్ ని ఆన్/ఆఫ్ చేస్తుంది - సెట్టింగ్ తర్వాతి పాటలకీ కొనసాగుతుంది """
+        return self.effects.set_spatial(state)
 
     def open_system_dolby(self):
         """ ఫోన్ సిస్టమ్ డాల్బీ సెట్టింగ్స్ ఓపెన్ చేస్తుంది """
@@ -136,54 +625,2250 @@ class NativeAudioPlayer:
             except: return False
         return False
 
-    def is_complete(self):
-        """ పాట పూర్తయ్యిందో లేదో చెక్ చేస్తుంది """
-        if self.player and self.is_prepared:
-            try:
-                pos = self.player.getCurrentPosition()
-                dur = self.player.getDuration()
-                if dur > 0 and pos >= (dur - 1200):
-                    return True
-            except: pass
-        return False
-
     # బేసిక్ కంట్రోల్స్ (Play, Pause, Stop, Seek)
     def play(self):
-        if self.player and self.is_prepared: self.player.start()
+        if self.player and self.is_prepared:
+            self.player.start()
+            # పూర్తయిన పాటపై start() మొదటి నుండి ప్లే చేస్తుంది
+            self._mark(0 if self._pos_ms >= self.duration_ms > 0 else self._pos_ms, True)
     def pause(self):
-        if self.player and self.player.isPlaying(): self.player.pause()
+        if self.player and self.player.isPlaying():
+            self.player.pause()
+            self.sync_position()
     def stop(self):
-        if self.player: self.player.stop(); self.player.reset()
+        if self.player:
+            self.cancel_next()
+            with self._lock:
+                self._token += 1
+                prepared = self.is_prepared
+                self.is_prepared = False
+                self.loading_path = None
+                self._mark(0, False)
+                player = self._resetting = self.player
+            if prepared: player.stop()
+            self._reset(player)
     def seek(self, seconds):
         if self.player and self.is_prepared:
-            try: self.player.seekTo(int(seconds * 1000))
+            try:
+                self.player.seekTo(int(seconds * 1000))
+                self._mark(int(seconds * 1000), self._pos_at is not None)
             except: pass
     def get_pos(self):
-        if self.player and self.is_prepared:
-            try: return self.player.getCurrentPosition() / 1000.0
-            except: return 0
-        return 0
+        """ కాష్ చేసిన పొజిషన్ + గడిచిన సమయం - JNI కాల్ లేదు """
+        if not self.is_prepared: return 0
+        pos = self._pos_ms
+        if self._pos_at is not None: pos += (time.monotonic() - self._pos_at) * 1000
+        if self.duration_ms: pos = min(pos, self.duration_ms)
+        return pos / 1000.0
     def get_duration(self):
+        return self.duration_ms / 1000.0 if self.is_prepared else 0
+    def sync_position(self):
+        """ నిజమైన ప్లేయర్ నుండి ఒక్కసారి పొజిషన్ చదివి కాష్ ని సరిచేస్తుంది """
         if self.player and self.is_prepared:
-            try: return self.player.getDuration() / 1000.0
-            except: return 0
-        return 0
+            try: self._mark(self.player.getCurrentPosition(), self.player.isPlaying())
+            except: pass
+    def _mark(self, pos_ms, running):
+        self._pos_ms = pos_ms
+        self._pos_at = time.monotonic() if running else None
     
+    @metrics.timed('player.get_art')
     def get_art(self, path, save_path):
         """ పాటలోని ఫోటోను బయటకు తీస్తుంది """
         if platform == 'android':
+            retr = None
             try:
                 from jnius import autoclass
                 retr = autoclass('android.media.MediaMetadataRetriever')()
                 retr.setDataSource(path)
                 art = retr.getEmbeddedPicture()
                 if art:
-                    data = bytes([b % 256 for b in art])
+                    data = java_bytes_to_py(art)
                     with open(save_path, 'wb') as f: f.write(data)
                     return True
             except: pass
+            finally:
+                # నేటివ్ రిట్రీవర్ ని వెంటనే విడుదల చేయాలి, లేకపోతే ఫైల్ హ్యాండిల్ లీక్ అవుతుంది
+                if retr is not None:
+                    try: retr.release()
+                    except: pass
         return False
 
+def java_bytes_to_py(art):
+    """ Java byte[] ని ఒక్కో బైట్ లూప్ లేకుండా ఒకేసారి Python bytes గా మారుస్తుంది """
+    if isinstance(art, (bytes, bytearray)):
+        return bytes(art)
+    # pyjnius ByteArray: బఫర్ ని నేరుగా కాపీ చేస్తుంది
+    tostring = getattr(art, 'tostring', None)
+    if tostring is not None:
+        return tostring()
+    try:
+        return memoryview(art).tobytes()
+    except TypeError:
+        pass
+    # పాత pyjnius సైన్డ్ int లిస్ట్ ఇస్తుంది - array C లూప్ లో మారుస్తుంది
+    try:
+        return array('b', art).tobytes()
+    except OverflowError:
+        return array('B', art).tobytes()
+
+# --- TAG READER (ID3v2 / FLAC / MP4 / OGG) ---
+# ఫైల్ ప్రారంభంలో ఉన్న ట్యాగ్ బ్లాక్ లను మాత్రమే చదువుతుంది; అవసరం లేని ఫ్రేమ్ లు/అటమ్ లను seek తో దాటేస్తుంది.
+# ఆండ్రాయిడ్ కాకపోయినా టైటిల్, ఆర్టిస్ట్, ఆల్బమ్, కవర్ ఫోటో దొరుకుతాయి.
+TAG_ART_LIMIT = 16 * 1024 * 1024   # ఇంతకంటే పెద్ద కవర్ ని చదవం
+
+_ID3_FRAMES = {
+    'TIT2': 'title', 'TPE1': 'artist', 'TALB': 'album', 'TRCK': 'track',
+    'TT2': 'title', 'TP1': 'artist', 'TAL': 'album', 'TRK': 'track',
+}
+_VORBIS_KEYS = {'TITLE': 'title', 'ARTIST': 'artist', 'ALBUM': 'album', 'TRACKNUMBER': 'track'}
+_MP4_KEYS = {b'\xa9nam': 'title', b'\xa9ART': 'artist', b'\xa9alb': 'album', b'trkn': 'track', b'covr': 'art'}
+
+
+def read_tags(path, want_art=False, want_duration=False):
+    """ {'title', 'artist', 'album', 'track', 'duration', 'art', 'art_mime'} లో దొరికినవి ఇస్తుంది; ఎర్రర్ వస్తే {} """
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(12)
+            f.seek(0)
+            if head[:3] == b'ID3':
+                tags = _read_id3(f, want_art)
+                tag_end = f.tell()
+                # కొన్ని FLAC ఫైల్స్ ముందు ID3 ఉంటుంది
+                if f.read(4) == b'fLaC':
+                    for key, value in _read_flac(f, want_art).items(): tags.setdefault(key, value)
+                elif want_duration:
+                    _read_mpeg_duration(f, tag_end, tags)
+                return tags
+            if head[:4] == b'fLaC':
+                f.seek(4)
+                return _read_flac(f, want_art)
+            if head[4:8] == b'ftyp':
+                return _read_mp4(f, want_art)
+            if head[:4] == b'OggS':
+                return _read_ogg(f, want_art, want_duration)
+            if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+                return _read_wav(f)
+            tags = _read_id3v1(f)
+            if want_duration: _read_mpeg_duration(f, 0, tags)
+            return tags
+    except Exception as e:
+        print(f"Tag Error: {str(e)}")
+        return {}
+
+
+def extract_art(path, save_path):
+    """ NativeAudioPlayer.get_art లాంటిదే, కానీ అన్ని ప్లాట్ ఫామ్ లలో పనిచేస్తుంది """
+    art = read_tags(path, want_art=True).get('art')
+    if not art: return False
+    with open(save_path, 'wb') as f: f.write(art)
+    return True
+
+
+def _syncsafe(data):
+    return (data[0] << 21) | (data[1] << 14) | (data[2] << 7) | data[3]
+
+
+def _decode_text(enc, data):
+    if enc == 1: text = data.decode('utf-16', 'replace')
+    elif enc == 2: text = data.decode('utf-16-be', 'replace')
+    elif enc == 3: text = data.decode('utf-8', 'replace')
+    else: text = data.decode('latin-1', 'replace')
+    # v2.4 లో చాలా విలువలు null తో వేరు చేస్తారు - మొదటిది చాలు
+    return text.split('\x00')[0].strip()
+
+
+def _split_terminated(enc, data):
+    """ null తో ముగిసే స్ట్రింగ్ ని (UTF-16 అయితే రెండు బైట్లు) దాటి మిగతా డేటా ఇస్తుంది """
+    if enc in (1, 2):
+        i = 0
+        while i + 1 < len(data):
+            if data[i] == 0 and data[i + 1] == 0: return data[i + 2:]
+            i += 2
+        return b''
+    i = data.find(b'\x00')
+    return data[i + 1:] if i >= 0 else b''
+
+
+def _read_id3(f, want_art):
+    tags = {}
+    header = f.read(10)
+    major, flags = header[3], header[5]
+    tag_end = 10 + _syncsafe(header[6:10]) + (10 if flags & 0x10 else 0)
+    if flags & 0x80 and major < 4:
+        # ట్యాగ్ మొత్తం unsynchronised - అరుదు, ఒకేసారి చదివి సరిచేస్తాం
+        body = f.read(tag_end - 10).replace(b'\xff\x00', b'\xff')
+        _read_id3_frames(io.BytesIO(body), len(body), major, flags, want_art, tags)
+    else:
+        _read_id3_frames(f, tag_end, major, flags, want_art, tags)
+    f.seek(tag_end)
+    return tags
+
+
+def _read_id3_frames(f, tag_end, major, flags, want_art, tags):
+    start = f.tell()
+    if flags & 0x40:
+        ext = f.read(4)
+        f.seek((_syncsafe(ext) if major >= 4 else int.from_bytes(ext, 'big') + 4) - 4, 1)
+    head_len = 6 if major == 2 else 10
+    best_art_type = None
+    while f.tell() + head_len <= tag_end:
+        head = f.read(head_len)
+        if head[0] == 0: break   # padding
+        if major == 2:
+            frame_id = head[:3].decode('latin-1', 'replace')
+            size = int.from_bytes(head[3:6], 'big')
+            fflags = 0
+        else:
+            frame_id = head[:4].decode('latin-1', 'replace')
+            size = _syncsafe(head[4:8]) if major >= 4 else int.from_bytes(head[4:8], 'big')
+            fflags = head[9]
+        if size <= 0 or f.tell() + size > tag_end: break
+        key = _ID3_FRAMES.get(frame_id)
+        is_pic = frame_id in ('APIC', 'PIC')
+        if (key and key not in tags) or (is_pic and want_art and best_art_type != 3 and size <= TAG_ART_LIMIT):
+            data = f.read(size)
+            if major >= 4 and fflags & 0x02: data = data.replace(b'\xff\x00', b'\xff')
+            if major >= 4 and fflags & 0x01: data = data[4:]   # data length indicator
+            if (major >= 4 and fflags & 0x0C) or (major == 3 and fflags & 0xC0): continue   # compressed / encrypted - వదిలేస్తాం
+            if key:
+                value = _decode_text(data[0], data[1:]) if data else ''
+                if value: tags[key] = value
+            elif data:
+                enc = data[0]
+                if frame_id == 'PIC':
+                    mime = 'image/png' if data[1:4].upper() == b'PNG' else 'image/jpeg'
+                    pic_type, rest = data[4], data[5:]
+                else:
+                    end = data.find(b'\x00', 1)
+                    mime = data[1:end].decode('latin-1', 'replace').lower() or 'image/jpeg'
+                    pic_type, rest = data[end + 1], data[end + 2:]
+                picture = _split_terminated(enc, rest)
+                if picture and (best_art_type is None or pic_type == 3):
+                    tags['art'], tags['art_mime'] = picture, mime
+                    best_art_type = pic_type
+        else:
+            f.seek(size, 1)
+    return tags
+
+
+def _read_id3v1(f):
+    """ ఫైల్ చివరి 128 బైట్లలో ఉండే పాత ID3v1 ట్యాగ్ (ఒకే seek) """
+    tags = {}
+    f.seek(0, 2)
+    if f.tell() < 128: return tags
+    f.seek(-128, 2)
+    data = f.read(128)
+    if data[:3] != b'TAG': return tags
+    for key, (a, b) in (('title', (3, 33)), ('artist', (33, 63)), ('album', (63, 93))):
+        value = data[a:b].split(b'\x00')[0].decode('latin-1', 'replace').strip()
+        if value: tags[key] = value
+    if data[125] == 0 and data[126]: tags['track'] = str(data[126])
+    return tags
+
+
+def _parse_vorbis_comment(data, tags, want_art):
+    pos = 4 + int.from_bytes(data[0:4], 'little')
+    count = int.from_bytes(data[pos:pos + 4], 'little')
+    pos += 4
+    for _ in range(count):
+        if pos + 4 > len(data): break
+        length = int.from_bytes(data[pos:pos + 4], 'little')
+        entry = data[pos + 4:pos + 4 + length]
+        pos += 4 + length
+        key, sep, value = entry.partition(b'=')
+        if not sep: continue
+        key = key.decode('ascii', 'replace').upper()
+        if key in _VORBIS_KEYS:
+            tags.setdefault(_VORBIS_KEYS[key], value.decode('utf-8', 'replace').strip())
+        elif key == 'METADATA_BLOCK_PICTURE' and want_art and 'art' not in tags:
+            try: _parse_flac_picture(base64.b64decode(value), tags)
+            except Exception: pass
+
+
+def _parse_flac_picture(data, tags):
+    mime_len = int.from_bytes(data[4:8], 'big')
+    mime = data[8:8 + mime_len].decode('ascii', 'replace').lower()
+    pos = 8 + mime_len
+    desc_len = int.from_bytes(data[pos:pos + 4], 'big')
+    pos += 4 + desc_len + 16
+    pic_len = int.from_bytes(data[pos:pos + 4], 'big')
+    picture = data[pos + 4:pos + 4 + pic_len]
+    if picture:
+        tags['art'], tags['art_mime'] = picture, mime or 'image/jpeg'
+
+
+def _read_flac(f, want_art):
+    tags = {}
+    while True:
+        head = f.read(4)
+        if len(head) < 4: break
+        last, block_type = head[0] & 0x80, head[0] & 0x7F
+        size = int.from_bytes(head[1:4], 'big')
+        if block_type == 0 and size >= 18:
+            # STREAMINFO: 20 బిట్ sample rate + 36 బిట్ total samples
+            info = int.from_bytes(f.read(size)[10:18], 'big')
+            rate, samples = info >> 44, info & ((1 << 36) - 1)
+            if rate and samples: tags['duration'] = samples / rate
+        elif block_type == 4:
+            _parse_vorbis_comment(f.read(size), tags, want_art)
+        elif block_type == 6 and want_art and 'art' not in tags and size <= TAG_ART_LIMIT:
+            _parse_flac_picture(f.read(size), tags)
+        else:
+            f.seek(size, 1)
+        if last: break
+    return tags
+
+
+def _mp4_atoms(f, end):
+    """ (type, payload_start, atom_end) - payload ని చదవకుండా అటమ్ హెడర్లు మాత్రమే """
+    while f.tell() + 8 <= end:
+        start = f.tell()
+        head = f.read(8)
+        size, kind = int.from_bytes(head[:4], 'big'), head[4:8]
+        header = 8
+        if size == 1:
+            size = int.from_bytes(f.read(8), 'big')
+            header = 16
+        elif size == 0:
+            size = end - start
+        if size < header: return
+        yield kind, start + header, min(start + size, end)
+        f.seek(start + size)
+
+
+def _read_mp4(f, want_art):
+    tags = {}
+    f.seek(0, 2)
+    file_end = f.tell()
+    f.seek(0)
+    # mdat లాంటి పెద్ద అటమ్ లను seek తో దాటి moov -> udta -> meta -> ilst వరకు వెళ్తాం
+    for kind, start, end in _mp4_atoms(f, file_end):
+        if kind != b'moov': continue
+        f.seek(start)
+        for kind2, start2, end2 in _mp4_atoms(f, end):
+            if kind2 == b'mvhd':
+                f.seek(start2)
+                data = f.read(32)
+                if data[0] == 1: scale, length = int.from_bytes(data[20:24], 'big'), int.from_bytes(data[24:32], 'big')
+                else: scale, length = int.from_bytes(data[12:16], 'big'), int.from_bytes(data[16:20], 'big')
+                if scale: tags['duration'] = length / scale
+                continue
+            if kind2 != b'udta': continue
+            f.seek(start2)
+            for kind3, start3, end3 in _mp4_atoms(f, end2):
+                if kind3 != b'meta': continue
+                # ISO meta ఒక full box (4 బైట్ల version/flags); QuickTime స్టైల్ లో అది ఉండదు
+                f.seek(start3 + 4)
+                meta_start = start3 if f.read(4) == b'hdlr' else start3 + 4
+                f.seek(meta_start)
+                for kind4, start4, end4 in _mp4_atoms(f, end3):
+                    if kind4 == b'ilst':
+                        f.seek(start4)
+                        _read_ilst(f, end4, tags, want_art)
+                        f.seek(end4)
+                f.seek(end3)
+            f.seek(end2)
+        break
+    return tags
+
+
+def _read_ilst(f, end, tags, want_art):
+    for kind, start, item_end in _mp4_atoms(f, end):
+        key = _MP4_KEYS.get(kind)
+        if not key or key in tags or (key == 'art' and (not want_art or item_end - start > TAG_ART_LIMIT)):
+            continue
+        f.seek(start)
+        for data_kind, data_start, data_end in _mp4_atoms(f, item_end):
+            if data_kind != b'data': continue
+            f.seek(data_start)
+            type_flags = int.from_bytes(f.read(4), 'big') & 0xFFFFFF
+            f.read(4)   # locale
+            payload = f.read(data_end - data_start - 8)
+            if key == 'track':
+                if len(payload) >= 4: tags['track'] = str(int.from_bytes(payload[2:4], 'big'))
+            elif key == 'art':
+                tags['art'] = payload
+                tags['art_mime'] = 'image/png' if type_flags == 14 else 'image/jpeg'
+            else:
+                tags[key] = payload.decode('utf-8', 'replace').strip()
+            break
+        f.seek(item_end)
+
+
+def _ogg_packets(f, limit):
+    """ Ogg పేజీల నుండి మొదటి ప్యాకెట్లను జోడిస్తుంది (హెడర్ ప్యాకెట్లు మాత్రమే కావాలి) """
+    packet = b''
+    while True:
+        head = f.read(27)
+        if len(head) < 27 or head[:4] != b'OggS': return
+        lacing = f.read(head[26])
+        for seg in lacing:
+            packet += f.read(seg)
+            if seg < 255:
+                yield packet
+                packet = b''
+            elif len(packet) > limit:
+                # మిగతా భాగం (పెద్ద కవర్) వద్దు - ముందున్న కామెంట్లు చాలు
+                yield packet
+                return
+
+
+def _read_ogg(f, want_art, want_duration=False):
+    tags = {}
+    limit = TAG_ART_LIMIT if want_art else 512 * 1024
+    rate, skip = 0, 0
+    for i, packet in enumerate(_ogg_packets(f, limit)):
+        if packet[:7] == b'\x01vorbis':
+            rate = int.from_bytes(packet[12:16], 'little')
+        elif packet[:8] == b'OpusHead':
+            rate, skip = 48000, int.from_bytes(packet[10:12], 'little')
+        elif packet[:7] == b'\x03vorbis':
+            _parse_vorbis_comment(packet[7:], tags, want_art)
+            break
+        elif packet[:8] == b'OpusTags':
+            _parse_vorbis_comment(packet[8:], tags, want_art)
+            break
+        if i >= 2: break
+    if want_duration and rate:
+        # చివరి పేజీ granule position = మొత్తం samples (చివరి 64KB మాత్రమే చదువుతాం)
+        f.seek(0, 2)
+        size = f.tell()
+        f.seek(max(0, size - 65536))
+        tail = f.read()
+        last = tail.rfind(b'OggS')
+        if last >= 0 and last + 14 <= len(tail):
+            granule = int.from_bytes(tail[last + 6:last + 14], 'little', signed=True)
+            if granule > 0: tags['duration'] = max(0, granule - skip) / rate
+    return tags
+
+
+_MPEG_BITRATES = {
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+
+def _read_mpeg_duration(f, start, tags):
+    """ మొదటి MP3 ఫ్రేమ్ లోని Xing/Info/VBRI హెడర్ నుండి, లేకపోతే బిట్ రేట్ తో అంచనా """
+    f.seek(0, 2)
+    size = f.tell()
+    f.seek(start)
+    data = f.read(8192)
+    i = 0
+    while True:
+        i = data.find(b'\xff', i)
+        if i < 0 or i + 4 > len(data): return
+        b1, b2, b3 = data[i + 1], data[i + 2], data[i + 3]
+        version, layer = (b1 >> 3) & 3, (b1 >> 1) & 3
+        # layer బిట్లు: 01 = Layer III, 10 = Layer II
+        if (b1 & 0xE0) == 0xE0 and version != 1 and layer in (1, 2) and (b2 >> 4) not in (0, 15) and (b2 >> 2) & 3 != 3:
+            break
+        i += 1
+    mpeg1 = version == 3
+    bitrate = _MPEG_BITRATES[(1 if mpeg1 else 2, 2 if layer == 2 else 3)][b2 >> 4] * 1000
+    rate = (44100, 48000, 32000)[(b2 >> 2) & 3] >> (0 if mpeg1 else (1 if version == 2 else 2))
+    per_frame = 1152 if (mpeg1 or layer == 2) else 576
+    mono = (b3 >> 6) == 3
+    side = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+    xing = i + 4 + side
+    frames = 0
+    if data[xing:xing + 4] in (b'Xing', b'Info') and int.from_bytes(data[xing + 4:xing + 8], 'big') & 1:
+        frames = int.from_bytes(data[xing + 8:xing + 12], 'big')
+    elif data[i + 36:i + 40] == b'VBRI':
+        frames = int.from_bytes(data[i + 50:i + 54], 'big')
+    if frames:
+        tags['duration'] = frames * per_frame / rate
+    elif bitrate:
+        tags['duration'] = (size - start - i) * 8 / bitrate
+
+
+def _read_wav(f):
+    tags = {}
+    f.seek(12)
+    byte_rate = 0
+    while True:
+        head = f.read(8)
+        if len(head) < 8: break
+        kind, size = head[:4], int.from_bytes(head[4:8], 'little')
+        if kind == b'fmt ':
+            byte_rate = int.from_bytes(f.read(size)[8:12], 'little')
+            f.seek(size & 1, 1)
+        elif kind == b'data':
+            if byte_rate: tags['duration'] = size / byte_rate
+            break
+        else:
+            f.seek(size + (size & 1), 1)
+    return tags
+
+# --- PERSISTENT LIBRARY INDEX (SQLITE) ---
+# ప్రతి పాట యొక్క path, size, mtime, ఫోల్డర్ ని vault_secrets.json పక్కనే ఉన్న డేటాబేస్ లో దాచుతుంది.
+# ప్రతి ఫోల్డర్ mtime కూడా సేవ్ అవుతుంది, కాబట్టి మళ్లీ స్కాన్ చేసేటప్పుడు మారిన ఫోల్డర్లు మాత్రమే చదువుతాం.
+class LibraryIndex:
+    # ట్యాగ్ ల నుండి వచ్చే కాలమ్ లు; tagged = 0 అంటే ఇంకా చదవాల్సి ఉంది
+    META_COLUMNS = (('title', 'TEXT'), ('artist', 'TEXT'), ('album', 'TEXT'), ('track_no', 'INTEGER'),
+                    ('duration', 'REAL'), ('tagged', 'INTEGER NOT NULL DEFAULT 0'))
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS tracks (
+                path TEXT PRIMARY KEY, folder TEXT NOT NULL, name TEXT NOT NULL,
+                size INTEGER NOT NULL, mtime REAL NOT NULL)""")
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS dirs (
+                path TEXT PRIMARY KEY, parent TEXT, mtime REAL NOT NULL)""")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS tracks_folder ON tracks(folder)")
+            # పాత డేటాబేస్ లకు కొత్త కాలమ్ లు కలుపుతుంది
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(tracks)")}
+            for name, kind in self.META_COLUMNS:
+                if name not in columns:
+                    self.conn.execute(f"ALTER TABLE tracks ADD COLUMN {name} {kind}")
+
+    def all_tracks(self):
+        """ (path, folder, name, title, artist, album, track_no, duration) - యాప్ ఓపెన్ అవ్వగానే లిస్ట్ చూపించడానికి """
+        with self._lock:
+            return self.conn.execute("SELECT path, folder, name, title, artist, album, track_no, duration FROM tracks ORDER BY rowid").fetchall()
+
+    def untagged_paths(self):
+        with self._lock:
+            return [p for (p,) in self.conn.execute("SELECT path FROM tracks WHERE tagged = 0 ORDER BY rowid")]
+
+    def update_metadata(self, rows):
+        """ rows: (path, title, artist, album, track_no, duration) """
+        with self._lock, self.conn:
+            self.conn.executemany("UPDATE tracks SET title = ?, artist = ?, album = ?, track_no = ?, duration = ?, tagged = 1 WHERE path = ?",
+                                  (row[1:] + row[:1] for row in rows))
+
+    def load_dirs(self):
+        """ {dir: (mtime, parent)} - ఒక్కసారే మెమరీలోకి తెచ్చుకుంటాం """
+        with self._lock:
+            return {p: (m, parent) for p, parent, m in self.conn.execute("SELECT path, parent, mtime FROM dirs")}
+
+    def files_in(self, folder):
+        with self._lock:
+            rows = self.conn.execute("SELECT name, size, mtime FROM tracks WHERE folder = ?", (folder,))
+            return {name: (size, mtime) for name, size, mtime in rows}
+
+    def apply(self, dirs=(), removed_dirs=(), upserts=(), removed_paths=(), renamed=()):
+        """ స్కాన్ లో వచ్చిన మార్పులను (diff) ఒకే ట్రాన్సాక్షన్ లో రాస్తుంది.
+        renamed: (old_path, new_path) - ట్యాగ్ లు పోకుండా ముందుగా మారుస్తాం (removed_dirs తొలగింపు వాటికి తగలదు) """
+        with self._lock, self.conn:
+            if renamed:
+                self.conn.executemany("UPDATE OR REPLACE tracks SET path = ?, folder = ?, name = ? WHERE path = ?",
+                                      ((new, os.path.dirname(new), os.path.basename(new), old) for old, new in renamed))
+            if removed_paths:
+                self.conn.executemany("DELETE FROM tracks WHERE path = ?", ((p,) for p in removed_paths))
+            if removed_dirs:
+                self.conn.executemany("DELETE FROM tracks WHERE folder = ?", ((d,) for d in removed_dirs))
+                self.conn.executemany("DELETE FROM dirs WHERE path = ?", ((d,) for d in removed_dirs))
+            if upserts:
+                self.conn.executemany("INSERT OR REPLACE INTO tracks (path, folder, name, size, mtime, tagged) VALUES (?, ?, ?, ?, ?, 0)", upserts)
+            if dirs:
+                self.conn.executemany("INSERT OR REPLACE INTO dirs (path, parent, mtime) VALUES (?, ?, ?)", dirs)
+
+    def paths_in_dirs(self, folders):
+        with self._lock:
+            out = []
+            for d in folders:
+                out.extend(p for (p,) in self.conn.execute("SELECT path FROM tracks WHERE folder = ?", (d,)))
+            return out
+
+    def close(self):
+        with self._lock: self.conn.close()
+
+# --- BACKGROUND TASKS ---
+# వర్కర్ థ్రెడ్ లో నడిచే పనులకు కామన్ బేస్: start / cancel / Clock ద్వారా UI కి ఫలితాలు.
+class BackgroundTask(abc.ABC):
+    thread_name = "vault-task"
+
+    def __init__(self, on_batch=None, on_progress=None, on_done=None):
+        self.on_batch = on_batch
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self._cancel = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, *args):
+        self._cancel.clear()
+        self._thread = threading.Thread(target=self._run, args=args, name=self.thread_name, daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """ పనిని ఆపుతుంది; ఇంకా క్యూలో ఉన్న బ్యాచ్ లు కూడా UI కి చేరవు """
+        self._cancel.set()
+
+    def _post(self, callback, *args):
+        """ వర్కర్ థ్రెడ్ నుండి Kivy మెయిన్ థ్రెడ్ కి కాల్ బ్యాక్ పంపుతుంది """
+        if callback is None: return
+        def deliver(dt):
+            if not self._cancel.is_set(): callback(*args)
+        Clock.schedule_once(deliver)
+
+    @abc.abstractmethod
+    def _run(self, *args):
+        """ వర్కర్ థ్రెడ్ లో చేసే పని - ప్రతి టాస్క్ తనదే ఇస్తుంది """
+
+# --- MEDIA TYPES ---
+# స్కానర్, వాచర్, ఫైల్ మేనేజర్లు, బయటి యాప్ ఇంటెంట్ లు - అన్నీ ఇదే లిస్ట్ వాడతాయి.
+MEDIA_TYPES = {
+    'audio': ('.mp3', '.m4a', '.flac', '.wav', '.aac', '.ogg'),
+    'video': ('.mp4', '.mkv', '.avi'),
+    'image': ('.jpg', '.jpeg', '.png'),
+    'document': ('.pdf', '.txt', '.doc'),
+}
+MEDIA_MIME = {'audio': 'audio/*', 'video': 'video/*', 'image': 'image/*', 'document': '*/*'}
+
+
+def media_type(name):
+    """ ఫైల్ పేరు -> 'audio' / 'video' / 'image' / 'document' / None """
+    lower = name.lower()
+    for kind, extensions in MEDIA_TYPES.items():
+        if lower.endswith(extensions): return kind
+    return None
+
+# --- SCAN RULES ---
+# ఏ రూట్ ఫోల్డర్లు, ఏవి వదిలేయాలి (exclude), ఎంత లోతు వరకు - సెట్టింగ్స్ లో యూజర్ మార్చుకోవచ్చు ('scan' కీ).
+# exclude లో '/' లేకపోతే ఫోల్డర్ పేరుతో పోలుస్తాం ('.*' = హిడెన్ ఫోల్డర్లు, '.thumbnails' కూడా),
+# '/' ఉంటే path చివరి భాగంతో ('Android/data'). max_depth: రూట్ = 0, None = పరిమితి లేదు.
+class ScanRules:
+    DEFAULT_ROOTS = (
+        "/storage/emulated/0/Music",
+        "/storage/emulated/0/Download",
+        "/storage/emulated/0/WhatsApp/Media/WhatsApp Audio",
+        "/storage/emulated/0/PrasadApp",
+        "/storage/emulated/0/Recordings",
+        "/storage/emulated/0/Snaptube/download",
+    )
+    DEFAULT_EXCLUDES = ('.*', 'Android/data', 'Android/obb')
+
+    def __init__(self, roots=DEFAULT_ROOTS, excludes=DEFAULT_EXCLUDES, max_depth=None):
+        self.roots = self._normalize(roots)
+        self.excludes = tuple(p.strip() for p in excludes if p and p.strip())
+        self.max_depth = None if max_depth in (None, '') else max(0, int(max_depth))
+        names = [fnmatch.translate(p) for p in self.excludes if '/' not in p]
+        paths = [fnmatch.translate('*/' + p.strip('/')) for p in self.excludes if '/' in p]
+        self._name_re = re.compile('|'.join(names)) if names else None
+        self._path_re = re.compile('|'.join(paths)) if paths else None
+
+    @staticmethod
+    def _normalize(roots):
+        """ డూప్లికేట్ లు, వేరే రూట్ లోపలే ఉన్న రూట్ లు తీసేస్తాం - ఒకే ఫోల్డర్ రెండుసార్లు నడవకుండా """
+        clean = []
+        for root in roots:
+            root = os.path.normpath(root.strip()) if root and root.strip() else None
+            if root and root not in clean: clean.append(root)
+        return [r for r in clean if not any(r.startswith(other.rstrip(os.sep) + os.sep) for other in clean if other != r)]
+
+    def skip(self, path, name):
+        if self._name_re and self._name_re.match(name): return True
+        return bool(self._path_re and self._path_re.match(path))
+
+    def descend(self, depth):
+        """ depth లోతులో ఉన్న ఫోల్డర్ సబ్ ఫోల్డర్లలోకి వెళ్ళొచ్చా """
+        return self.max_depth is None or depth < self.max_depth
+
+    def subdirs(self, folders, depth):
+        """ depth లో ఉన్న ఫోల్డర్ యొక్క సబ్ ఫోల్డర్లలో నడవాల్సినవి """
+        if not self.descend(depth): return []
+        return [d for d in folders if not self.skip(d, os.path.basename(d))]
+
+    def allows(self, path):
+        """ path ఏదో ఒక రూట్ కింద, exclude / లోతు నియమాలకు సరిపోతుందా (వాచర్ లో కొత్త ఫోల్డర్ల కోసం) """
+        for root in self.roots:
+            if path == root: return True
+            prefix = root.rstrip(os.sep) + os.sep
+            if not path.startswith(prefix): continue
+            parts = path[len(prefix):].split(os.sep)
+            if self.max_depth is not None and len(parts) > self.max_depth: return False
+            current = root
+            for part in parts:
+                current = os.path.join(current, part)
+                if self.skip(current, part): return False
+            return True
+        return False
+
+    def state(self):
+        return {'roots': list(self.roots), 'excludes': list(self.excludes), 'max_depth': self.max_depth}
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(state.get('roots', cls.DEFAULT_ROOTS), state.get('excludes', cls.DEFAULT_EXCLUDES), state.get('max_depth'))
+
+# --- BACKGROUND LIBRARY SCANNER ---
+# స్కాన్ మొత్తం వర్కర్ థ్రెడ్లలో జరుగుతుంది - ఒక్కో రూట్ కి ఒక వాకర్ (ఫోన్ స్టోరేజ్ లో scandir / stat
+# సమయం I/O లోనే పోతుంది, అందుకే థ్రెడ్లు చాలు). mtime మారని ఫోల్డర్లను లిస్ట్ చేయకుండా, ఇండెక్స్ లో ఉన్న
+# సబ్ ఫోల్డర్లలోకి మాత్రమే వెళ్తుంది. కొత్తవి/తొలగించినవి diff గా బ్యాచ్ లలో Clock ద్వారా UI కి వస్తాయి.
+def list_media_folder(folder, extensions):
+    """ ({name: (size, mtime)}, సబ్ ఫోల్డర్లు) - ఫోల్డర్ చదవలేకపోతే OSError """
+    files, subdirs = {}, []
+    with os.scandir(folder) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.lower().endswith(extensions):
+                    st = entry.stat()
+                    files[entry.name] = (st.st_size, st.st_mtime)
+            except OSError: pass
+    return files, subdirs
+
+
+class LibraryScanner(BackgroundTask):
+    thread_name = "vault-scanner"
+    BATCH_SIZE = 200        # ఒక్కో బ్యాచ్ లో గరిష్ఠ మార్పులు
+    BATCH_INTERVAL = 0.15   # సెకన్లు - మొదటి పాటలు వెంటనే కనిపించడానికి
+    WALKERS = 4             # ఒకేసారి నడిచే రూట్ వాకర్లు
+
+    def __init__(self, index, rules, extensions, on_batch, on_progress=None, on_done=None):
+        super().__init__(on_batch, on_progress, on_done)
+        self.index = index
+        self.rules = rules
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self._stats_lock = threading.Lock()
+
+    def _run(self):
+        known_dirs = self.index.load_dirs()
+        children = {}
+        for d, (mtime, parent) in known_dirs.items():
+            children.setdefault(parent, []).append(d)
+        seen = set()
+        stats = {'added': 0, 'removed': 0, 'dirs_listed': 0}
+
+        # ఇప్పుడు లేని రూట్ (unmount అయిన SD కార్డ్ / USB-OTG) - దాని కింది ఇండెక్స్ తిరిగి mount అయ్యే వరకు అలాగే
+        roots, missing = [], []
+        for root in self.rules.roots: (roots if os.path.isdir(root) else missing).append(root)
+        if roots:
+            pool = ThreadPoolExecutor(max_workers=min(self.WALKERS, len(roots)), thread_name_prefix=self.thread_name)
+            try:
+                for _ in pool.map(lambda root: self._walk(root, known_dirs, children, seen, stats), roots): pass
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+        if self._cancel.is_set(): return
+
+        # స్కాన్ లో కనిపించని పాత ఫోల్డర్లు (తొలగించినవి, ఇప్పుడు exclude / లోతు దాటినవి, ScanRules నుండి తీసేసిన రూట్ లు)
+        prefixes = tuple(root.rstrip(os.sep) + os.sep for root in missing)
+        gone = [d for d in known_dirs if d not in seen and d not in missing and not d.startswith(prefixes)]
+        removed = []
+        if gone:
+            removed = self.index.paths_in_dirs(gone)
+            stats['removed'] += len(removed)
+            self.index.apply(removed_dirs=gone)
+        if removed: self._post(self.on_batch, [], removed)
+        self._post(self.on_progress, stats['added'], stats['dirs_listed'])
+        self._post(self.on_done, stats['added'], stats['removed'])
+
+    def _walk(self, root, known_dirs, children, seen, stats):
+        """ ఒక రూట్ ని నడిచే వాకర్ (పూల్ థ్రెడ్) - సొంత బ్యాచ్ లు, లెక్కలు మాత్రమే లాక్ తో """
+        rules = self.rules
+        added, removed = [], []
+        dir_rows, upserts = [], []
+        counts = {'added': 0, 'removed': 0, 'dirs_listed': 0}
+        last_flush = time.monotonic()
+
+        def flush():
+            self.index.apply(dirs=dir_rows, upserts=upserts, removed_paths=removed)
+            with self._stats_lock:
+                for key in counts: stats[key] += counts[key]
+                progress = (stats['added'], stats['dirs_listed'])
+            self._post(self.on_batch, list(added), list(removed))
+            self._post(self.on_progress, *progress)
+            added.clear(); removed.clear(); dir_rows.clear(); upserts.clear()
+            counts.update(added=0, removed=0, dirs_listed=0)
+
+        stack = [(root, None, 0)]
+        while stack:
+            if self._cancel.is_set(): return
+            folder, parent, depth = stack.pop()
+            if folder in seen: continue
+            try: mtime = os.stat(folder).st_mtime
+            except (FileNotFoundError, NotADirectoryError): continue
+            except OSError:
+                self._keep(folder, children, seen)
+                continue
+            seen.add(folder)
+            known = known_dirs.get(folder)
+            if known and known[0] == mtime:
+                # ఫోల్డర్ మారలేదు - ఫైల్స్ చదవకుండా పాత సబ్ ఫోల్డర్లలోకి మాత్రమే వెళ్తాం
+                stack.extend((child, folder, depth + 1) for child in rules.subdirs(children.get(folder, ()), depth))
+                continue
+
+            counts['dirs_listed'] += 1
+            try: current, subdirs = list_media_folder(folder, self.extensions)
+            except (FileNotFoundError, NotADirectoryError):
+                seen.discard(folder)
+                continue
+            except OSError:
+                # పర్మిషన్ లేదు / I/O లోపం - ఫోల్డర్ ఉంది, కాబట్టి ఇండెక్స్ లో ఉన్నది అలాగే (mtime మార్చం, తర్వాతి స్కాన్ మళ్ళీ చదువుతుంది)
+                self._keep(folder, children, seen)
+                continue
+            stack.extend((sub, folder, depth + 1) for sub in rules.subdirs(subdirs, depth))
+
+            previous = self.index.files_in(folder) if known else {}
+            for name, (size, f_mtime) in current.items():
+                old = previous.get(name)
+                if old != (size, f_mtime):
+                    full_path = os.path.join(folder, name)
+                    upserts.append((full_path, folder, name, size, f_mtime))
+                    if old is None:
+                        added.append({'path': full_path, 'folder': folder, 'name': name})
+                        counts['added'] += 1
+            for name in previous.keys() - current.keys():
+                removed.append(os.path.join(folder, name))
+                counts['removed'] += 1
+            dir_rows.append((folder, parent, mtime))
+
+            now = time.monotonic()
+            if len(added) + len(removed) >= self.BATCH_SIZE or (now - last_flush >= self.BATCH_INTERVAL and (added or removed or dir_rows)):
+                flush()
+                last_flush = now
+        flush()
+
+    @staticmethod
+    def _keep(folder, children, seen):
+        """ చదవలేని ఫోల్డర్, దాని కింద తెలిసిన ఫోల్డర్లు - మారలేదనుకుంటాం, gone లోకి వెళ్ళవు """
+        stack = [folder]
+        while stack:
+            d = stack.pop()
+            seen.add(d)
+            stack.extend(children.get(d, ()))
+
+# --- LIBRARY WATCHER (INOTIFY / POLLING) ---
+# మొదటి స్కాన్ తర్వాత కొత్త డౌన్ లోడ్ లు (WhatsApp, Snaptube ...) వెంటనే లైబ్రరీలోకి రావాలి.
+# ఇండెక్స్ లోని ప్రతి ఫోల్డర్ కి inotify వాచ్; ఈవెంట్లు లేనప్పుడు థ్రెడ్ select లో నిద్రపోతుంది.
+# inotify దొరకకపోతే (లేదా వాచ్ లిమిట్ అయిపోతే) ఫోల్డర్ mtime పోలింగ్ - మార్పు లేకపోతే ఇంటర్వెల్ పెరుగుతుంది.
+class Inotify:
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    IN_IGNORED = 0x8000
+    IN_ONLYDIR = 0x1000000
+    IN_ISDIR = 0x40000000
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+    EVENT = struct.Struct('iIII')   # wd, mask, cookie, len (తర్వాత పేరు)
+
+    def __init__(self):
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = (ctypes.c_int, ctypes.c_int)
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def add_watch(self, path):
+        wd = self._add_watch(self.fd, os.fsencode(path), self.WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def rm_watch(self, wd):
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self):
+        """ [(wd, mask, name)] - fd రెడీగా ఉన్నప్పుడే పిలవాలి """
+        data = os.read(self.fd, 65536)
+        events, offset = [], 0
+        while offset < len(data):
+            wd, mask, cookie, length = self.EVENT.unpack_from(data, offset)
+            offset += self.EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self):
+        try: os.close(self.fd)
+        except OSError: pass
+
+
+class LibraryWatcher(BackgroundTask):
+    """ on_batch(added, removed, renamed) - LibraryScanner బ్యాచ్ లాగే, పేరు మారినవి (old, new) జతలుగా """
+    thread_name = "vault-watcher"
+    DEBOUNCE = 1.0          # సెకన్లు - చివరి ఈవెంట్ తర్వాత ఇంత నిశ్శబ్దం ఉంటేనే అప్లై
+    MAX_DELAY = 5.0         # పెద్ద కాపీ జరుగుతున్నా ఇంత సేపటికి ఒకసారి అప్లై
+    POLL_MIN = 5.0
+    POLL_MAX = 60.0
+
+    def __init__(self, index, rules, extensions, on_batch, on_done=None):
+        super().__init__(on_batch=on_batch, on_done=on_done)
+        self.index = index
+        self.rules = rules
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.backend = None
+        self.inotify = None
+        self._wake = None
+        self._wd_paths = {}     # wd -> ఫోల్డర్
+        self._path_wds = {}     # ఫోల్డర్ -> wd
+
+    def cancel(self):
+        super().cancel()
+        if self._wake:
+            try: os.write(self._wake[1], b'x')
+            except OSError: pass
+
+    def _run(self):
+        try:
+            self._run_inotify()
+        except (OSError, AttributeError) as e:
+            # inotify లేదు / వాచ్ లిమిట్ (ENOSPC) - పోలింగ్ కి మారతాం
+            print(f"Watcher Error: {str(e)} (polling)")
+            self._close_inotify()
+            self._run_polling()
+        finally:
+            self._close_inotify()
+        self._post(self.on_done)
+
+    # --- INOTIFY ---
+    def _watch(self, folder):
+        wd = self.inotify.add_watch(folder)
+        self._wd_paths[wd] = folder
+        self._path_wds[folder] = wd
+
+    def _forget(self, folder):
+        wd = self._path_wds.pop(folder, None)
+        # ఫోల్డర్ move అయితే అదే wd కొత్త పేరుకి ఇప్పటికే మారి ఉండొచ్చు - అప్పుడు వాచ్ ని తీయం
+        if wd is None or self._wd_paths.get(wd) != folder: return
+        del self._wd_paths[wd]
+        if self.inotify: self.inotify.rm_watch(wd)
+
+    def _close_inotify(self):
+        if self.inotify: self.inotify.close()
+        if self._wake:
+            for fd in self._wake:
+                try: os.close(fd)
+                except OSError: pass
+        self.inotify, self._wake = None, None
+        self._wd_paths.clear(); self._path_wds.clear()
+
+    def _run_inotify(self):
+        self.inotify = Inotify()
+        self._wake = os.pipe()
+        self.backend = 'inotify'
+        for folder in sorted(self.index.load_dirs()):
+            if self._cancel.is_set(): return
+            try: self._watch(folder)
+            except OSError as e:
+                if e.errno in (errno.ENOSPC, errno.ENOMEM): raise
+        dirty, first, last = set(), 0, 0
+        while not self._cancel.is_set():
+            timeout = None
+            if dirty:
+                now = time.monotonic()
+                timeout = max(0, min(last + self.DEBOUNCE, first + self.MAX_DELAY) - now)
+            ready, _, _ = select.select([self.inotify.fd, self._wake[0]], [], [], timeout)
+            if self._wake[0] in ready: return
+            if self.inotify.fd in ready:
+                changed = self._collect(self.inotify.read_events(), dirty)
+                if changed:
+                    last = time.monotonic()
+                    if not first: first = last
+                # ఆగకుండా ఈవెంట్లు వస్తున్నా (ఆల్బమ్ కాపీ, డౌన్ లోడ్) MAX_DELAY దాటితే అప్లై చేయాలి
+                if not dirty or time.monotonic() - first < self.MAX_DELAY: continue
+            if dirty:
+                self._apply(dirty)
+                dirty, first = set(), 0
+
+    def _collect(self, events, dirty):
+        """ పాటల ఫైల్స్ / సబ్ ఫోల్డర్ల మార్పులు ఉన్న ఫోల్డర్లను dirty లో కలుపుతుంది """
+        changed = False
+        for wd, mask, name in events:
+            if mask & Inotify.IN_Q_OVERFLOW:
+                # ఈవెంట్లు పోయాయి - వాచ్ లో ఉన్న ఫోల్డర్లన్నీ మళ్ళీ చూడాలి
+                dirty.update(self._path_wds)
+                changed = True
+                continue
+            folder = self._wd_paths.get(wd)
+            if folder is None: continue
+            if mask & Inotify.IN_IGNORED:
+                self._wd_paths.pop(wd, None)
+                if self._path_wds.get(folder) == wd: del self._path_wds[folder]
+                continue
+            if mask & Inotify.IN_ISDIR:
+                if mask & (Inotify.IN_CREATE | Inotify.IN_MOVED_TO | Inotify.IN_MOVED_FROM | Inotify.IN_DELETE):
+                    dirty.add(folder); changed = True
+            elif name.lower().endswith(self.extensions):
+                # IN_CREATE కి కాదు - ఫైల్ రాయడం పూర్తయ్యాక (IN_CLOSE_WRITE) మాత్రమే
+                if mask & (Inotify.IN_CLOSE_WRITE | Inotify.IN_MOVED_TO | Inotify.IN_MOVED_FROM | Inotify.IN_DELETE):
+                    dirty.add(folder); changed = True
+        return changed
+
+    # --- POLLING ---
+    def _run_polling(self):
+        self.backend = 'polling'
+        interval = self.POLL_MIN
+        while not self._cancel.wait(interval):
+            dirty = set()
+            for folder, (mtime, parent) in self.index.load_dirs().items():
+                try:
+                    if os.stat(folder).st_mtime != mtime: dirty.add(folder)
+                except OSError: dirty.add(folder)
+            if dirty and not self._cancel.is_set():
+                self._apply(dirty)
+                interval = self.POLL_MIN
+            else:
+                interval = min(interval * 2, self.POLL_MAX)
+
+    # --- INCREMENTAL DIFF ---
+    def _apply(self, dirty):
+        """ మారిన ఫోల్డర్లను మాత్రమే చదివి ఇండెక్స్ కి diff రాస్తుంది; ఒకే size + mtime తో పోయి వచ్చినవి = rename """
+        known_dirs = self.index.load_dirs()
+        children = {}
+        for d, (mtime, parent) in known_dirs.items():
+            children.setdefault(parent, []).append(d)
+        added, removed, modified = {}, {}, {}     # path -> (size, mtime)
+        dir_rows, removed_dirs, gone = [], [], set()
+
+        def drop_tree(folder):
+            stack = [folder]
+            while stack:
+                d = stack.pop()
+                if d in gone: continue
+                gone.add(d)
+                for name, key in self.index.files_in(d).items():
+                    removed[os.path.join(d, name)] = key
+                removed_dirs.append(d)
+                self._forget(d)
+                stack.extend(children.get(d, ()))
+
+        def add_tree(folder, parent):
+            stack = [(folder, parent)]
+            while stack:
+                d, p = stack.pop()
+                # ముందు వాచ్, తర్వాత లిస్టింగ్ - మధ్యలో వచ్చే ఫైల్స్ ఈవెంట్ గా అందుతాయి
+                if self.inotify:
+                    try: self._watch(d)
+                    except OSError: pass
+                try:
+                    mtime = os.stat(d).st_mtime
+                    files, subdirs = list_media_folder(d, self.extensions)
+                except OSError: continue
+                for name, key in files.items(): added[os.path.join(d, name)] = key
+                dir_rows.append((d, p, mtime))
+                stack.extend((sub, d) for sub in subdirs if sub not in known_dirs and self.rules.allows(sub))
+
+        for folder in sorted(dirty):
+            if folder in gone or self._cancel.is_set(): continue
+            try:
+                mtime = os.stat(folder).st_mtime
+                current, subdirs = list_media_folder(folder, self.extensions)
+            except OSError:
+                if folder in known_dirs: drop_tree(folder)
+                continue
+            previous = self.index.files_in(folder)
+            for name, key in current.items():
+                old = previous.get(name)
+                if old is None: added[os.path.join(folder, name)] = key
+                elif old != key: modified[os.path.join(folder, name)] = key
+            for name in previous.keys() - current.keys():
+                removed[os.path.join(folder, name)] = previous[name]
+            listed = set(subdirs)
+            for child in children.get(folder, ()):
+                if child not in listed: drop_tree(child)
+            for sub in subdirs:
+                if sub not in known_dirs and self.rules.allows(sub): add_tree(sub, folder)
+            parent = known_dirs[folder][1] if folder in known_dirs else os.path.dirname(folder)
+            dir_rows.append((folder, parent, mtime))
+
+        renamed = self._pair_renames(added, removed)
+        upserts = [(path, os.path.dirname(path), os.path.basename(path), size, mtime)
+                   for changes in (added, modified) for path, (size, mtime) in changes.items()]
+        if not (upserts or removed or renamed or dir_rows or removed_dirs): return
+        self.index.apply(dirs=dir_rows, removed_dirs=removed_dirs, upserts=upserts,
+                         removed_paths=list(removed), renamed=renamed)
+        # modified (మళ్ళీ రాసిన ఫైల్స్) UI కి కొత్తవి కావు - tagged = 0 కాబట్టి ట్యాగ్ లు మళ్ళీ చదువుతాం అంతే
+        records = [{'path': path, 'folder': os.path.dirname(path), 'name': os.path.basename(path)} for path in added]
+        if records or removed or renamed or modified:
+            self._post(self.on_batch, records, list(removed), renamed)
+
+    @staticmethod
+    def _pair_renames(added, removed):
+        """ ఒకే (size, mtime) ఒక్కో వైపు ఒక్కటే ఉంటే అది move / rename - added, removed నుండి తీసేస్తాం """
+        by_key_added, by_key_removed = {}, {}
+        for path, key in added.items(): by_key_added.setdefault(key, []).append(path)
+        for path, key in removed.items(): by_key_removed.setdefault(key, []).append(path)
+        renamed = []
+        for key, olds in by_key_removed.items():
+            news = by_key_added.get(key)
+            if len(olds) == 1 and news and len(news) == 1:
+                renamed.append((olds[0], news[0]))
+                del removed[olds[0]], added[news[0]]
+        return renamed
+
+# --- METADATA PIPELINE (WORKER POOL) ---
+# కొత్తగా స్కాన్ అయిన పాటల ట్యాగ్ లను (title, artist, album, track, duration) థ్రెడ్ పూల్ లో చదివి
+# డేటాబేస్ లో రాస్తుంది. ఫోన్ స్టోరేజ్ (FUSE) మీద ఎక్కువ సమయం I/O లోనే పోతుంది, అందుకే థ్రెడ్లు చాలు.
+def _parse_track_no(value):
+    try: return int(str(value).split('/')[0])
+    except (TypeError, ValueError): return None
+
+
+def read_track_metadata(path):
+    """ (path, title, artist, album, track_no, duration) - LibraryIndex.update_metadata కి సరిపోయే వరుస """
+    tags = read_tags(path, want_duration=True)
+    return (path, tags.get('title'), tags.get('artist'), tags.get('album'),
+            _parse_track_no(tags.get('track')), tags.get('duration'))
+
+
+class MetadataPipeline(BackgroundTask):
+    thread_name = "vault-metadata"
+    CHUNK = 64   # ఒక్కో వర్కర్ కి ఒకేసారి ఇచ్చే పాటలు
+
+    def __init__(self, index=None, on_batch=None, on_done=None, workers=None):
+        super().__init__(on_batch=on_batch, on_done=on_done)
+        self.index = index
+        self.workers = workers or min(4, os.cpu_count() or 2)
+
+    def _run(self, paths):
+        count = self.process(paths)
+        self._post(self.on_done, count)
+
+    def process(self, paths):
+        """ బ్లాక్ అయ్యే వెర్షన్ (వర్కర్ థ్రెడ్ & బెంచ్ మార్క్ ల కోసం); చదివిన పాటల సంఖ్య ఇస్తుంది """
+        chunks = [paths[i:i + self.CHUNK] for i in range(0, len(paths), self.CHUNK)]
+        count = 0
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.thread_name)
+        try:
+            for rows in pool.map(self._read_chunk, chunks):
+                if self._cancel.is_set(): break
+                if self.index is not None: self._save(rows)
+                self._post(self.on_batch, rows)
+                count += len(rows)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        return count
+
+    def _save(self, rows):
+        self.index.update_metadata(rows)
+
+    def _read_chunk(self, paths):
+        rows = []
+        for path in paths:
+            if self._cancel.is_set(): break
+            rows.append(self._read(path))
+        return rows
+
+    def _read(self, path):
+        return read_track_metadata(path)
+
+# --- ALBUM ART CACHE (LRU) ---
+# పాట path + mtime + size తో కీ చేసి ఆల్బమ్ ఆర్ట్ ని ఒక్కసారే బయటకు తీస్తుంది.
+# మొత్తం సైజ్ బడ్జెట్ దాటితే ఎక్కువ కాలం వాడని ఫోటోలు (LRU) తొలగిపోతాయి.
+class ArtCache:
+    DEFAULT_BUDGET = 48 * 1024 * 1024   # 48 MB
+    LEGACY_PREFIX = "vault_cached_"
+    # ఫైల్ మొదటి బైట్ల నుండి ఫార్మాట్ - PNG కవర్ .jpg పేరుతో ఉండకూడదు (Kivy ఎక్స్ టెన్షన్ చూసి లోడర్ ఎంచుకుంటుంది)
+    SIGNATURES = ((b'\x89PNG', '.png'), (b'GIF8', '.gif'), (b'BM', '.bmp'))
+    EXTENSIONS = ('.jpg', '.png', '.gif', '.webp', '.bmp')
+    INFO = ".json"      # ఇమేజ్ పక్కన extractor ఇచ్చిన వివరాలు (వీడియో నిడివి) - అదే కీ, ఇమేజ్ తో పాటే తొలగుతుంది
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_BUDGET):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.entries = OrderedDict()   # file name -> bytes, పాతవి ముందు
+        self.total = 0
+        self.misses = set()            # ఆర్ట్ లేని పాటలు - ఈ సెషన్ లో మళ్లీ ప్రయత్నించం
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # డిస్క్ లో ఉన్నవాటిని mtime (చివరిగా వాడిన సమయం) ప్రకారం లోడ్ చేస్తుంది
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file():
+                if entry.name.endswith(".tmp"):
+                    try: os.remove(entry.path)
+                    except OSError: pass
+                    continue
+                st = entry.stat()
+                files.append((st.st_mtime, entry.name, st.st_size))
+        for _, name, size in sorted(files):
+            self.entries[name] = size
+            self.total += size
+        for name in [n for n in self.entries if n.endswith(self.INFO) and self._name(n[:-len(self.INFO)]) is None]:
+            self.total -= self.entries.pop(name)
+            try: os.remove(os.path.join(self.cache_dir, name))
+            except OSError: pass
+        self._evict()
+
+    @staticmethod
+    def key(path):
+        st = os.stat(path)
+        return hashlib.sha1(f"{path}|{st.st_mtime_ns}|{st.st_size}".encode("utf-8")).hexdigest()
+
+    @classmethod
+    def sniff(cls, path):
+        """ రాసిన ఇమేజ్ కి సరైన ఎక్స్ టెన్షన్ (తెలియకపోతే .jpg) """
+        with open(path, 'rb') as f: head = f.read(12)
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP': return '.webp'
+        for magic, ext in cls.SIGNATURES:
+            if head.startswith(magic): return ext
+        return '.jpg'
+
+    def _name(self, key):
+        """ key కి క్యాష్ లో ఉన్న ఫైల్ పేరు (లాక్ లో పిలవాలి) """
+        for ext in self.EXTENSIONS:
+            if key + ext in self.entries: return key + ext
+        return None
+
+    def lookup(self, path):
+        """ క్యాష్ లో ఉంటే ఆ ఫైల్ path ఇస్తుంది, లేకపోతే None """
+        try: key = self.key(path)
+        except OSError: return None
+        with self._lock:
+            name = self._name(key)
+            if name is None: return None
+            self.entries.move_to_end(name)
+        full = os.path.join(self.cache_dir, name)
+        try: os.utime(full)   # రీస్టార్ట్ తర్వాత కూడా LRU ఆర్డర్ గుర్తుండటానికి
+        except OSError:
+            with self._lock:
+                self.total -= self.entries.pop(name, 0)
+            return None
+        return full
+
+    def info(self, path):
+        """ fetch లో extractor ఇచ్చిన dict (ఇమేజ్ పక్కన దాచినది), లేకపోతే None """
+        try: name = self.key(path) + self.INFO
+        except OSError: return None
+        with self._lock:
+            if name not in self.entries: return None
+            self.entries.move_to_end(name)
+        try:
+            with open(os.path.join(self.cache_dir, name), encoding="utf-8") as f: return json.load(f)
+        except (OSError, ValueError): return None
+
+    def fetch(self, path, extractor):
+        """ హిట్ అయితే వెంటనే ఇస్తుంది; మిస్ అయితే extractor(path, save_path) తో ఒక్కసారి తీసి దాస్తుంది.
+            extractor dict ఇస్తే అది ఇమేజ్ పక్కన దాస్తాం - తర్వాత info(path) తో """
+        cached = self.lookup(path)
+        if cached: return cached
+        try: key = self.key(path)
+        except OSError: return None
+        if key in self.misses: return None
+        tmp = os.path.join(self.cache_dir, key + ".tmp")
+        try:
+            result = extractor(path, tmp)
+            if not result:
+                self.misses.add(key)
+                return None
+            name = key + self.sniff(tmp)
+            final = os.path.join(self.cache_dir, name)
+            os.replace(tmp, final)
+            size = os.path.getsize(final)
+        except Exception as e:
+            print(f"Art Cache Error: {str(e)}")
+            try: os.remove(tmp)
+            except OSError: pass
+            return None
+        with self._lock:
+            self.total += size - self.entries.pop(name, 0)
+            self.entries[name] = size
+        if isinstance(result, dict): self._write_info(key, result)
+        self._evict(keep=name)
+        return final
+
+    def _write_info(self, key, info):
+        name = key + self.INFO
+        full = os.path.join(self.cache_dir, name)
+        try:
+            with open(full + ".tmp", "w", encoding="utf-8") as f: json.dump(info, f)
+            os.replace(full + ".tmp", full)
+            size = os.path.getsize(full)
+        except OSError as e:
+            print(f"Art Cache Error: {str(e)}")
+            return
+        with self._lock:
+            self.total += size - self.entries.pop(name, 0)
+            self.entries[name] = size
+
+    def has(self, name):
+        """ కాష్ లో ఉన్న ఫైల్ అయితే LRU లో ముందుకు తెస్తుంది """
+        with self._lock:
+            if name not in self.entries: return False
+            self.entries.move_to_end(name)
+        return os.path.exists(os.path.join(self.cache_dir, name))
+
+    def add(self, name):
+        """ cache_dir లో ఇప్పటికే రాసిన ఫైల్ ని బడ్జెట్ లెక్కలోకి తీసుకుంటుంది """
+        try: size = os.path.getsize(os.path.join(self.cache_dir, name))
+        except OSError: return
+        with self._lock:
+            self.total += size - self.entries.pop(name, 0)
+            self.entries[name] = size
+        self._evict(keep=name)
+
+    def set_budget(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def _evict(self, keep=None):
+        with self._lock:
+            victims = []
+            for name in list(self.entries):
+                if self.total <= self.max_bytes: break
+                if name == keep or name.endswith(self.INFO) or name not in self.entries: continue
+                self.total -= self.entries.pop(name)
+                victims.append(name)
+                info = name.split('.')[0] + self.INFO
+                if info in self.entries:
+                    self.total -= self.entries.pop(info)
+                    victims.append(info)
+        for name in victims:
+            try: os.remove(os.path.join(self.cache_dir, name))
+            except OSError: pass
+
+    @classmethod
+    def purge_legacy(cls, folder):
+        """ పాత వెర్షన్ వదిలేసిన vault_cached_<ms>.jpg ఫైల్స్ ని తొలగిస్తుంది """
+        removed = 0
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    if entry.name.startswith(cls.LEGACY_PREFIX) and entry.name.endswith(".jpg"):
+                        try:
+                            os.remove(entry.path)
+                            removed += 1
+                        except OSError: pass
+        except OSError: pass
+        return removed
+
+# --- ART THUMBNAILS (PILLOW) ---
+# ఒక్కో కవర్ కి కొన్ని స్థిర సైజుల థంబ్ నెయిల్స్ ఒక్కసారే (బ్యాక్ గ్రౌండ్ లో) తయారవుతాయి.
+# మినీ ప్లేయర్, ఫుల్ ప్లేయర్, బ్యాక్ గ్రౌండ్ లకు సరిపోయే చిన్న ఫైల్ ఇస్తాం - 3000px టెక్స్చర్ అవసరం లేదు.
+class ArtThumbnailer:
+    SIZES = (128, 256, 512, 1024)   # పిక్సెల్స్ (పొడవైన వైపు)
+    BG_SIZE = 128                   # బ్లర్ చేసిన ఫుల్ స్క్రీన్ బ్యాక్ గ్రౌండ్ కి చిన్నది చాలు
+    MAX_KNOWN = 256                 # మెమరీ లో గుర్తుంచుకునే కవర్లు - మిగతావి క్యాష్ ఫైల్ పేర్ల నుండి మళ్ళీ
+
+    def __init__(self, cache, max_known=MAX_KNOWN):
+        self.cache = cache
+        self.max_known = max_known
+        self._lock = threading.Lock()
+        self.known = OrderedDict()   # source -> {px: path, 'bg': path}, పాతవి ముందు (ArtCache లాగే LRU)
+
+    def lookup(self, source):
+        with self._lock:
+            thumbs = self.known.get(source)
+            if thumbs is not None: self.known.move_to_end(source)
+        if thumbs and all(os.path.exists(p) for p in thumbs.values()): return thumbs
+        return None
+
+    def build(self, source):
+        """ వర్కర్ థ్రెడ్ లో పిలవాలి; Pillow లేకపోయినా/ఫెయిల్ అయినా ఒరిజినల్ నే ఇస్తుంది """
+        thumbs = self.lookup(source)
+        if thumbs: return thumbs
+        thumbs = {}
+        try:
+            key = ArtCache.key(source)
+            names = {px: f"{key}_{px}.jpg" for px in self.SIZES}
+            names['bg'] = f"{key}_bg.jpg"
+            if all(self.cache.has(name) for name in names.values()):
+                thumbs = {px: os.path.join(self.cache.cache_dir, name) for px, name in names.items()}
+            else:
+                thumbs = self._render(source, key)
+        except Exception as e:
+            print(f"Thumbnail Error: {str(e)}")
+        with self._lock:
+            self.known[source] = thumbs
+            self.known.move_to_end(source)
+            while len(self.known) > self.max_known: self.known.popitem(last=False)
+        return thumbs
+
+    def _render(self, source, key):
+        from PIL import Image, ImageFilter
+        thumbs = {}
+        with Image.open(source) as img:
+            # JPEG అయితే DCT లెవల్ లోనే చిన్నగా డీకోడ్ అవుతుంది
+            img.draft('RGB', (self.SIZES[-1], self.SIZES[-1]))
+            img = img.convert('RGB')
+            # పెద్దది నుండి చిన్నదానికి - ప్రతి సైజ్ ముందు దాని నుండే తగ్గుతుంది
+            for px in sorted(self.SIZES, reverse=True):
+                name = f"{key}_{px}.jpg"
+                if max(img.size) > px:
+                    img.thumbnail((px, px), Image.LANCZOS)
+                img.save(os.path.join(self.cache.cache_dir, name), 'JPEG', quality=88)
+                self.cache.add(name)
+                thumbs[px] = os.path.join(self.cache.cache_dir, name)
+            bg = img.copy()
+            bg.thumbnail((self.BG_SIZE, self.BG_SIZE), Image.LANCZOS)
+            bg = bg.filter(ImageFilter.GaussianBlur(6))
+            name = f"{key}_bg.jpg"
+            bg.save(os.path.join(self.cache.cache_dir, name), 'JPEG', quality=80)
+            self.cache.add(name)
+            thumbs['bg'] = os.path.join(self.cache.cache_dir, name)
+        return thumbs
+
+    def pick(self, source, thumbs, pixels):
+        """ pixels కి సరిపోయే అతి చిన్న థంబ్ నెయిల్; ఏదీ సరిపోకపోతే ఒరిజినల్ """
+        for px in self.SIZES:
+            if px >= pixels and px in thumbs: return thumbs[px]
+        return source
+
+# --- GALLERY THUMBNAILS (DRAFT DECODE + DISK CACHE + TEXTURE LRU) ---
+# గ్యాలరీ గ్రిడ్ ఫోటోలు: వర్కర్ థ్రెడ్లలో Pillow draft మోడ్ తో (JPEG DCT లెవల్ లోనే 1/2..1/8 కి) డీకోడ్ చేసి,
+# చతురస్రంగా కట్ చేసిన చిన్న JPEG ని డిస్క్ క్యాష్ లో (ArtCache - path + mtime + size కీ, సైజ్ బడ్జెట్ LRU) దాస్తుంది.
+# పిక్సెల్ బైట్లు కూడా వర్కర్ లోనే; మెయిన్ థ్రెడ్ లో ఒక్కో ఫ్రేమ్ కి కొన్ని టెక్స్చర్ అప్ లోడ్ లు మాత్రమే.
+# టెక్స్చర్ లు పరిమిత LRU లో - 20k ఫోటోల ఫోల్డర్ అయినా GPU మెమరీ పెరగదు.
+class GalleryThumbnails:
+    PX = 256                # క్యాష్ లో థంబ్ నెయిల్ సైజ్ (చతురస్రం)
+    WORKERS = 2
+    MAX_TEXTURES = 180      # 256x256 RGB ~ 192 KB -> ~35 MB
+    CACHE_BUDGET = 64 * 1024 * 1024   # డిస్క్ లో థంబ్ నెయిల్స్ (~15 KB ఒక్కోటి -> ~4000 ఫోటోలు)
+    UPLOADS_PER_FRAME = 6
+
+    def __init__(self, cache, px=PX, max_textures=MAX_TEXTURES, workers=WORKERS):
+        self.cache = cache
+        self.px = px
+        self.max_textures = max_textures
+        self.textures = OrderedDict()   # path -> Texture, పాతవి ముందు (మెయిన్ థ్రెడ్ మాత్రమే)
+        self.waiting = {}               # path -> [callback] - స్క్రీన్ పై ఉన్న టైల్స్ అడిగినవి
+        self.parked = {}                # గ్యాలరీ మూసినప్పుడు ఆగిన రిక్వెస్ట్ లు - మళ్ళీ తెరిస్తే resume
+        self._ready = deque()           # (path, size, pixels) - వర్కర్ల నుండి
+        self._lock = threading.Lock()
+        self._upload_pending = False
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vault-gallery")
+        self.decoded = 0
+
+    def request(self, path, callback):
+        """ మెయిన్ థ్రెడ్: టెక్స్చర్ ఉంటే వెంటనే ఇస్తుంది; లేకపోతే None, తయారయ్యాక callback(path, texture) """
+        texture = self.textures.get(path)
+        if texture is not None:
+            self.textures.move_to_end(path)
+            return texture
+        callbacks = self.waiting.get(path)
+        if callbacks is None:
+            self.waiting[path] = [callback]
+            event_log.watch(self._pool.submit(self._decode, path))
+        elif callback not in callbacks:
+            callbacks.append(callback)
+        return None
+
+    def cancel(self, path, callback):
+        """ టైల్ వేరే ఫోటోకి రీసైకిల్ అయింది - ఇంకా మొదలవని డీకోడ్ ని వర్కర్ దాటేస్తుంది """
+        callbacks = self.waiting.get(path)
+        if callbacks is None: return
+        if callback in callbacks: callbacks.remove(callback)
+        if not callbacks: del self.waiting[path]
+
+    def suspend(self):
+        """ గ్యాలరీ స్క్రీన్ మూసింది - క్యూ లో ఉన్న డీకోడ్ లు వర్కర్ దాటేస్తుంది (waiting లో లేవు) """
+        self.parked.update(self.waiting)
+        self.waiting.clear()
+        self._ready.clear()
+
+    def resume(self):
+        """ మళ్ళీ తెరిచింది - స్క్రీన్ పై ఇంకా ఖాళీగా ఉన్న టైల్స్ కోసం ఆగినవి మళ్ళీ """
+        parked, self.parked = self.parked, {}
+        for path, callbacks in parked.items():
+            for callback in callbacks: self.request(path, callback)
+
+    def close(self):
+        """ యాప్ ఆగుతోంది - మొదలవని డీకోడ్ లు రద్దు, నడుస్తున్నవాటి కోసం ఆగం """
+        self.waiting.clear()
+        self.parked.clear()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def render(self, path, save_path):
+        """ ArtCache extractor: ఒరిజినల్ ఫోటో నుండి చతురస్రం థంబ్ నెయిల్ JPEG """
+        from PIL import Image, ImageOps
+        with Image.open(path) as img:
+            img.draft('RGB', (self.px, self.px))
+            img = ImageOps.exif_transpose(img).convert('RGB')
+            img = ImageOps.fit(img, (self.px, self.px), Image.BILINEAR)
+            img.save(save_path, 'JPEG', quality=80)
+        return True
+
+    def _decode(self, path):
+        # వేగంగా స్క్రోల్ చేస్తే చాలా రిక్వెస్ట్ లు క్యూలోనే పాతబడతాయి - ఇంకా కావాలంటేనే పని
+        if path not in self.waiting: return
+        size = pixels = None
+        try:
+            thumb = self.cache.fetch(path, self.render)
+            if thumb:
+                from PIL import Image
+                with Image.open(thumb) as img:
+                    img = img.convert('RGB')
+                    size, pixels = img.size, img.tobytes()
+                self.decoded += 1
+        except Exception as e:
+            print(f"Gallery Thumbnail Error: {str(e)}")
+        self._ready.append((path, size, pixels))
+        with self._lock:
+            if self._upload_pending: return
+            self._upload_pending = True
+        self._schedule_upload()
+
+    def _schedule_upload(self):
+        Clock.schedule_once(self._upload)
+
+    def _upload(self, dt):
+        """ మెయిన్ థ్రెడ్: ఫ్రేమ్ కి UPLOADS_PER_FRAME టెక్స్చర్ లు; మిగిలినవి తర్వాతి ఫ్రేమ్ లో """
+        from kivy.graphics.texture import Texture
+        for _ in range(self.UPLOADS_PER_FRAME):
+            if not self._ready: break
+            path, size, pixels = self._ready.popleft()
+            callbacks = self.waiting.pop(path, None)
+            if callbacks is None: continue   # ఈలోపు స్క్రీన్ నుండి వెళ్ళిపోయింది (డిస్క్ క్యాష్ లో ఉంది)
+            texture = None
+            if pixels:
+                texture = Texture.create(size=size, colorfmt='rgb')
+                texture.blit_buffer(pixels, colorfmt='rgb', bufferfmt='ubyte')
+                texture.flip_vertical()
+                self.textures[path] = texture
+                while len(self.textures) > self.max_textures:
+                    self.textures.popitem(last=False)
+            for callback in callbacks: callback(path, texture)
+        with self._lock:
+            if not self._ready:
+                self._upload_pending = False
+                return
+        self._schedule_upload()
+
+
+class GalleryView:
+    """ RecycleView కోసం లేజీ సీక్వెన్స్ - 20k ఫోటోలకు 20k dict లు కట్టం """
+    def __init__(self, paths=()):
+        self.paths = list(paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice): return [self[j] for j in range(*i.indices(len(self.paths)))]
+        return {'path': self.paths[i]}
+
+    def __iter__(self):
+        for i in range(len(self.paths)): yield self[i]
+
+
+class GalleryLoader(BackgroundTask):
+    """ ఫోల్డర్ లోని ఫోటోలు, కొత్తవి ముందు (FUSE మీద 20k stat లు - అందుకే వర్కర్ లో) """
+    thread_name = "vault-gallery-list"
+
+    def _run(self, folder):
+        try: files, _ = list_media_folder(folder, MEDIA_TYPES['image'])
+        except OSError as e:
+            print(f"Gallery Error: {str(e)}")
+            files = {}
+        names = sorted(files, key=lambda name: (files[name][1], name), reverse=True)
+        self._post(self.on_done, folder, [os.path.join(folder, name) for name in names])
+
+# --- VIDEO LIBRARY (POSTER FRAMES + DURATIONS) ---
+# వీడియోలు వేరే డేటాబేస్ లో (vault_videos.db) - పాటల స్కానర్ నే వాడతాం, కాబట్టి మారని ఫోల్డర్లు మళ్ళీ చదవం.
+# పోస్టర్ ఫ్రేమ్, నిడివి పరిమిత వర్కర్ పూల్ లో ఒక్కసారే తీసి, పోస్టర్ ని ArtCache లో (path + mtime + size కీ),
+# నిడివి + పోస్టర్ పేరుని ఇండెక్స్ లో దాస్తాం - తర్వాత ఓపెన్ చేసినప్పుడు లిస్ట్ డేటాబేస్ నుండే వెంటనే.
+VIDEO_ROOTS = (
+    "/storage/emulated/0/DCIM",
+    "/storage/emulated/0/Movies",
+    "/storage/emulated/0/Download",
+    "/storage/emulated/0/WhatsApp/Media/WhatsApp Video",
+    "/storage/emulated/0/Telegram/Telegram Video",
+    "/storage/emulated/0/Snaptube/download",
+)
+
+class VideoIndex(LibraryIndex):
+    META_COLUMNS = LibraryIndex.META_COLUMNS + (('poster', 'TEXT'),)
+
+    def all_videos(self):
+        """ (path, name, duration, poster) - కొత్తవి ముందు """
+        with self._lock:
+            return self.conn.execute("SELECT path, name, duration, poster FROM tracks ORDER BY mtime DESC").fetchall()
+
+    def untagged_paths(self):
+        # లిస్ట్ పైన కనిపించే కొత్త వీడియోల పోస్టర్లు ముందు
+        with self._lock:
+            return [p for (p,) in self.conn.execute("SELECT path FROM tracks WHERE tagged = 0 ORDER BY mtime DESC")]
+
+    def update_videos(self, rows):
+        """ rows: (path, duration, poster క్యాష్ ఫైల్ పేరు) """
+        with self._lock, self.conn:
+            self.conn.executemany("UPDATE tracks SET duration = ?, poster = ?, tagged = 1 WHERE path = ?",
+                                  (row[1:] + row[:1] for row in rows))
+
+
+class AndroidVideoFrames:
+    POSTER_SIZE = (320, 180)
+    FRAME_AT_US = 1000000   # 1 సెకను దగ్గరి కీ ఫ్రేమ్ - మొదటి ఫ్రేమ్ తరచుగా నల్లగా ఉంటుంది
+
+    def __init__(self):
+        from jnius import autoclass
+        self.Retriever = autoclass('android.media.MediaMetadataRetriever')
+        self.CompressFormat = autoclass('android.graphics.Bitmap$CompressFormat')
+        self.FileOutputStream = autoclass('java.io.FileOutputStream')
+
+    def extract(self, path, save_path):
+        """ (నిడివి సెకన్లు లేదా None, పోస్టర్ రాసిందా); save_path None అయితే నిడివి మాత్రమే """
+        retr = self.Retriever()
+        duration, wrote = None, False
+        try:
+            retr.setDataSource(path)
+            value = retr.extractMetadata(self.Retriever.METADATA_KEY_DURATION)
+            if value: duration = int(value) / 1000.0
+            if save_path:
+                # చిన్న క్లిప్ లకు మధ్యలోని ఫ్రేమ్
+                at = min(self.FRAME_AT_US, int(duration * 500000)) if duration else 0
+                option = self.Retriever.OPTION_CLOSEST_SYNC
+                try: bitmap = retr.getScaledFrameAtTime(at, option, *self.POSTER_SIZE)   # API 27+
+                except: bitmap = retr.getFrameAtTime(at, option)
+                if bitmap is not None:
+                    out = self.FileOutputStream(save_path)
+                    try: wrote = bool(bitmap.compress(self.CompressFormat.JPEG, 80, out))
+                    finally:
+                        out.close()
+                        bitmap.recycle()
+        finally:
+            # నేటివ్ రిట్రీవర్ ని వెంటనే విడుదల చేయాలి (get_art లాగే)
+            try: retr.release()
+            except: pass
+        return duration, wrote
+
+
+class StubVideoFrames:
+    """ ఆండ్రాయిడ్ కాని చోట (డెస్క్ టాప్ / టెస్ట్ లు / బెంచ్ మార్క్ లు): నిడివి MP4 mvhd నుండి,
+    పోస్టర్ path నుండి వచ్చే ఒకే రంగు ఫ్రేమ్. latency = ఒక్కో ఫైల్ కి నకిలీ డీకోడ్ సమయం """
+    POSTER_SIZE = AndroidVideoFrames.POSTER_SIZE
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def extract(self, path, save_path):
+        self.calls += 1
+        if self.latency: time.sleep(self.latency)
+        duration = read_tags(path, want_duration=True).get('duration') if path.lower().endswith('.mp4') else None
+        if not save_path: return duration, False
+        from PIL import Image
+        color = tuple(hashlib.sha1(path.encode('utf-8')).digest()[:3])
+        Image.new('RGB', self.POSTER_SIZE, color).save(save_path, 'JPEG', quality=80)
+        return duration, True
+
+
+def video_frames():
+    """ ప్లాట్ ఫామ్ కి తగిన పోస్టర్ బ్యాకెండ్ """
+    if platform == 'android':
+        try: return AndroidVideoFrames()
+        except Exception as e: print(f"Video Frames Error: {str(e)}")
+    return StubVideoFrames()
+
+
+class VideoPosterPipeline(MetadataPipeline):
+    thread_name = "vault-posters"
+    CHUNK = 8           # పోస్టర్లు కొన్ని కొన్నిగా లిస్ట్ లో కనిపించడానికి
+    WORKERS = 2         # ఒక్కో రిట్రీవర్ ఒక హార్డ్ వేర్ డీకోడర్ పట్టుకుంటుంది - ఎక్కువ థ్రెడ్లు వద్దు
+    CACHE_BUDGET = 32 * 1024 * 1024
+
+    def __init__(self, index, cache, frames, on_batch=None, on_done=None, workers=WORKERS):
+        super().__init__(index, on_batch=on_batch, on_done=on_done, workers=workers)
+        self.cache = cache
+        self.frames = frames
+
+    def _save(self, rows):
+        self.index.update_videos(rows)
+
+    @metrics.timed('video.poster')
+    def _read(self, path):
+        """ (path, duration, poster ఫైల్ పేరు) - ఒకే రిట్రీవర్ ఓపెన్ లో రెండూ """
+        found = {}
+        def extractor(path, save_path):
+            found['duration'], wrote = self.frames.extract(path, save_path)
+            # నిడివి పోస్టర్ పక్కనే (path + mtime కీ) - తర్వాతి హిట్ లో రిట్రీవర్ ఓపెన్ చేయం
+            return {'duration': found['duration']} if wrote else False
+        poster = self.cache.fetch(path, extractor)
+        if poster and 'duration' not in found:
+            info = self.cache.info(path)
+            if info is not None: found['duration'] = info.get('duration')
+        if 'duration' not in found:
+            # పాత క్యాష్ పోస్టర్ (నిడివి దాచనిది) లేదా తీయడం ఫెయిల్ - నిడివి మాత్రమే
+            try: found['duration'] = self.frames.extract(path, None)[0]
+            except Exception as e: print(f"Video Frame Error: {str(e)}")
+        return (path, found.get('duration'), os.path.basename(poster) if poster else None)
+
+# --- SHARED WALLPAPER ---
+# వాల్ పేపర్ ని ఒక్కసారే స్క్రీన్ సైజ్ కి తగ్గించి డిస్క్ లో దాస్తుంది. అన్ని స్క్రీన్లు ఒకే టెక్స్చర్ వాడతాయి.
+# సోర్స్ ఫైల్ (mtime/size) లేదా స్క్రీన్ సైజ్ మారితే కీ మారుతుంది, పాత ఫైల్ తొలగిపోతుంది.
+class WallpaperCache:
+    PREFIX = "vault_wallpaper_"
+
+    def __init__(self, folder):
+        self.folder = os.path.abspath(folder)
+
+    def target(self, source, size):
+        st = os.stat(source)
+        width, height = int(size[0]), int(size[1])
+        key = hashlib.sha1(f"{os.path.abspath(source)}|{st.st_mtime_ns}|{st.st_size}|{width}x{height}".encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.folder, f"{self.PREFIX}{width}x{height}_{key}.jpg")
+
+    def cached(self, source, size):
+        path = self.target(source, size)
+        return path if os.path.exists(path) else None
+
+    def build(self, source, size):
+        """ వర్కర్ థ్రెడ్ లో పిలవాలి; స్క్రీన్ ఆకారానికి క్రాప్ చేసి సేవ్ చేస్తుంది """
+        from PIL import Image, ImageOps
+        path = self.target(source, size)
+        width, height = int(size[0]), int(size[1])
+        tmp = path + ".tmp"
+        with Image.open(source) as img:
+            img.draft('RGB', (width, height))
+            fitted = ImageOps.fit(img.convert('RGB'), (width, height), Image.LANCZOS)
+        fitted.save(tmp, 'JPEG', quality=85)
+        os.replace(tmp, path)
+        self.purge(keep=path)
+        return path
+
+    def purge(self, keep=None):
+        try:
+            with os.scandir(self.folder) as it:
+                for entry in it:
+                    if entry.name.startswith(self.PREFIX) and entry.path != keep:
+                        try: os.remove(entry.path)
+                        except OSError: pass
+        except OSError: pass
+
+# --- TRACK STORE (COLUMNAR) ---
+# ప్రతి పాటకీ dict బదులు కాలమ్ లు: path లిస్ట్, టైటిల్ లిస్ట్, ఫోల్డర్ / ఆర్టిస్ట్ / ఆల్బమ్ లు ఒక్కసారే దాచి వాటి ఐడీలు array లో.
+# RecycleView కి TrackListView ఇస్తాం - ఐటమ్ dict లు స్క్రీన్ కి కావలసినప్పుడే కడతాం, లిస్ట్ లో ఉండవు.
+class TrackStore:
+    def __init__(self):
+        self.paths = []             # row -> path; తొలగిస్తే None (row నంబర్లు మారవు, పాత వ్యూలు చెల్లుతాయి)
+        self.titles = []
+        self.folder_ids = array('I')
+        self.artist_ids = array('I')
+        self.album_ids = array('I')
+        self.track_nos = array('H')
+        self.durations = array('f')
+        self.strings = [None]       # ఇంటర్న్ చేసిన ఫోల్డర్ / ఆర్టిస్ట్ / ఆల్బమ్ పేర్లు; 0 = లేదు
+        self._string_ids = {}
+        self.index = {}             # path -> row
+        self.live = 0
+
+    def __len__(self):
+        return self.live
+
+    def __contains__(self, path):
+        return path in self.index
+
+    def _intern(self, value):
+        if not value: return 0
+        sid = self._string_ids.get(value)
+        if sid is None:
+            sid = self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return sid
+
+    def add(self, path, folder, title=None, artist=None, album=None, track_no=None, duration=None):
+        row = self.index.get(path)
+        if row is None:
+            row = self.index[path] = len(self.paths)
+            self.paths.append(path)
+            self.titles.append(None)
+            self.folder_ids.append(self._intern(folder))
+            self.artist_ids.append(0)
+            self.album_ids.append(0)
+            self.track_nos.append(0)
+            self.durations.append(0)
+            self.live += 1
+        self.set_metadata(row, title, artist, album, track_no, duration)
+        return row
+
+    def set_metadata(self, row, title, artist, album, track_no, duration):
+        self.titles[row] = title or None
+        self.artist_ids[row] = self._intern(artist)
+        self.album_ids[row] = self._intern(album)
+        self.track_nos[row] = min(max(int(track_no or 0), 0), 0xFFFF)
+        self.durations[row] = float(duration or 0)
+
+    def update_metadata(self, path, title, artist, album, track_no, duration):
+        row = self.index.get(path)
+        if row is not None: self.set_metadata(row, title, artist, album, track_no, duration)
+
+    def remove(self, path):
+        row = self.index.pop(path, None)
+        if row is None: return
+        self.paths[row] = None
+        self.titles[row] = None
+        self.live -= 1
+
+    def rename(self, old, new):
+        """ ఫైల్ move / rename - అదే row, ట్యాగ్ లు అలాగే ఉంటాయి """
+        row = self.index.pop(old, None)
+        if row is None: return None
+        self.paths[row] = new
+        self.folder_ids[row] = self._intern(os.path.dirname(new))
+        self.index[new] = row
+        return row
+
+    def rows(self):
+        """ ఉన్న పాటల rows, చేర్చిన ఆర్డర్ లో """
+        return [row for row, path in enumerate(self.paths) if path is not None]
+
+    # ఫీల్డ్ యాక్సెసర్లు
+    def name(self, row): return os.path.basename(self.paths[row])
+    def folder(self, row): return self.strings[self.folder_ids[row]]
+    def artist(self, row): return self.strings[self.artist_ids[row]]
+    def album(self, row): return self.strings[self.album_ids[row]]
+    def track_no(self, row): return self.track_nos[row]
+    def duration(self, row): return self.durations[row]
+    def title(self, row): return self.titles[row]
+
+    def list_item(self, row):
+        """ ఒక పాటని RecycleView ఐటమ్ గా (స్క్రీన్ పై కనిపించేటప్పుడు మాత్రమే పిలుస్తారు) """
+        # తీసేసిన row - refresh_trigger వ్యూ ని మళ్ళీ కట్టే వరకు ఖాళీ వరుస
+        if self.paths[row] is None: return {'text': '', 'secondary_text': '', 'path': ''}
+        details = [value for value in (self.artist(row), self.album(row)) if value]
+        secondary = " • ".join(details) if details else os.path.basename(self.folder(row) or '')
+        duration = self.durations[row]
+        if duration:
+            mins, secs = divmod(int(duration), 60)
+            secondary += f"  ({mins}:{secs:02})"
+        return {'text': self.titles[row] or self.name(row), 'secondary_text': secondary, 'path': self.paths[row]}
+
+    def search_fields(self, row):
+        return (self.titles[row], self.artist(row), self.album(row),
+                os.path.splitext(self.name(row))[0], os.path.basename(self.folder(row) or ''))
+
+
+class TrackListView:
+    """ RecycleView కోసం లేజీ సీక్వెన్స్. entries లో row నంబర్లు; గ్రూప్ హెడర్లు -1 - (headers లో స్థానం) """
+    def __init__(self, store, entries=None, headers=None):
+        self.store = store
+        self.entries = entries if entries is not None else array('i')
+        self.headers = headers or []
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice): return [self[j] for j in range(*i.indices(len(self.entries)))]
+        entry = self.entries[i]
+        if entry < 0: return {'viewclass': 'SongGroupHeader', 'text': self.headers[-1 - entry], 'height': dp(44)}
+        return self.store.list_item(entry)
+
+    def __iter__(self):
+        for i in range(len(self.entries)): yield self[i]
+
+    def positions(self, rows):
+        """ ఈ rows వ్యూ లో ఏ స్థానాల్లో ఉన్నాయి """
+        return {i for i, entry in enumerate(self.entries) if entry in rows}
+
+
+class TrackDataModel(RecycleDataModelBehavior, EventDispatcher):
+    """ RecycleDataModel డేటాని ListProperty లో కాపీ చేసి ప్రతి ఐటమ్ ని గమనిస్తుంది - ఇది వ్యూ ని అలాగే ఇస్తుంది """
+    data = ObjectProperty([])
+
+    def __init__(self, **kwargs):
+        self.fbind('data', self._on_data)
+        super().__init__(**kwargs)
+
+    def __getitem__(self, index):
+        return self.data[index]
+
+    def attach_recycleview(self, rv):
+        super().attach_recycleview(rv)
+        if rv: self.fbind('data', rv._dispatch_prop_on_source, 'data')
+
+    def detach_recycleview(self):
+        rv = self.recycleview
+        if rv: self.funbind('data', rv._dispatch_prop_on_source, 'data')
+        super().detach_recycleview()
+
+    def _on_data(self, instance, value):
+        self.dispatch('on_data_changed')
+
+    def appended(self, start):
+        """ వ్యూ చివర్లో ఐటమ్ లు కలిపాక - లేఅవుట్ కొత్తవాటికి మాత్రమే సైజ్ లెక్కిస్తుంది """
+        self.dispatch('on_data_changed', appended=slice(start, len(self.data)))
+
+    def modified(self, indices):
+        """ ఆ స్థానాల్లోని ఐటమ్ ల విలువలు మాత్రమే మారాయి (సంఖ్య, సైజ్ లు అలాగే) - అక్కడ ఉన్న వ్యూలను మళ్ళీ నింపుతుంది.
+        on_data_changed(modified=...) అయితే RecycleLayout ప్రతి ఐటమ్ ని మళ్ళీ అడుగుతుంది - లేజీ వ్యూ కి అది పూర్తి రీబిల్డ్ """
+        rv = self.recycleview
+        adapter = rv.view_adapter if rv else None
+        if adapter is None or not indices: return
+        # కనిపించేవి, స్క్రోల్ చేస్తే అదే స్థానానికి మళ్ళీ వాడే (dirty) వ్యూలు రెండూ
+        views = list(adapter.views.items())
+        for dirty in adapter.dirty_views.values(): views.extend(dirty.items())
+        for index, view in views:
+            if index in indices: adapter.refresh_view_attrs(index, self.data[index], view)
+
+# --- LIBRARY SEARCH INDEX ---
+# పదాల ఇండెక్స్: సార్ట్ చేసిన పదజాలం + ప్రతి పదానికి ఎంట్రీ ఐడీల array. క్వెరీలో ప్రతి పదం ఏదో ఒక పదానికి
+# ప్రిఫిక్స్ అయితే చాలు (bisect తో పరిధి). ఒక్కో కీస్ట్రోక్ కి లిస్ట్ మొత్తం మళ్ళీ చదవాల్సిన అవసరం లేదు.
+_SEARCH_SPLIT = re.compile(r"[\s!-/:-@\[-`{-~]+")
+_LATIN_ACCENTS = re.compile("[\u0300-\u036f]")
+
+def search_tokens(text):
+    """ చిన్న అక్షరాలు, లాటిన్ యాక్సెంట్లు లేకుండా పదాలు - తెలుగు గుణింతాలు విడిపోవు (\\w వాటిని విడగొడుతుంది) """
+    text = _LATIN_ACCENTS.sub('', unicodedata.normalize('NFKD', text.casefold()))
+    return [tok for tok in _SEARCH_SPLIT.split(text) if tok]
+
+
+class SearchIndex:
+    def __init__(self):
+        self.vocab = []         # సార్ట్ చేసిన ప్రత్యేక పదాలు
+        self.postings = []      # vocab కి సమాంతరంగా: ఆ పదం ఉన్న ఎంట్రీల ఐడీలు (array 'I')
+        self.size = 0
+
+    def build(self, entries):
+        """ entries: ప్రతి ఎంట్రీకి టెక్స్ట్ ఫీల్డ్ ల tuple; ఐడీ = దాని క్రమ సంఖ్య """
+        words = {}
+        size = 0
+        for i, fields in enumerate(entries):
+            size = i + 1
+            for tok in set(search_tokens(" ".join(field for field in fields if field))):
+                ids = words.get(tok)
+                if ids is None: words[tok] = ids = array('I')
+                ids.append(i)
+        self.vocab = sorted(words)
+        self.postings = [words[word] for word in self.vocab]
+        self.size = size
+
+    def _prefix_ids(self, prefix):
+        lo = bisect_left(self.vocab, prefix)
+        hi = bisect_left(self.vocab, prefix + "\U0010ffff", lo)
+        if hi - lo == 1: return set(self.postings[lo])
+        ids = set()
+        for posting in self.postings[lo:hi]: ids.update(posting)
+        return ids
+
+    def search(self, query):
+        """ సరిపోయిన ఐడీలు లిస్ట్ ఆర్డర్ లో; క్వెరీ ఖాళీ అయితే None """
+        tokens = search_tokens(query)
+        if not tokens: return None
+        # పొడవైన పదం తక్కువ ఫలితాలు ఇస్తుంది - దాంతో మొదలుపెడితే ఇంటర్ సెక్షన్ చిన్నగా ఉంటుంది
+        tokens.sort(key=len, reverse=True)
+        ids = None
+        for tok in tokens:
+            found = self._prefix_ids(tok)
+            ids = found if ids is None else ids & found
+            if not ids: return []
+        return sorted(ids)
+
+
+class SearchIndexBuilder(BackgroundTask):
+    """ 100k పాటలకి ఇండెక్స్ కట్టడానికి సెకను దాకా పడుతుంది - UI థ్రెడ్ లో కాకుండా ఇక్కడ """
+    thread_name = "vault-search"
+
+    def _run(self, store, rows):
+        index = SearchIndex()
+        index.build(store.search_fields(row) for row in rows)
+        self._post(self.on_done, index)
+
+# --- PLAY QUEUE ---
+# path -> స్థానం ఇండెక్స్ తో O(1) next / prev. shuffle అంటే ముందే కలిపిన ఒక permutation (seed నుండి మళ్ళీ కట్టొచ్చు),
+# "play next" కోసం up_next, పరిమిత హిస్టరీ. state() / restore() తో రీస్టార్ట్ తర్వాత కూడా క్యూ కొనసాగుతుంది.
+class PlayQueue:
+    REPEAT_MODES = ('off', 'all', 'one')
+    HISTORY_LIMIT = 100
+
+    def __init__(self):
+        self.paths = []         # లిస్ట్ లో కనిపించే ఆర్డర్
+        self.index = {}         # path -> paths లో స్థానం
+        self.order = None       # shuffle ఆన్ అయితే paths స్థానాల permutation
+        self.order_pos = None   # paths స్థానం -> order లో స్థానం
+        self.keys = None        # paths స్థానం -> shuffle_key (extend / rename లో మళ్ళీ హ్యాష్ చేయకుండా)
+        self.order_keys = None  # order తో సమాంతరంగా keys - కొత్త పాటల స్థానం bisect తో
+        self.anchored = False   # order[0] anchor పాటేనా
+        self.cursor = -1        # ప్లే ఆర్డర్ లో ప్రస్తుత స్థానం
+        self.current = None
+        self.up_next = deque()
+        self.history = deque(maxlen=self.HISTORY_LIMIT)
+        self.shuffle = False
+        self.repeat = 'off'
+        self.seed = 0
+        self.anchor = None      # shuffle ఆన్ చేసినప్పుడు ప్లే అవుతున్న పాట - permutation లో మొదటిది
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __contains__(self, path):
+        return path in self.index
+
+    def set_tracks(self, paths):
+        """ లైబ్రరీ ఆర్డర్ మారినప్పుడు ఇండెక్స్ ని మళ్ళీ కడుతుంది; ప్రస్తుత పాట స్థానం నిలుస్తుంది """
+        self.paths = list(paths)
+        self.index = {path: i for i, path in enumerate(self.paths)}
+        self.up_next = deque(path for path in self.up_next if path in self.index)
+        if self.shuffle: self._build_order()
+        self._sync_cursor()
+
+    def extend(self, paths):
+        """ స్కాన్ లో కొత్తగా దొరికినవి లిస్ట్ చివర్లో; shuffle లో seed ఇచ్చిన స్థానాల్లో (రీలాంచ్ తర్వాత కూడా అదే ఆర్డర్) """
+        start = len(self.paths)
+        for path in paths:
+            if path in self.index: continue
+            self.index[path] = len(self.paths)
+            self.paths.append(path)
+        if self.order is None or len(self.paths) == start: return
+        if not self.anchored and self.anchor in self.index and self.index[self.anchor] >= start:
+            # anchor ఇప్పుడే వచ్చింది - రీలాంచ్ లో లాగే అది మొదట ఉండాలి
+            self._build_order()
+        else:
+            # కొత్తవాటి keys మాత్రమే; ఒక్కోటి sorted order లో bisect తో, order_pos మారిన చోటు నుండే
+            lo = 1 if self.anchored else 0
+            low = len(self.order)
+            for i in range(start, len(self.paths)):
+                key = self.shuffle_key(self.seed, self.paths[i])
+                self.keys.append(key)
+                pos = bisect_right(self.order_keys, key, lo)
+                self.order.insert(pos, i)
+                self.order_keys.insert(pos, key)
+                low = min(low, pos)
+            self.order_pos.extend([0] * (len(self.paths) - start))
+            self._patch_positions(low, len(self.order))
+        self._sync_cursor()
+
+    def rename(self, old, new):
+        """ ఫైల్ move / rename అయినా క్యూ స్థానం, up next, history నిలుస్తాయి """
+        i = self.index.pop(old, None)
+        if i is not None:
+            self.paths[i] = new
+            self.index[new] = i
+        if self.current == old: self.current = new
+        if self.anchor == old: self.anchor = new
+        # shuffle ఆర్డర్ path మీద ఆధారపడుతుంది - రీలాంచ్ లో వచ్చే స్థానానికి ఆ ఒక్క పాటనే జరుపుతాం
+        if i is not None and self.order is not None:
+            key = self.keys[i] = self.shuffle_key(self.seed, new)
+            old_pos = self.order_pos[i]
+            if self.anchored and old_pos == 0:
+                self.order_keys[0] = key
+            else:
+                del self.order[old_pos]
+                del self.order_keys[old_pos]
+                pos = bisect_right(self.order_keys, key, 1 if self.anchored else 0)
+                self.order.insert(pos, i)
+                self.order_keys.insert(pos, key)
+                self._patch_positions(min(old_pos, pos), max(old_pos, pos) + 1)
+            self._sync_cursor()
+        self.up_next = deque(new if path == old else path for path in self.up_next)
+        self.history = deque((new if path == old else path for path in self.history), maxlen=self.HISTORY_LIMIT)
+
+    @staticmethod
+    def shuffle_key(seed, path):
+        return hashlib.blake2b(f"{seed}|{path}".encode("utf-8"), digest_size=8).digest()
+
+    def _build_order(self):
+        # ఆర్డర్ seed + path ల మీదే ఆధారపడుతుంది - లిస్ట్ లో స్థానాలు, స్కాన్ బ్యాచ్ లు ఏ క్రమంలో వచ్చాయన్నది కాదు.
+        # కాబట్టి restore లో seed తో అదే permutation మళ్ళీ వస్తుంది
+        keys = [self.shuffle_key(self.seed, path) for path in self.paths]
+        order = sorted(range(len(self.paths)), key=keys.__getitem__)
+        first = self.index.get(self.anchor)
+        if first is not None:
+            order.remove(first)
+            order.insert(0, first)
+        self.order, self.keys, self.anchored = order, keys, first is not None
+        self.order_keys = [keys[i] for i in order]
+        self.order_pos = [0] * len(order)
+        self._patch_positions(0, len(order))
+
+    def _patch_positions(self, start, stop):
+        order, positions = self.order, self.order_pos
+        for pos in range(start, stop): positions[order[pos]] = pos
+
+    def _sync_cursor(self):
+        i = self.index.get(self.current)
+        if i is not None: self.cursor = self._pos(i)
+        elif self.cursor >= len(self.paths): self.cursor = -1
+
+    def _pos(self, i):
+        return i if self.order is None else self.order_pos[i]
+
+    def _at(self, pos):
+        return self.paths[pos if self.order is None else self.order[pos]]
+
+    def _set_current(self, path, remember=True):
+        if remember and self.current is not None and self.current != path:
+            self.history.append(self.current)
+        self.current = path
+        i = self.index.get(path)
+        if i is not None: self.cursor = self._pos(i)
+
+    def jump(self, path, remember=True):
+        """ యూజర్ లిస్ట్ లో నొక్కిన పాట """
+        self._set_current(path, remember)
+
+    def peek_next(self, auto=True):
+        """ advance(auto) ఏ పాట ఇస్తుందో - క్యూ ని మార్చకుండా (గ్యాప్ లెస్ ప్రీలోడ్ కోసం) """
+        if auto and self.repeat == 'one' and self.current is not None: return self.current
+        if self.up_next: return self.up_next[0]
+        pos = self._next_pos(auto)
+        return None if pos is None else self._at(pos)
+
+    def _next_pos(self, auto):
+        if not self.paths: return None
+        pos = self.cursor + 1
+        if pos >= len(self.paths):
+            if auto and self.repeat == 'off': return None
+            pos = 0
+        return pos
+
+    def advance(self, auto=False):
+        """ తర్వాతి పాట. auto=True అంటే పాట అయిపోయి వచ్చింది - repeat నియమాలు అప్పుడే వర్తిస్తాయి """
+        if auto and self.repeat == 'one' and self.current is not None: return self.current
+        if self.up_next:
+            # up_next పాట తర్వాత లైబ్రరీ ఆర్డర్ ఆగిన చోటు నుండే కొనసాగుతుంది
+            path = self.up_next.popleft()
+            if self.current is not None: self.history.append(self.current)
+            self.current = path
+            return path
+        pos = self._next_pos(auto)
+        if pos is None: return None
+        if self.current is not None: self.history.append(self.current)
+        self.cursor = pos
+        self.current = self._at(pos)
+        return self.current
+
+    def retreat(self):
+        """ వెనక్కి: ముందు హిస్టరీ, అది ఖాళీ అయితే ప్లే ఆర్డర్ లో ముందు పాట """
+        if self.history:
+            path = self.history.pop()
+        elif self.paths:
+            path = self._at((self.cursor - 1) % len(self.paths))
+        else:
+            return None
+        self._set_current(path, remember=False)
+        return path
+
+    def add_next(self, path):
+        """ "Play next" - ఇప్పుడున్న పాట తర్వాత వెంటనే """
+        self.up_next.appendleft(path)
+
+    def set_shuffle(self, state):
+        self.shuffle = bool(state)
+        if self.shuffle:
+            self.seed = random.randrange(1 << 30)
+            self.anchor = self.current
+            self._build_order()
+        else:
+            self.order = self.order_pos = self.keys = self.order_keys = None
+            self.anchor = None
+            self.anchored = False
+        self._sync_cursor()
+
+    def cycle_repeat(self):
+        modes = self.REPEAT_MODES
+        self.repeat = modes[(modes.index(self.repeat) + 1) % len(modes)]
+        return self.repeat
+
+    def state(self):
+        """ సెట్టింగ్స్ స్టోర్ లో దాచేది - permutation కాదు, seed మాత్రమే """
+        return {'current': self.current, 'shuffle': self.shuffle, 'repeat': self.repeat,
+                'seed': self.seed, 'anchor': self.anchor,
+                'up_next': list(self.up_next), 'history': list(self.history)}
+
+    def restore(self, state):
+        self.current = state.get('current')
+        self.shuffle = bool(state.get('shuffle', False))
+        self.repeat = state.get('repeat', 'off') if state.get('repeat') in self.REPEAT_MODES else 'off'
+        self.seed = int(state.get('seed', 0))
+        self.anchor = state.get('anchor')
+        self.up_next = deque(state.get('up_next') or [])
+        self.history = deque(state.get('history') or [], maxlen=self.HISTORY_LIMIT)
+        if self.paths: self.set_tracks(self.paths)
+
+# --- SETTINGS & PLAYBACK STATE (WRITE-BEHIND) ---
+# JsonStore ప్రతి put కి ఫైల్ మొత్తం మళ్ళీ రాస్తుంది. ఇక్కడ అన్నీ మెమరీ లో; మార్పులు టైమర్ లో ఒకే రైట్ గా కలుస్తాయి.
+# put = సెట్టింగ్స్ (FLUSH_DELAY లో), put_lazy = ప్లే పొజిషన్ లాంటి తరచూ మారే స్టేట్ (LAZY_DELAY లో) - on_pause / on_stop లో వెంటనే flush.
+# రైట్: tmp ఫైల్ -> fsync -> rename, కాబట్టి మధ్యలో యాప్ చనిపోయినా పాత ఫైల్ లేదా కొత్తది - సగం ఫైల్ ఉండదు.
+# ఫైల్ ఫార్మాట్ JsonStore దే ({key: {...}}) - పాత vault_secrets.json అలాగే చదువుతాం.
+class SettingsStore:
+    FLUSH_DELAY = 2.0   # సెకన్లు
+    LAZY_DELAY = 30.0
+
+    def __init__(self, path, flush_delay=FLUSH_DELAY, lazy_delay=LAZY_DELAY):
+        self.path = os.path.abspath(path)
+        self.flush_delay = flush_delay
+        self.lazy_delay = lazy_delay
+        self.data = {}
+        self.writes = 0
+        self._dirty = False
+        self._event = None
+        self._due = None
+        self._seq = 0               # ఎన్నో flush - పాత స్నాప్ షాట్ కొత్తదాని మీద రాయకుండా
+        self._written_seq = 0
+        self._write_lock = threading.Lock()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict): self.data = data
+        except FileNotFoundError: pass
+        except Exception as e:
+            print(f"Settings Error: {str(e)}")
+
+    def exists(self, key):
+        return key in self.data
+
+    def get(self, key):
+        return self.data[key]
+
+    def put(self, key, **values):
+        self._set(key, values, self.flush_delay)
+
+    def put_lazy(self, key, **values):
+        self._set(key, values, self.lazy_delay)
+
+    def delete(self, key):
+        if self.data.pop(key, None) is not None: self._schedule(self.flush_delay)
+
+    def _set(self, key, values, delay):
+        if self.data.get(key) == values: return   # మార్పు లేదు - రైట్ అక్కర్లేదు
+        self.data[key] = values
+        self._schedule(delay)
+
+    def _schedule(self, delay):
+        self._dirty = True
+        due = time.monotonic() + delay
+        if self._event is not None:
+            if self._due <= due: return   # ఇంతకంటే ముందే రాయబోతున్నాం
+            self._event.cancel()
+        self._due = due
+        self._event = Clock.schedule_once(lambda dt: self.flush(background=True), delay)
+
+    def flush(self, background=False):
+        """ మార్పులు ఉంటే రాస్తుంది; background=True అయితే ఫైల్ I/O వర్కర్ థ్రెడ్ లో. రాయాల్సి వస్తే True """
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+        if not self._dirty: return False
+        self._dirty = False
+        self._seq += 1
+        # స్నాప్ షాట్ మెయిన్ థ్రెడ్ లోనే - తర్వాత వచ్చే put లు దీన్ని మార్చవు
+        payload = json.dumps(self.data, ensure_ascii=False)
+        if background:
+            threading.Thread(target=self._write, args=(payload, self._seq), name="vault-settings", daemon=True).start()
+        else:
+            self._write(payload, self._seq)
+        return True
+
+    def _write(self, payload, seq):
+        with self._write_lock:
+            if seq <= self._written_seq: return
+            tmp = self.path + ".tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+                self._written_seq = seq
+                self.writes += 1
+            except Exception as e:
+                print(f"Settings Error: {str(e)}")
+
 # --- 3. COMPLETE UI ARCHITECTURE (KV LANG) ---
 KV = '''
 #:import NoTransition kivy.uix.screenmanager.NoTransition
@@ -233,6 +2918,72 @@ KV = '''
         icon: "music-circle"
         theme_text_color: "Custom"
         text_color: [1, 0.8, 0, 1]
+    IconRightWidget:
+        icon: "playlist-plus"
+        theme_text_color: "Custom"
+        text_color: [1, 1, 1, 0.6]
+        on_release: app.queue_play_next(root.path)
+
+# ఆల్బమ్ / ఆర్టిస్ట్ గ్రూప్ హెడర్
+<SongGroupHeader@MDLabel>:
+    bold: True
+    font_style: "Subtitle2"
+    theme_text_color: "Custom"
+    text_color: [1, 0.8, 0, 1]
+    padding: ["16dp", "8dp"]
+    valign: "bottom"
+
+# వీడియో లిస్ట్ ఐటమ్ - పోస్టర్ ఇంకా రాకపోతే ఐకాన్ కనిపిస్తుంది
+<VideoListItem@ButtonBehavior+MDBoxLayout>:
+    path: ""
+    title: ""
+    info: ""
+    poster: ""
+    size_hint_y: None
+    height: "84dp"
+    padding: ["14dp", "6dp"]
+    spacing: "14dp"
+    on_release: app.play_video(root.path)
+    MDFloatLayout:
+        size_hint_x: None
+        width: "128dp"
+        md_bg_color: [1, 1, 1, 0.08]
+        MDIcon:
+            icon: "movie-open-outline"
+            halign: "center"
+            theme_text_color: "Custom"
+            text_color: [0.4, 0.9, 0.4, 0.6]
+            pos_hint: {"center_x": .5, "center_y": .5}
+        AsyncImage:
+            source: root.poster
+            opacity: 1 if root.poster else 0
+            fit_mode: "cover"
+            pos_hint: {"x": 0, "y": 0}
+    MDBoxLayout:
+        orientation: 'vertical'
+        MDLabel:
+            text: root.title
+            bold: True
+            shorten: True
+            theme_text_color: "Custom"
+            text_color: [1, 1, 1, 1]
+            font_style: "Subtitle1"
+        MDLabel:
+            text: root.info
+            shorten: True
+            font_style: "Caption"
+            theme_text_color: "Custom"
+            text_color: [1, 1, 1, 0.7]
+
+# గ్యాలరీ టైల్ - థంబ్ నెయిల్ వచ్చే వరకు ఖాళీ రంగు
+<GalleryTile>:
+    canvas:
+        Color:
+            rgba: [1, 1, 1, 1] if self.texture else [1, 1, 1, 0.08]
+        Rectangle:
+            pos: self.pos
+            size: self.size
+            texture: self.texture
 
 # స్క్రీన్ మేనేజర్
 ScreenManager:
@@ -244,7 +2995,7 @@ ScreenManager:
         MDFloatLayout:
             md_bg_color: [0, 0, 0, 1] 
             FitImage:
-                source: app.wallpaper_path
+                source: app.wallpaper
                 opacity: 0.88
                 allow_stretch: True
                 keep_ratio: False
@@ -293,321 +3044,572 @@ ScreenManager:
                     font_size: "16sp"
                     on_release: app.show_forgot_pin_dialog()
 
-            MDLabel:
-                text: "AUTHENTICATION REQUIRED"
-                halign: "center"
-                font_style: "Caption"
-                bold: True
-                theme_text_color: "Custom"
-                text_color: [1, 1, 1, 0.55]
-                pos_hint: {"center_x": 0.5, "center_y": 0.30}
+            MDLabel:
+                text: "AUTHENTICATION REQUIRED"
+                halign: "center"
+                font_style: "Caption"
+                bold: True
+                theme_text_color: "Custom"
+                text_color: [1, 1, 1, 0.55]
+                pos_hint: {"center_x": 0.5, "center_y": 0.30}
+
+            # Version Tag
+            MDLabel:
+                text: "v3.5 (Ultra Max)"
+                halign: "center"
+                font_style: "Overline"
+                theme_text_color: "Custom"
+                text_color: [1, 1, 1, 0.3]
+                pos_hint: {"center_x": 0.5, "bottom": 1}
+                padding: [0, 20]
+'''
+
+# మెయిన్ స్క్రీన్ (ట్యాబ్ లు + మినీ ప్లేయర్) - లాక్ స్క్రీన్ మొదటి ఫ్రేమ్ తర్వాత ఖాళీ ఫ్రేమ్ లో కడతాం
+MAIN_SCREEN_KV = '''
+# --- MAIN SCREEN ---
+Screen:
+    name: 'main'
+    MDFloatLayout:
+        md_bg_color: [0.04, 0.04, 0.04, 0.6]
+
+        MDBottomNavigation:
+            panel_color: [0.08, 0.08, 0.08, 0.98]
+            text_color_active: [1, 0.8, 0, 1]
+
+            # --- HOME TAB ---
+            MDBottomNavigationItem:
+                name: 'screen_home'
+                text: 'Home'
+                icon: 'home-variant'
+                MDFloatLayout:
+                    FitImage:
+                        source: app.wallpaper
+                        opacity: 0.75
+                        allow_stretch: True
+                        keep_ratio: False
+
+                    MDBoxLayout:
+                        orientation: 'vertical'
+                        padding: "24dp"
+                        spacing: "28dp"
+
+                        MDBoxLayout:
+                            orientation: 'horizontal'
+                            adaptive_height: True
+                            spacing: "10dp"
+                            MDLabel:
+                                text: "Welcome back,"
+                                font_style: "H4"
+                                bold: True
+                                theme_text_color: "Custom"
+                                text_color: [1, 1, 1, 1]
+                                adaptive_size: True
+                            MDIcon:
+                                icon: "emoticon-happy-outline"
+                                theme_text_color: "Custom"
+                                text_color: [1, 0.8, 0, 1]
+                                font_size: "40sp"
+                                size_hint: None, None
+                                size: "44dp", "44dp"
+                                pos_hint: {"center_y": .5}
+                            MDLabel:
+                                text: "Prasad"
+                                font_style: "H4"
+                                bold: True
+                                theme_text_color: "Custom"
+                                text_color: [1, 1, 1, 1]
+                                adaptive_height: True
+
+                        MDLabel:
+                            text: "PERSONAL LIBRARIES"
+                            font_style: "Overline"
+                            theme_text_color: "Custom"
+                            text_color: [1, 0.8, 0, 1]
+                            adaptive_height: True
+
+                        MDGridLayout:
+                            cols: 2
+                            spacing: "24dp"
+                            size_hint_y: None
+                            height: self.minimum_height
+
+                            # Folder 1: Gallery
+                            FolderItem:
+                                icon: "image-multiple-outline"
+                                text: "Gallery"
+                                icon_color: [0.2, 0.8, 1, 1]
+                                on_release: app.open_gallery()
+
+                            # Folder 2: Music
+                            FolderItem:
+                                icon: "music-box-outline"
+                                text: "Music"
+                                icon_color: [1, 0.4, 0.4, 1]
+                                on_release: app.file_manager_open()
+
+                            # Folder 3: Movies
+                            FolderItem:
+                                icon: "movie-play-outline"
+                                text: "Movies"
+                                icon_color: [0.4, 0.9, 0.4, 1]
+                                on_release: app.open_videos()
+
+                            # Folder 4: Documents (Fixed Icon)
+                            FolderItem:
+                                icon: "file-document-multiple-outline"
+                                text: "Documents"
+                                icon_color: [1, 0.8, 0.2, 1]
+                                on_release: app.file_manager_docs_open()
+
+                        MDLabel:
+                            text: "" 
+
+            # --- MUSIC TAB ---
+            MDBottomNavigationItem:
+                name: 'screen_music'
+                text: 'Music'
+                icon: 'music'
+                on_tab_press: app.scan_music(auto=True)
+                MDFloatLayout:
+                    FitImage:
+                        source: app.wallpaper
+                        opacity: 0.55
+                        allow_stretch: True
+                        keep_ratio: False
+
+                    MDBoxLayout:
+                        orientation: 'vertical'
 
-            # Version Tag
-            MDLabel:
-                text: "v3.5 (Ultra Max)"
-                halign: "center"
-                font_style: "Overline"
-                theme_text_color: "Custom"
-                text_color: [1, 1, 1, 0.3]
-                pos_hint: {"center_x": 0.5, "bottom": 1}
-                padding: [0, 20]
+                        # Header with Scan Button
+                        MDBoxLayout:
+                            size_hint_y: None
+                            height: "75dp"
+                            padding: "15dp"
+                            spacing: "15dp"
+                            md_bg_color: [0, 0, 0, 0.4]
 
-    # --- MAIN SCREEN ---
-    Screen:
-        name: 'main'
-        MDFloatLayout:
-            md_bg_color: [0.04, 0.04, 0.04, 0.6]
-
-            MDBottomNavigation:
-                panel_color: [0.08, 0.08, 0.08, 0.98]
-                text_color_active: [1, 0.8, 0, 1]
-
-                # --- HOME TAB ---
-                MDBottomNavigationItem:
-                    name: 'screen_home'
-                    text: 'Home'
-                    icon: 'home-variant'
-                    MDFloatLayout:
-                        FitImage:
-                            source: app.wallpaper_path
-                            opacity: 0.75
-                            allow_stretch: True
-                            keep_ratio: False
-                        
+                            MDLabel:
+                                text: app.scan_status or "Your Tracks"
+                                font_style: "H5"
+                                bold: True
+                                theme_text_color: "Custom"
+                                text_color: [1, 1, 1, 1]
+                                pos_hint: {"center_y": 0.5}
+
+                            MDRaisedButton:
+                                text: "STOP SCAN" if app.is_scanning else "SCAN DEVICE"
+                                icon: "refresh"
+                                pos_hint: {"center_y": 0.5}
+                                md_bg_color: [1, 0.8, 0, 1]
+                                text_color: [0, 0, 0, 1]
+                                elevation: 6
+                                on_release: app.cancel_scan() if app.is_scanning else app.scan_music()
+
+                            MDIconButton:
+                                icon: "sort"
+                                theme_text_color: "Custom"
+                                text_color: [1, 1, 1, 1]
+                                pos_hint: {"center_y": 0.5}
+                                on_release: app.cycle_sort_mode()
+
+                            MDIconButton:
+                                icon: "folder-music"
+                                theme_text_color: "Custom"
+                                text_color: [1, 1, 1, 1]
+                                pos_hint: {"center_y": 0.5}
+                                on_release: app.file_manager_open()
+
+                        # Search
                         MDBoxLayout:
-                            orientation: 'vertical'
-                            padding: "24dp"
-                            spacing: "28dp"
-                            
+                            size_hint_y: None
+                            height: "62dp"
+                            padding: ["15dp", "0dp", "15dp", "6dp"]
+                            md_bg_color: [0, 0, 0, 0.4]
+                            MDTextField:
+                                hint_text: "Search title, artist, album or folder"
+                                mode: "fill"
+                                icon_left: "magnify"
+                                fill_color_normal: [1, 1, 1, 0.12]
+                                text_color_normal: [1, 1, 1, 1]
+                                line_color_focus: [1, 0.8, 0, 1]
+                                on_text: app.search_music(self.text)
+
+                        RecycleView:
+                            viewclass: 'SongListItem'
+                            key_viewclass: 'viewclass'
+                            data_model: app.track_model
+                            RecycleBoxLayout:
+                                default_size: None, dp(78)
+                                default_size_hint: 1, None
+                                size_hint_y: None
+                                height: self.minimum_height
+                                orientation: 'vertical'
+                                padding: "14dp"
+
+            # --- SETTINGS TAB ---
+            MDBottomNavigationItem:
+                name: 'screen_settings'
+                text: 'Settings'
+                icon: 'equalizer'
+                MDFloatLayout:
+                    FitImage:
+                        source: app.wallpaper
+                        opacity: 0.55
+                        allow_stretch: True
+                        keep_ratio: False
+
+                    MDBoxLayout:
+                        orientation: 'vertical'
+                        padding: "24dp"
+                        spacing: "20dp"
+                        MDLabel:
+                            text: "Professional Audio Engine"
+                            font_style: "H4"
+                            bold: True
+                            theme_text_color: "Custom"
+                            text_color: [1, 1, 1, 1]
+                            adaptive_height: True
+
+                        GlassCard:
+                            size_hint_y: None
+                            height: "110dp"
+                            orientation: 'horizontal'
+                            padding: "20dp"
+                            on_release: app.open_system_settings()
+                            MDIcon:
+                                icon: "dolby"
+                                theme_text_color: "Custom"
+                                text_color: [1, 1, 1, 1]
+                                font_size: "38sp"
+                                pos_hint: {"center_y": .5}
                             MDBoxLayout:
-                                orientation: 'horizontal'
-                                adaptive_height: True
-                                spacing: "10dp"
+                                orientation: 'vertical'
+                                padding: [18, 0]
                                 MDLabel:
-                                    text: "Welcome back,"
-                                    font_style: "H4"
+                                    text: "Native Dolby Atmos"
                                     bold: True
                                     theme_text_color: "Custom"
                                     text_color: [1, 1, 1, 1]
-                                    adaptive_size: True
-                                MDIcon:
-                                    icon: "emoticon-happy-outline"
+                                MDLabel:
+                                    text: "Advanced system sound setting"
+                                    font_style: "Caption"
                                     theme_text_color: "Custom"
-                                    text_color: [1, 0.8, 0, 1]
-                                    font_size: "40sp"
-                                    size_hint: None, None
-                                    size: "44dp", "44dp"
-                                    pos_hint: {"center_y": .5}
+                                    text_color: [1, 1, 1, 0.5]
+
+                        GlassCard:
+                            size_hint_y: None
+                            height: "110dp"
+                            orientation: 'horizontal'
+                            padding: "20dp"
+                            MDIcon:
+                                icon: "surround-sound-7-1"
+                                theme_text_color: "Custom"
+                                text_color: [1, 1, 1, 1]
+                                font_size: "38sp"
+                                pos_hint: {"center_y": .5}
+                            MDBoxLayout:
+                                orientation: 'vertical'
+                                padding: [18, 0]
                                 MDLabel:
-                                    text: "Prasad"
-                                    font_style: "H4"
+                                    text: "Spatial Audio (9.1)"
                                     bold: True
                                     theme_text_color: "Custom"
                                     text_color: [1, 1, 1, 1]
-                                    adaptive_height: True
+                                MDLabel:
+                                    text: "Hardware layer virtualizer"
+                                    font_style: "Caption"
+                                    theme_text_color: "Custom"
+                                    text_color: [1, 1, 1, 0.5]
+                            MDSwitch:
+                                active: app.spatial_audio
+                                on_active: app.toggle_surround(*args)
+                                pos_hint: {"center_y": .5}
 
-                            MDLabel:
-                                text: "PERSONAL LIBRARIES"
-                                font_style: "Overline"
+                        GlassCard:
+                            size_hint_y: None
+                            height: "110dp"
+                            orientation: 'horizontal'
+                            padding: "20dp"
+                            on_release: app.show_scan_settings_dialog()
+                            MDIcon:
+                                icon: "folder-search-outline"
                                 theme_text_color: "Custom"
-                                text_color: [1, 0.8, 0, 1]
-                                adaptive_height: True
-
-                            MDGridLayout:
-                                cols: 2
-                                spacing: "24dp"
-                                size_hint_y: None
-                                height: self.minimum_height
-                                
-                                # Folder 1: Gallery
-                                FolderItem:
-                                    icon: "image-multiple-outline"
-                                    text: "Gallery"
-                                    icon_color: [0.2, 0.8, 1, 1]
-                                    on_release: app.file_manager_gallery_open()
-                                
-                                # Folder 2: Music
-                                FolderItem:
-                                    icon: "music-box-outline"
-                                    text: "Music"
-                                    icon_color: [1, 0.4, 0.4, 1]
-                                    on_release: app.file_manager_open()
-                                
-                                # Folder 3: Movies
-                                FolderItem:
-                                    icon: "movie-play-outline"
-                                    text: "Movies"
-                                    icon_color: [0.4, 0.9, 0.4, 1]
-                                    on_release: app.file_manager_video_open()
-                                
-                                # Folder 4: Documents (Fixed Icon)
-                                FolderItem:
-                                    icon: "file-document-multiple-outline"
-                                    text: "Documents"
-                                    icon_color: [1, 0.8, 0.2, 1]
-                                    on_release: app.file_manager_docs_open()
-                            
-                            MDLabel:
-                                text: "" 
-
-                # --- MUSIC TAB ---
-                MDBottomNavigationItem:
-                    name: 'screen_music'
-                    text: 'Music'
-                    icon: 'music'
-                    on_tab_press: app.scan_music()
-                    MDFloatLayout:
-                        FitImage:
-                            source: app.wallpaper_path
-                            opacity: 0.55
-                            allow_stretch: True
-                            keep_ratio: False
-                        
-                        MDBoxLayout:
-                            orientation: 'vertical'
-                            
-                            # Header with Scan Button
+                                text_color: [1, 1, 1, 1]
+                                font_size: "38sp"
+                                pos_hint: {"center_y": .5}
                             MDBoxLayout:
-                                size_hint_y: None
-                                height: "75dp"
-                                padding: "15dp"
-                                spacing: "15dp"
-                                md_bg_color: [0, 0, 0, 0.4]
-                                
+                                orientation: 'vertical'
+                                padding: [18, 0]
                                 MDLabel:
-                                    text: "Your Tracks"
-                                    font_style: "H5"
+                                    text: "Scan Folders"
                                     bold: True
                                     theme_text_color: "Custom"
                                     text_color: [1, 1, 1, 1]
-                                    pos_hint: {"center_y": 0.5}
-                                    
-                                MDRaisedButton:
-                                    text: "SCAN DEVICE"
-                                    icon: "refresh"
-                                    pos_hint: {"center_y": 0.5}
-                                    md_bg_color: [1, 0.8, 0, 1]
-                                    text_color: [0, 0, 0, 1]
-                                    elevation: 6
-                                    on_release: app.scan_music()
-                                    
-                                MDIconButton:
-                                    icon: "folder-music"
+                                MDLabel:
+                                    text: "Music roots, skipped folders & depth"
+                                    font_style: "Caption"
                                     theme_text_color: "Custom"
-                                    text_color: [1, 1, 1, 1]
-                                    pos_hint: {"center_y": 0.5}
-                                    on_release: app.file_manager_open()
-
-                            RecycleView:
-                                viewclass: 'SongListItem'
-                                data: app.music_list_data
-                                RecycleBoxLayout:
-                                    default_size: None, dp(78)
-                                    default_size_hint: 1, None
-                                    size_hint_y: None
-                                    height: self.minimum_height
-                                    orientation: 'vertical'
-                                    padding: "14dp"
-
-                # --- SETTINGS TAB ---
-                MDBottomNavigationItem:
-                    name: 'screen_settings'
-                    text: 'Settings'
-                    icon: 'equalizer'
-                    MDFloatLayout:
-                        FitImage:
-                            source: app.wallpaper_path
-                            opacity: 0.55
-                            allow_stretch: True
-                            keep_ratio: False
-                        
-                        MDBoxLayout:
-                            orientation: 'vertical'
-                            padding: "24dp"
-                            spacing: "20dp"
-                            MDLabel:
-                                text: "Professional Audio Engine"
-                                font_style: "H4"
-                                bold: True
+                                    text_color: [1, 1, 1, 0.5]
+
+                        GlassCard:
+                            size_hint_y: None
+                            height: "110dp"
+                            orientation: 'horizontal'
+                            padding: "20dp"
+                            on_release: app.export_metrics()
+                            MDIcon:
+                                icon: "speedometer"
                                 theme_text_color: "Custom"
                                 text_color: [1, 1, 1, 1]
-                                adaptive_height: True
-                            
-                            GlassCard:
-                                size_hint_y: None
-                                height: "110dp"
-                                orientation: 'horizontal'
-                                padding: "20dp"
-                                on_release: app.open_system_settings()
-                                MDIcon:
-                                    icon: "dolby"
+                                font_size: "38sp"
+                                pos_hint: {"center_y": .5}
+                            MDBoxLayout:
+                                orientation: 'vertical'
+                                padding: [18, 0]
+                                MDLabel:
+                                    text: "Performance Overlay"
+                                    bold: True
                                     theme_text_color: "Custom"
                                     text_color: [1, 1, 1, 1]
-                                    font_size: "38sp"
-                                    pos_hint: {"center_y": .5}
-                                MDBoxLayout:
-                                    orientation: 'vertical'
-                                    padding: [18, 0]
-                                    MDLabel:
-                                        text: "Native Dolby Atmos"
-                                        bold: True
-                                        theme_text_color: "Custom"
-                                        text_color: [1, 1, 1, 1]
-                                    MDLabel:
-                                        text: "Advanced system sound setting"
-                                        font_style: "Caption"
-                                        theme_text_color: "Custom"
-                                        text_color: [1, 1, 1, 0.5]
-                            
-                            GlassCard:
-                                size_hint_y: None
-                                height: "110dp"
-                                orientation: 'horizontal'
-                                padding: "20dp"
-                                MDIcon:
-                                    icon: "surround-sound-7-1"
+                                MDLabel:
+                                    text: "Frame times & timings - tap to export metrics.json"
+                                    font_style: "Caption"
                                     theme_text_color: "Custom"
-                                    text_color: [1, 1, 1, 1]
-                                    font_size: "38sp"
-                                    pos_hint: {"center_y": .5}
-                                MDBoxLayout:
-                                    orientation: 'vertical'
-                                    padding: [18, 0]
-                                    MDLabel:
-                                        text: "Spatial Audio (9.1)"
-                                        bold: True
-                                        theme_text_color: "Custom"
-                                        text_color: [1, 1, 1, 1]
-                                    MDLabel:
-                                        text: "Hardware layer virtualizer"
-                                        font_style: "Caption"
-                                        theme_text_color: "Custom"
-                                        text_color: [1, 1, 1, 0.5]
-                                MDSwitch:
-                                    active: False
-                                    on_active: app.toggle_surround(*args)
-                                    pos_hint: {"center_y": .5}
-                            MDLabel:
-                                text: "" 
-
-            # MINI PLAYER
-            MDCard:
-                size_hint: (0.96, None)
-                height: "82dp"
-                pos_hint: {"center_x": 0.5, "y": 0.1} 
-                radius: [20,]
-                md_bg_color: [0.12, 0.12, 0.12, 0.96]
-                elevation: 8
-                opacity: app.mini_player_opacity
-                on_release: app.open_full_player()
-                MDBoxLayout:
-                    padding: "10dp"
-                    spacing: "16dp"
-                    FitImage:
-                        id: mini_art
-                        source: app.current_art
-                        size_hint: (None, 1)
-                        width: "62dp"
-                        radius: [14,]
-                    MDBoxLayout:
-                        orientation: 'vertical'
-                        justify_content: 'center'
+                                    text_color: [1, 1, 1, 0.5]
+                            MDSwitch:
+                                active: app.metrics_overlay
+                                on_active: app.toggle_metrics_overlay(*args)
+                                pos_hint: {"center_y": .5}
                         MDLabel:
-                            text: app.current_title
-                            bold: True
-                            theme_text_color: "Custom"
-                            text_color: [1, 1, 1, 1]
-                            shorten: True
-                            font_style: "Subtitle1"
-                        MDLabel:
-                            text: "Now Playing"
-                            font_style: "Caption"
-                            theme_text_color: "Custom"
-                            text_color: [1, 0.8, 0, 0.8]
-                    MDIconButton:
-                        icon: "pause-circle" if app.is_playing else "play-circle"
+                            text: "" 
+
+        # MINI PLAYER
+        MDCard:
+            size_hint: (0.96, None)
+            height: "82dp"
+            pos_hint: {"center_x": 0.5, "y": 0.1} 
+            radius: [20,]
+            md_bg_color: [0.12, 0.12, 0.12, 0.96]
+            elevation: 8
+            opacity: app.mini_player_opacity
+            on_release: app.open_full_player()
+            MDBoxLayout:
+                padding: "10dp"
+                spacing: "16dp"
+                FitImage:
+                    id: mini_art
+                    source: app.art_small
+                    size_hint: (None, 1)
+                    width: "62dp"
+                    radius: [14,]
+                MDBoxLayout:
+                    orientation: 'vertical'
+                    justify_content: 'center'
+                    MDLabel:
+                        text: app.current_title
+                        bold: True
                         theme_text_color: "Custom"
-                        text_color: [1, 0.8, 0, 1]
-                        icon_size: "48sp"
-                        on_release: app.toggle_play()
+                        text_color: [1, 1, 1, 1]
+                        shorten: True
+                        font_style: "Subtitle1"
+                    MDLabel:
+                        text: "Loading..." if app.is_loading else "Now Playing"
+                        font_style: "Caption"
+                        theme_text_color: "Custom"
+                        text_color: [1, 0.8, 0, 0.8]
+                MDIconButton:
+                    icon: "pause-circle" if app.is_playing else "play-circle"
+                    theme_text_color: "Custom"
+                    text_color: [1, 0.8, 0, 1]
+                    icon_size: "48sp"
+                    on_release: app.toggle_play()
+'''
+
+# గ్యాలరీ స్క్రీన్ - మొదటిసారి Gallery ఓపెన్ చేసినప్పుడే తయారవుతుంది
+GALLERY_SCREEN_KV = '''
+Screen:
+    name: 'gallery'
+    MDBoxLayout:
+        orientation: 'vertical'
+        md_bg_color: [0.04, 0.04, 0.04, 1]
+
+        MDBoxLayout:
+            size_hint_y: None
+            height: "64dp"
+            padding: ["6dp", "8dp", "12dp", "8dp"]
+            spacing: "6dp"
+            md_bg_color: [0, 0, 0, 0.4]
+            MDIconButton:
+                icon: "arrow-left"
+                theme_text_color: "Custom"
+                text_color: [1, 1, 1, 1]
+                pos_hint: {"center_y": 0.5}
+                on_release: app.close_gallery()
+            MDLabel:
+                text: app.gallery_title
+                font_style: "H6"
+                bold: True
+                shorten: True
+                theme_text_color: "Custom"
+                text_color: [1, 1, 1, 1]
+                pos_hint: {"center_y": 0.5}
+            MDIconButton:
+                icon: "folder-image"
+                theme_text_color: "Custom"
+                text_color: [0.2, 0.8, 1, 1]
+                pos_hint: {"center_y": 0.5}
+                on_release: app.file_manager_gallery_open()
+
+        RecycleView:
+            viewclass: 'GalleryTile'
+            data_model: app.gallery_model
+            RecycleGridLayout:
+                cols: max(3, int(self.width / dp(120)))
+                spacing: "2dp"
+                default_size: None, (self.width - dp(2) * (self.cols - 1)) / self.cols
+                default_size_hint: 1, None
+                size_hint_y: None
+                height: self.minimum_height
+'''
+
+# వీడియో లైబ్రరీ స్క్రీన్ - మొదటిసారి Movies ఓపెన్ చేసినప్పుడే తయారవుతుంది
+VIDEO_SCREEN_KV = '''
+Screen:
+    name: 'videos'
+    MDBoxLayout:
+        orientation: 'vertical'
+        md_bg_color: [0.04, 0.04, 0.04, 1]
+
+        MDBoxLayout:
+            size_hint_y: None
+            height: "64dp"
+            padding: ["6dp", "8dp", "12dp", "8dp"]
+            spacing: "6dp"
+            md_bg_color: [0, 0, 0, 0.4]
+            MDIconButton:
+                icon: "arrow-left"
+                theme_text_color: "Custom"
+                text_color: [1, 1, 1, 1]
+                pos_hint: {"center_y": 0.5}
+                on_release: app.close_videos()
+            MDLabel:
+                text: app.video_title
+                font_style: "H6"
+                bold: True
+                shorten: True
+                theme_text_color: "Custom"
+                text_color: [1, 1, 1, 1]
+                pos_hint: {"center_y": 0.5}
+            MDIconButton:
+                icon: "refresh"
+                theme_text_color: "Custom"
+                text_color: [1, 1, 1, 1]
+                pos_hint: {"center_y": 0.5}
+                on_release: app.scan_videos()
+            MDIconButton:
+                icon: "folder-play"
+                theme_text_color: "Custom"
+                text_color: [0.4, 0.9, 0.4, 1]
+                pos_hint: {"center_y": 0.5}
+                on_release: app.file_manager_video_open()
+
+        RecycleView:
+            viewclass: 'VideoListItem'
+            data_model: app.video_model
+            RecycleBoxLayout:
+                default_size: None, dp(84)
+                default_size_hint: 1, None
+                size_hint_y: None
+                height: self.minimum_height
+                orientation: 'vertical'
+                padding: ["0dp", "8dp"]
 '''
 
 class SongListItem(TwoLineAvatarIconListItem):
     path = StringProperty()
 
+class GalleryTile(ButtonBehavior, Widget):
+    """ RecycleView రీసైకిల్ చేసినప్పుడు path మారుతుంది - పాత ఫోటో రిక్వెస్ట్ రద్దు, కొత్తది అడుగుతుంది """
+    path = StringProperty()
+    texture = ObjectProperty(None, allownone=True)
+    requested = None
+
+    def on_path(self, instance, path):
+        thumbs = MDApp.get_running_app().gallery_thumbs
+        if self.requested: thumbs.cancel(self.requested, self.set_thumbnail)
+        self.requested = None
+        self.texture = thumbs.request(path, self.set_thumbnail) if path else None
+        if path and self.texture is None: self.requested = path
+
+    def set_thumbnail(self, path, texture):
+        if path != self.path: return
+        self.requested = None
+        self.texture = texture
+
+    def on_release(self):
+        MDApp.get_running_app().open_gallery_item(self.path)
+
 class PrasadProApp(MDApp):
-    music_list_data = ListProperty([])
+    music_list_data = ObjectProperty([])
     current_title = StringProperty("No Track Selected")
     current_art = StringProperty("album_art.jpg") 
+    # current_art యొక్క థంబ్ నెయిల్స్ (మినీ / ఫుల్ ప్లేయర్ / బ్యాక్ గ్రౌండ్)
+    art_small = StringProperty("album_art.jpg")
+    art_large = StringProperty("album_art.jpg")
+    art_bg = StringProperty("album_art.jpg")
     is_playing = BooleanProperty(False)
     mini_player_opacity = NumericProperty(0)
+    is_loading = BooleanProperty(False)
+    is_scanning = BooleanProperty(False)
+    scan_status = StringProperty("")
+    sort_mode = StringProperty("added")
+    spatial_audio = BooleanProperty(False)
+    shuffle_mode = BooleanProperty(False)
+    repeat_mode = StringProperty("off")
+    search_query = StringProperty("")
+    metrics_overlay = BooleanProperty(False)
+    volume = NumericProperty(1.0)
+    gallery_title = StringProperty("Gallery")
+    video_title = StringProperty("Movies")
     
     # --- SMART WALLPAPER PATH ---
     # Default is the APK bundled one
     wallpaper_path = StringProperty("wallpaper.jpg") 
+    # స్క్రీన్ సైజ్ కి తగ్గించిన వాల్ పేపర్ ఫైల్ - అన్ని FitImage లు ఇదే path వాడతాయి, Kivy ఇమేజ్ క్యాష్ ఒకే టెక్స్చర్ పంచుతుంది.
+    # (Texture ఇస్తే KivyMD FitImage లోడర్ టైమర్ ఎప్పటికీ ఆగదు - అందుకే string)
+    wallpaper = StringProperty("")
     
-    current_song_index = -1
-    all_songs_list = [] 
+    current_path = ""
+    store = None
+    ERROR_SKIPS = 3     # వరుసగా ఇన్ని పాటలు ప్లే అవ్వకపోతే ఆగిపోతాం (పాడైన ఫోల్డర్ లో లూప్ అవ్వకుండా)
+    error_skips = 0
+    scanner = None
+    scanned_once = False
+    scan_started = 0.0
+    metadata = None
+    metadata_pending = False
+    SORT_MODES = ('added', 'title', 'artist', 'album')
+    watcher = None
+    scan_dialog = None
+    # సీక్ బార్ టిక్ ఫుల్ ప్లేయర్ కనిపిస్తూ, పాట ప్లే అవుతున్నప్పుడు మాత్రమే నడుస్తుంది
+    SEEK_TICK = 0.25
+    seek_event = None
+    full_player_visible = False
+    modal = None
+    # సెర్చ్: song_rows లిస్ట్ ఆర్డర్ లో (హెడర్లు లేకుండా) స్టోర్ rows, ఇండెక్స్ లోని ఐడీలు వీటి స్థానాలే
+    search_store = None
+    search_rows = ()
+    search_dirty = True
+    search_builder = None
+    app_paused = False
+    # ప్లే అవుతుంటే పొజిషన్ ని ఇంత తరచుగా స్టోర్ (మెమరీ) లో - డిస్క్ కి SettingsStore.LAZY_DELAY లో
+    PLAYBACK_SAVE = 2.0
+    playback_event = None
+    resume_position = 0     # రీలాంచ్ తర్వాత పాట సిద్ధమవగానే ఇక్కడికి seek
+    # డీబగ్ ఓవర్ లే (Performance Overlay) - ఆన్ చేసినప్పుడే కడతాం
+    METRICS_REFRESH = 1.0
+    metrics_label = None
+    metrics_event = None
     
     # SECURITY STATE
     security_attempts = 0
@@ -620,11 +3622,45 @@ class PrasadProApp(MDApp):
     exit_dialog = None
     
     def build(self):
+        build_start = time.perf_counter()
         self.theme_cls.theme_style = "Dark"
         self.theme_cls.primary_palette = "Amber"
         
         # SECURE STORAGE INIT
-        self.store = JsonStore('vault_secrets.json')
+        self.store = SettingsStore('vault_secrets.json')
+        if self.store.exists('debug') and self.store.get('debug').get('overlay'):
+            self.metrics_overlay = True
+            metrics.enable(True)
+        self.library = LibraryIndex('vault_library.db')
+        self.track_store = TrackStore()
+        self.full_list_data = TrackListView(self.track_store)
+        self.song_rows = array('i')
+        self.track_model = TrackDataModel()
+        self.refresh_trigger = Clock.create_trigger(self.refresh_track_list, 0.5)
+        self.tags_trigger = Clock.create_trigger(self.apply_tag_updates, 0.5)
+        self.tagged_rows = set()
+        self.search_index = SearchIndex()
+        self.search_trigger = Clock.create_trigger(self.show_track_list, 0.3)
+        self.scan_rules = ScanRules.from_state(self.store.get('scan')) if self.store.exists('scan') else ScanRules()
+        if self.store.exists('ui'):
+            self.sort_mode = self.store.get('ui').get('sort_mode', 'added')
+            self.spatial_audio = bool(self.store.get('ui').get('spatial_audio', False))
+        if self.store.exists('playback'):
+            self.volume = float(self.store.get('playback').get('volume', 1.0))
+        self.queue = PlayQueue()
+        if self.store.exists('queue'):
+            self.queue.restore(self.store.get('queue'))
+        self.shuffle_mode = self.queue.shuffle
+        self.repeat_mode = self.queue.repeat
+        art_budget = ArtCache.DEFAULT_BUDGET
+        if self.store.exists('art_cache'):
+            art_budget = int(self.store.get('art_cache').get('max_mb', 48)) * 1024 * 1024
+        self.art_cache = ArtCache('vault_art_cache', art_budget)
+        threading.Thread(target=ArtCache.purge_legacy, args=(os.getcwd(),), daemon=True).start()
+        self.thumbnailer = ArtThumbnailer(self.art_cache)
+        # ఆర్ట్ పనులన్నీ ఒకే వర్కర్ లో వరుసగా - UI థ్రెడ్ కి డీకోడ్ భారం ఉండదు
+        self.art_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vault-art")
+        event_log.watch(self.art_executor.submit(self._build_art_thumbs, self.current_art))
         Window.bind(on_keyboard=self.events)
         
         # UNIVERSAL PERMISSIONS
@@ -637,25 +3673,25 @@ class PrasadProApp(MDApp):
             ])
         except: pass
         
-        # --- WALLPAPER LOGIC (Hybrid) ---
-        # 1. Check custom user folder first
-        custom_wp = "/storage/emulated/0/PrasadApp/wallpaper.jpg"
-        if os.path.exists(custom_wp):
-            self.wallpaper_path = custom_wp
-        else:
-            # 2. Use bundled asset
-            self.wallpaper_path = "wallpaper.jpg"
+        self.wallpaper_cache = WallpaperCache(os.getcwd())
+        self.load_wallpaper()
         
         self.player = NativeAudioPlayer()
+        self.player.effects.spatial = self.spatial_audio
+        self.player.set_volume(self.volume)
+        self.player.on_error = self.on_player_error
+        self.player.on_complete = self.on_track_complete
+        self.player.on_track_changed = self.on_gapless_advance
+        self.load_trigger = Clock.create_trigger(self._load_pending, 0.12)
         
-        # FILE MANAGERS SETUP
-        self.fm_music = MDFileManager(exit_manager=self.close_fm, select_path=self.select_path, ext=['.mp3', '.flac', '.m4a'])
-        self.fm_video = MDFileManager(exit_manager=self.close_fm_video, select_path=self.select_video, ext=['.mp4', '.mkv', '.avi'])
-        self.fm_gallery = MDFileManager(exit_manager=self.close_fm_gallery, select_path=self.select_generic, ext=['.jpg', '.png', '.jpeg'])
-        self.fm_docs = MDFileManager(exit_manager=self.close_fm_docs, select_path=self.select_generic, ext=['.pdf', '.txt', '.doc'])
-        
-        self.fm = self.fm_music
-        return Builder.load_string(KV)
+        # FILE MANAGERS - మొదటిసారి ఓపెన్ చేసినప్పుడే తయారవుతాయి (file_manager)
+        self.file_managers = {}
+        self.startup_times = {}
+        root = Builder.load_string(KV)
+        root.bind(current=lambda manager, name: event_log.event('screen', name))
+        self.mark_startup('build')
+        metrics.record('app.build', build_start)
+        return root
 
     # --- EXIT DIALOG LOGIC ---
     def events(self, instance, keyboard, keycode, text, modifiers):
@@ -663,12 +3699,20 @@ class PrasadProApp(MDApp):
             if self.root.current == 'main':
                 self.show_exit_dialog()
                 return True
+            elif self.root.current == 'gallery':
+                self.close_gallery()
+                return True
+            elif self.root.current == 'videos':
+                self.close_videos()
+                return True
             else:
                 return False
         return False
 
     def show_exit_dialog(self):
         if not self.exit_dialog:
+            from kivymd.uix.dialog import MDDialog
+            from kivymd.uix.button import MDRaisedButton, MDFlatButton
             self.exit_dialog = MDDialog(
                 title="Exit Vault?",
                 text="Do you want to close Prasad's Vault Pro?",
@@ -682,15 +3726,117 @@ class PrasadProApp(MDApp):
     def stop_app(self, *args):
         try: self.player.stop()
         except: pass
+        if self.scanner: self.scanner.cancel()
         MDApp.get_running_app().stop()
 
+    def on_pause(self):
+        # బ్యాక్ గ్రౌండ్ లో టైమర్ వేకప్ లు వద్దు - పాట MediaPlayer లోనే కొనసాగుతుంది
+        event_log.event('app', 'pause')
+        self.app_paused = True
+        self.update_seek_tick()
+        self.update_state_tick()
+        # ఆండ్రాయిడ్ బ్యాక్ గ్రౌండ్ లో ఎప్పుడైనా ప్రాసెస్ ని చంపొచ్చు - ఇప్పుడే డిస్క్ కి
+        self.store.flush()
+        return True
+
+    def on_resume(self):
+        event_log.event('app', 'resume')
+        self.app_paused = False
+        self.update_seek_tick()
+        self.update_state_tick()
+        # యూజర్ బయట వాల్ పేపర్ మార్చి ఉండొచ్చు
+        self.load_wallpaper()
+
+    # --- WALLPAPER LOGIC (Hybrid) ---
+    def load_wallpaper(self):
+        # 1. Check custom user folder first
+        custom_wp = "/storage/emulated/0/PrasadApp/wallpaper.jpg"
+        if os.path.exists(custom_wp):
+            self.wallpaper_path = custom_wp
+        else:
+            # 2. Use bundled asset
+            self.wallpaper_path = "wallpaper.jpg"
+        source, size = self.wallpaper_path, tuple(Window.size)
+        try: cached = self.wallpaper_cache.cached(source, size)
+        except OSError: return
+        if cached:
+            self.set_wallpaper_file(cached)
+            return
+        def build_wallpaper():
+            try: path = self.wallpaper_cache.build(source, size)
+            except Exception as e:
+                print(f"Wallpaper Error: {str(e)}")
+                path = source   # Pillow ఫెయిల్ అయితే ఒరిజినల్ ఫైల్ నే వాడతాం
+            Clock.schedule_once(lambda dt: self.set_wallpaper_file(path))
+        threading.Thread(target=build_wallpaper, name="vault-wallpaper", daemon=True).start()
+
+    def set_wallpaper_file(self, path):
+        """ మెయిన్ థ్రెడ్: అన్ని స్క్రీన్లకు ఒకే ఫైల్ """
+        if path != self.wallpaper: self.wallpaper = path
+
+    @metrics.timed('app.on_start')
     def on_start(self):
+        # లాక్ స్క్రీన్ మొదటి ఫ్రేమ్ గీసిన తర్వాతే మిగతా పనులు
+        Window.bind(on_flip=self.on_first_frame)
+        if self.metrics_overlay: self.show_metrics_overlay()
         if not self.store.exists('security'):
             Clock.schedule_once(lambda x: self.show_setup_popup(), 1)
 
+    # --- LAZY STARTUP ---
+    def mark_startup(self, label):
+        """ ప్రాసెస్ ఇంపోర్ట్ నుండి ఇప్పటి వరకు ms """
+        self.startup_times[label] = round((time.perf_counter() - STARTUP_T0) * 1000, 1)
+
+    def on_first_frame(self, *args):
+        Window.unbind(on_flip=self.on_first_frame)
+        self.mark_startup('first_frame')
+        # ఒక్కో ఖాళీ ఫ్రేమ్ లో ఒక్కో పని - PIN టైప్ చేస్తుండగా UI ఆగదు
+        self.startup_steps = deque([self.build_main_screen, self.load_library, self.restore_playback, self.start_metadata, self.start_watcher])
+        Clock.schedule_once(self.run_startup_step)
+
+    def run_startup_step(self, dt):
+        if not self.startup_steps: return
+        step = self.startup_steps.popleft()
+        with metrics.span('startup.' + step.__name__): step()
+        if self.startup_steps:
+            Clock.schedule_once(self.run_startup_step)
+            return
+        self.mark_startup('ready')
+        print("Startup: " + ", ".join(f"{label} {ms} ms" for label, ms in self.startup_times.items()))
+
+    def build_main_screen(self):
+        """ ట్యాబ్ లు, మ్యూజిక్ లిస్ట్, మినీ ప్లేయర్ - అన్ లాక్ కంటే ముందే ఖాళీ ఫ్రేమ్ లో, లేదా అన్ లాక్ అప్పుడు వెంటనే """
+        if self.root.has_screen('main'): return
+        self.root.add_widget(Builder.load_string(MAIN_SCREEN_KV))
+        self.mark_startup('main_screen')
+
+    def show_main_screen(self):
+        self.build_main_screen()
+        self.root.current = 'main'
+
+    def on_stop(self):
+        event_log.event('app', 'stop')
+        if self.scanner: self.scanner.cancel()
+        if self.metadata: self.metadata.cancel()
+        if self.search_builder: self.search_builder.cancel()
+        if self.gallery_loader: self.gallery_loader.cancel()
+        if self.gallery_thumbs: self.gallery_thumbs.close()
+        if self.video_scanner: self.video_scanner.cancel()
+        if self.video_posters: self.video_posters.cancel()
+        self.stop_watcher()
+        self.player.effects.release()
+        self.save_playback_state()
+        self.store.flush()
+        # ఇంకా రాయని లాగ్ లు (ఉంటే) డిస్క్ కి
+        event_log.flush(0.5)
+
     # --- SECURITY LOGIC ---
     def show_setup_popup(self):
         if not self.setup_dialog:
+            from kivymd.uix.dialog import MDDialog
+            from kivymd.uix.button import MDRaisedButton
+            from kivymd.uix.boxlayout import MDBoxLayout
+            from kivymd.uix.textfield import MDTextField
             content = MDBoxLayout(orientation='vertical', spacing="12dp", height="200dp", size_hint_y=None)
             self.new_user_pin = MDTextField(hint_text="Create User PIN (4-digits)", input_filter="int", max_text_length=4)
             self.new_master_pin = MDTextField(hint_text="Create Master PIN (Backup)", input_filter="int", max_text_length=4)
@@ -727,7 +3873,7 @@ class PrasadProApp(MDApp):
         try:
             saved_user_pin = self.store.get('security')['user_pin']
             if entered_pin == saved_user_pin:
-                self.root.current = 'main'
+                self.show_main_screen()
                 self.security_attempts = 0
                 toast("Access Granted")
             else:
@@ -740,6 +3886,9 @@ class PrasadProApp(MDApp):
             toast("Setup PIN first!")
             return
         if not self.forgot_dialog:
+            from kivymd.uix.dialog import MDDialog
+            from kivymd.uix.button import MDFlatButton
+            from kivymd.uix.textfield import MDTextField
             self.answer_field = MDTextField(hint_text="Enter Answer")
             self.forgot_dialog = MDDialog(
                 title="Security Recovery",
@@ -768,6 +3917,9 @@ class PrasadProApp(MDApp):
 
     def show_master_code_dialog(self):
         if not self.master_dialog:
+            from kivymd.uix.dialog import MDDialog
+            from kivymd.uix.button import MDRaisedButton
+            from kivymd.uix.textfield import MDTextField
             self.master_field = MDTextField(hint_text="Enter Master PIN", input_filter="int")
             self.master_dialog = MDDialog(
                 title="MASTER UNLOCK",
@@ -785,97 +3937,475 @@ class PrasadProApp(MDApp):
         if self.master_field.text == saved_master:
             toast("MASTER OVERRIDE ACCEPTED")
             self.master_dialog.dismiss()
-            self.root.current = 'main'
+            self.show_main_screen()
             self.security_attempts = 0
         else:
             toast("SECURITY BREACH DETECTED")
 
     # --- UI SYNC ---
     def on_current_art(self, instance, value):
-        try: self.root.ids.mini_art.source = value
-        except: pass
-        if hasattr(self, 'full_player_bg'): self.full_player_bg.source = value
-        if hasattr(self, 'full_player_art'): self.full_player_art.source = value
+        thumbs = self.thumbnailer.lookup(value)
+        if thumbs is not None:
+            self.apply_art(value, thumbs)
+        else:
+            # థంబ్ నెయిల్స్ తయారయ్యే వరకు పాత ఆర్ట్ నే చూపిస్తాం - పెద్ద ఫైల్ డీకోడ్ చేయం
+            event_log.watch(self.art_executor.submit(self._build_art_thumbs, value))
+
+    def _build_art_thumbs(self, source):
+        """ వర్కర్ థ్రెడ్: థంబ్ నెయిల్స్ కట్టి మెయిన్ థ్రెడ్ కి పంపుతుంది """
+        thumbs = self.thumbnailer.build(source)
+        Clock.schedule_once(lambda dt: self.apply_art(source, thumbs))
+
+    def apply_art(self, source, thumbs):
+        if source != self.current_art: return
+        pick = self.thumbnailer.pick
+        self.art_small = pick(source, thumbs, dp(62))
+        self.art_large = pick(source, thumbs, dp(330))
+        self.art_bg = thumbs.get('bg', self.art_small)
 
     # --- SCAN ENGINE (DEEP) ---
-    def scan_music(self):
-        if len(self.music_list_data) > 0: 
-            toast("Library Updated")
+    def load_library(self):
+        """ పాత స్కాన్ ఫలితాలను డేటాబేస్ నుండి వెంటనే లిస్ట్ లో చూపిస్తుంది """
+        try: rows = self.library.all_tracks()
+        except Exception as e:
+            print(f"Library Error: {str(e)}")
             return
-        toast("Deep Scanning Device...")
-        new_data = []
-        self.all_songs_list = []
-        
-        search_paths = [
-            "/storage/emulated/0/Music", 
-            "/storage/emulated/0/Download",
-            "/storage/emulated/0/WhatsApp/Media/WhatsApp Audio",
-            "/storage/emulated/0/PrasadApp",
-            "/storage/emulated/0/Recordings",
-            "/storage/emulated/0/Snaptube/download",
-            "/storage/emulated/0/DCIM"
-        ]
+        store = TrackStore()
+        for path, folder, name, title, artist, album, track_no, duration in rows:
+            store.add(path, folder, title, artist, album, track_no, duration)
+        self.track_store = store
+        self.refresh_track_list()
+
+    def refresh_track_list(self, *args, reorder_queue=True):
+        """ sort_mode ప్రకారం లిస్ట్ ని మళ్లీ కడుతుంది; artist/album మోడ్ లో గ్రూప్ హెడర్లు వస్తాయి.
+        reorder_queue=False: ట్యాగ్ లు మాత్రమే మారాయి - ప్లే అవుతున్న క్యూ ఆర్డర్ ని కదపం """
+        store = self.track_store
+        rows = store.rows()
+        mode = self.sort_mode
+        title_key = lambda r: (store.titles[r] or store.name(r)).lower()
+        if mode == 'title':
+            rows.sort(key=title_key)
+        elif mode in ('artist', 'album'):
+            # తెలియని ఆర్టిస్ట్/ఆల్బమ్ చివరలో
+            group_of, other_of = (store.artist, store.album) if mode == 'artist' else (store.album, store.artist)
+            rows.sort(key=lambda r: ((group_of(r) or '\uffff').lower(), (other_of(r) or '').lower(),
+                                     store.track_nos[r], title_key(r)))
+        entries = array('i')
+        headers = []
+        if mode in ('artist', 'album'):
+            group = None
+            for row in rows:
+                name = group_of(row) or f"Unknown {mode.title()}"
+                if name != group:
+                    headers.append(name)
+                    entries.append(-len(headers))
+                    group = name
+                entries.append(row)
+        else:
+            entries.extend(rows)
+        self.full_list_data = TrackListView(store, entries, headers)
+        self.song_rows = array('i', rows)
+        self.search_dirty = True
+        self.show_track_list()
+        if not reorder_queue: return
+        self.queue.set_tracks(store.paths[row] for row in rows)
+        # ఆర్డర్ మారితే ముందే సిద్ధం చేసిన తర్వాతి పాట కూడా మారాలి
+        self.refresh_preload()
+
+    def on_music_list_data(self, instance, view):
+        self.track_model.data = view
+
+    def show_track_list(self, *args):
+        """ సెర్చ్ ఖాళీ అయితే పూర్తి లిస్ట్ (హెడర్లతో), లేకపోతే సరిపోయిన పాటలు మాత్రమే """
+        if not self.search_query:
+            self.music_list_data = self.full_list_data
+            return
+        if self.search_dirty: self.rebuild_search_index()
+        # ఇండెక్స్ తో పాటు అది కట్టినప్పటి స్టోర్ / row ఆర్డర్ - కొత్తది వచ్చే వరకు పాతదాంతోనే ఫలితాలు
+        store, rows = self.search_store, self.search_rows
+        matches = array('i', (rows[i] for i in self.search_index.search(self.search_query) or ()))
+        self.music_list_data = TrackListView(store, array('i', (row for row in matches if store.paths[row] is not None)))
+
+    def rebuild_search_index(self):
+        if self.search_builder: self.search_builder.cancel()
+        self.search_dirty = False
+        store, rows = self.track_store, array('i', self.song_rows)
+        self.search_builder = SearchIndexBuilder(on_done=lambda index: self.on_search_index(index, store, rows))
+        self.search_builder.start(store, rows)
+
+    def on_search_index(self, index, store, rows):
+        self.search_index, self.search_store, self.search_rows = index, store, rows
+        if self.search_query: self.show_track_list()
+
+    def search_music(self, text):
+        self.search_query = text.strip()
+        self.show_track_list()
+
+    def save_ui_state(self):
+        self.store.put('ui', sort_mode=self.sort_mode, spatial_audio=self.spatial_audio)
+
+    def cycle_sort_mode(self):
+        modes = self.SORT_MODES
+        self.sort_mode = modes[(modes.index(self.sort_mode) + 1) % len(modes)]
+        self.save_ui_state()
+        self.refresh_track_list()
+        toast(f"Sorted by {self.sort_mode}")
+
+    def start_metadata(self):
+        """ ట్యాగ్ లు చదవాల్సిన పాటల కోసం బ్యాక్ గ్రౌండ్ పూల్ ని మొదలుపెడుతుంది """
+        if self.metadata and self.metadata.running:
+            self.metadata_pending = True
+            return
+        paths = self.library.untagged_paths()
+        if not paths: return
+        self.metadata_pending = False
+        self.metadata = MetadataPipeline(self.library, on_batch=self.on_metadata_batch, on_done=self.on_metadata_done)
+        self.metadata.start(paths)
+
+    def on_metadata_batch(self, rows):
+        store = self.track_store
+        for path, title, artist, album, track_no, duration in rows:
+            store.update_metadata(path, title, artist, album, track_no, duration)
+            row = store.index.get(path)
+            if row is not None: self.tagged_rows.add(row)
+        self.tags_trigger()
+
+    def apply_tag_updates(self, *args):
+        """ ట్యాగ్ బ్యాచ్ లు (0.5 సెకన్లకు ఒకసారి కలిపి): ఆర్డర్ ట్యాగ్ ల మీద ఆధారపడితేనే మళ్ళీ సార్ట్,
+        లేకపోతే కనిపించే వరుసలు మాత్రమే అక్కడికక్కడే - క్యూ ఎప్పుడూ అలాగే """
+        rows, self.tagged_rows = self.tagged_rows, set()
+        if not rows: return
+        self.search_dirty = True
+        if self.sort_mode != 'added':
+            self.refresh_track_list(reorder_queue=False)
+        elif self.search_query:
+            self.search_trigger()
+        else:
+            self.track_model.modified(self.music_list_data.positions(rows))
+
+    def on_metadata_done(self, count):
+        if self.metadata_pending: self.start_metadata()
+
+    def scan_music(self, auto=False):
+        if self.is_scanning:
+            if not auto: toast("Scan in progress...")
+            return
+        # ట్యాబ్ ఓపెన్ చేసినప్పుడు ఒక సెషన్ లో ఒక్కసారే ఆటో స్కాన్
+        if auto and self.scanned_once: return
+        self.scanned_once = True
+        if len(self.track_store) > 0: toast("Checking for new music...")
+        else: toast("Deep Scanning Device...")
         
-        count = 0
-        for folder in search_paths:
-            if os.path.exists(folder):
-                for root, dirs, files in os.walk(folder):
-                    for file in files:
-                        if file.lower().endswith(('.mp3', '.m4a', '.flac', '.wav', '.aac', '.ogg')):
-                            full_path = os.path.join(root, file)
-                            item = {'text': file, 'secondary_text': f"{os.path.basename(root)}", 'path': full_path}
-                            new_data.append(item)
-                            self.all_songs_list.append(full_path)
-                            count += 1
-        self.music_list_data = new_data
-        if count > 0: toast(f"Found {count} tracks")
+        # స్కాన్ అన్ని మార్పులనీ చూస్తుంది - అది అయ్యే వరకు వాచర్ ఆగుతుంది
+        self.stop_watcher()
+        self.scanner = LibraryScanner(
+            self.library, self.scan_rules, MEDIA_TYPES['audio'],
+            on_batch=self.on_scan_batch, on_progress=self.on_scan_progress, on_done=self.on_scan_done)
+        self.is_scanning = True
+        self.scan_status = "Scanning..."
+        self.scan_started = time.perf_counter()
+        event_log.event('scan', 'start')
+        self.scanner.start()
+
+    def cancel_scan(self):
+        if self.scanner: self.scanner.cancel()
+        event_log.event('scan', 'cancelled')
+        self.is_scanning = False
+        self.scan_status = ""
+        # రద్దయిన బ్యాచ్ లు UI కి రావు, కానీ డేటాబేస్ లో ఉంటాయి - అక్కడి నుండి మళ్లీ చదువుతాం
+        self.load_library()
+        self.start_watcher()
+        toast(f"Scan stopped ({len(self.queue)} tracks)")
+
+    def on_scan_batch(self, added, removed):
+        """ వర్కర్ నుండి వచ్చిన diff ని లిస్ట్ కి అప్లై చేస్తుంది (మెయిన్ థ్రెడ్) """
+        store = self.track_store
+        for path in removed: store.remove(path)
+        rows = [store.add(rec['path'], rec['folder']) for rec in added if rec['path'] not in store]
+        if removed or self.sort_mode != 'added':
+            self.refresh_trigger()
+        elif rows:
+            # స్కాన్ ఆర్డర్ లో ఉంటే పూర్తి రీబిల్డ్ అవసరం లేదు - కొత్తవి చివర్లో కలుపుతాం
+            view = self.full_list_data
+            start = len(view)
+            view.entries.extend(rows)
+            self.song_rows.extend(rows)
+            self.search_dirty = True
+            if self.search_query: self.search_trigger()
+            else: self.track_model.appended(start)
+            self.queue.extend(store.paths[row] for row in rows)
+
+    def on_scan_progress(self, count, dirs_listed):
+        event_log.event('scan', f"{count} tracks, {dirs_listed} folders")
+        self.scan_status = f"Scanning... {count}"
+
+    def on_scan_done(self, added, removed):
+        metrics.record('scan_music', self.scan_started)
+        event_log.event('scan', f"done +{added} -{removed}")
+        self.is_scanning = False
+        self.scan_status = ""
+        self.start_metadata()
+        self.start_watcher()
+        total = len(self.queue)
+        if added or removed: toast(f"Library Updated: +{added} / -{removed} ({total} tracks)")
+        elif total > 0: toast(f"Library up to date ({total} tracks)")
         else: toast("No music found")
 
+    # --- SCAN FOLDERS (SETTINGS) ---
+    def show_scan_settings_dialog(self):
+        if not self.scan_dialog:
+            from kivymd.uix.dialog import MDDialog
+            from kivymd.uix.button import MDFlatButton, MDRaisedButton
+            from kivymd.uix.boxlayout import MDBoxLayout
+            from kivymd.uix.textfield import MDTextField
+            content = MDBoxLayout(orientation='vertical', spacing="12dp", height="330dp", size_hint_y=None)
+            self.scan_roots_field = MDTextField(hint_text="Music folders (one per line)", multiline=True, max_height="140dp")
+            self.scan_excludes_field = MDTextField(hint_text="Skip folders: name, .* or Android/data (one per line)", multiline=True, max_height="100dp")
+            self.scan_depth_field = MDTextField(hint_text="Max depth (empty = unlimited)", input_filter="int")
+            for field in (self.scan_roots_field, self.scan_excludes_field, self.scan_depth_field):
+                content.add_widget(field)
+            self.scan_dialog = MDDialog(
+                title="Scan Folders",
+                type="custom",
+                content_cls=content,
+                buttons=[
+                    MDFlatButton(text="CANCEL", on_release=lambda x: self.scan_dialog.dismiss()),
+                    MDRaisedButton(text="SAVE & SCAN", on_release=lambda x: self.save_scan_settings())
+                ],
+            )
+        rules = self.scan_rules
+        self.scan_roots_field.text = "\n".join(rules.roots)
+        self.scan_excludes_field.text = "\n".join(rules.excludes)
+        self.scan_depth_field.text = "" if rules.max_depth is None else str(rules.max_depth)
+        self.scan_dialog.open()
+
+    def save_scan_settings(self):
+        roots = self.scan_roots_field.text.splitlines()
+        excludes = self.scan_excludes_field.text.splitlines()
+        rules = ScanRules(roots, excludes, self.scan_depth_field.text.strip() or None)
+        if not rules.roots:
+            toast("Add at least one folder")
+            return
+        self.scan_rules = rules
+        self.store.put('scan', **rules.state())
+        self.scan_dialog.dismiss()
+        # కొత్త నియమాలతో స్కాన్ - బయట పడిన ఫోల్డర్ల పాటలు లైబ్రరీ నుండి పోతాయి
+        if self.is_scanning: toast("Folders saved - applies to the next scan")
+        else: self.scan_music()
+
+    # --- LIVE LIBRARY (WATCHER) ---
+    def start_watcher(self):
+        """ ఇండెక్స్ లో ఉన్న ఫోల్డర్లను గమనిస్తుంది - ఒక్కసారైనా స్కాన్ అయ్యాకే """
+        if self.is_scanning or (self.watcher and self.watcher.running): return
+        if not len(self.track_store): return
+        self.watcher = LibraryWatcher(self.library, self.scan_rules, MEDIA_TYPES['audio'], on_batch=self.on_watch_batch)
+        self.watcher.start()
+
+    def stop_watcher(self):
+        if self.watcher: self.watcher.cancel()
+        self.watcher = None
+
+    def on_watch_batch(self, added, removed, renamed):
+        """ వాచర్ diff: పేరు మారినవి అదే row / క్యూ స్థానంతో, మిగతావి స్కాన్ బ్యాచ్ లాగే """
+        event_log.event('watch', f"+{len(added)} -{len(removed)} renamed {len(renamed)}")
+        for old, new in renamed:
+            self.track_store.rename(old, new)
+            self.queue.rename(old, new)
+            if self.current_path == old: self.current_path = new
+        if renamed:
+            self.refresh_trigger()
+            self.save_queue()
+        self.on_scan_batch(added, removed)
+        self.start_metadata()
+
     def play_song_from_list(self, path):
-        if path in self.all_songs_list:
-            self.current_song_index = self.all_songs_list.index(path)
-        self.play_song(path, os.path.basename(path))
+        if not path: return
+        self.queue.jump(path)
+        self.play_song(path, self.track_title(path))
+
+    def queue_play_next(self, path):
+        if not path: return
+        self.queue.add_next(path)
+        self.save_queue()
+        self.refresh_preload()
+        toast(f"Playing next: {self.track_title(path)}")
+
+    def toggle_shuffle(self, *args):
+        self.queue.set_shuffle(not self.queue.shuffle)
+        self.shuffle_mode = self.queue.shuffle
+        self.save_queue()
+        self.refresh_preload()
+        toast(f"Shuffle: {'ON' if self.shuffle_mode else 'OFF'}")
+
+    def cycle_repeat(self, *args):
+        self.repeat_mode = self.queue.cycle_repeat()
+        self.save_queue()
+        self.refresh_preload()
+        toast(f"Repeat: {self.repeat_mode.upper()}")
+
+    def save_queue(self):
+        self.store.put('queue', **self.queue.state())
+
+    def track_title(self, path):
+        """ ఇండెక్స్ చేసిన టైటిల్ మాత్రమే - UI థ్రెడ్ లో ఫైల్ ని ఎప్పుడూ తెరవం """
+        row = self.track_store.index.get(path)
+        return (row is not None and self.track_store.title(row)) or os.path.basename(path)
+
+    def extract_cover(self, path, save_path):
+        """ ముందు ట్యాగ్ రీడర్ (అన్ని ప్లాట్ ఫామ్ లు), దొరక్కపోతే ఆండ్రాయిడ్ రిట్రీవర్ """
+        return extract_art(path, save_path) or self.player.get_art(path, save_path)
 
     def play_song(self, path, title):
+        event_log.event('track', path)
+        self.resume_position = 0
         self.current_title = title
-        self.player.load(path)
-        self.player.play()
+        self.current_path = path
         self.is_playing = True
+        self.is_loading = True
         self.mini_player_opacity = 1
-        
         self.current_art = "album_art.jpg" 
-        def force_sync_art(dt):
-            unique_name = f"vault_cached_{int(time.time()*1000)}.jpg"
-            temp_path = os.path.join(os.getcwd(), unique_name)
-            if self.player.get_art(path, temp_path):
-                self.current_art = temp_path
-            else:
-                self.current_art = "album_art.jpg"
-        Clock.schedule_once(force_sync_art, 0.18)
-        Clock.unschedule(self.update_music_state)
-        Clock.schedule_interval(self.update_music_state, 1)
+        self.save_queue()
+        self.save_playback_state()
+        # వేగంగా చాలా పాటలు నొక్కితే, చివరిది మాత్రమే లోడ్ అవుతుంది
+        self.load_trigger()
+
+    def _load_pending(self, dt):
+        path = self.current_path
+        if not self.player.load(path, on_ready=self.on_track_ready):
+            # నేటివ్ ప్లేయర్ లేదు (డెస్క్ టాప్) లేదా ఫైల్ ఓపెన్ అవ్వలేదు
+            self.is_loading = False
+        self.load_art(path)
+
+    def load_art(self, path):
+        def force_sync_art():
+            # వర్కర్ థ్రెడ్: కవర్ తీసి, థంబ్ నెయిల్స్ కూడా ఇక్కడే కడతాం
+            with metrics.span('art.load'):
+                cached = self.art_cache.fetch(path, self.extract_cover)
+                if cached: self.thumbnailer.build(cached)
+            def apply(dt):
+                if self.current_path == path: self.current_art = cached if cached else "album_art.jpg"
+            Clock.schedule_once(apply)
+        event_log.watch(self.art_executor.submit(force_sync_art))
+
+    def on_track_ready(self, path):
+        """ prepareAsync పూర్తయింది (మెయిన్ థ్రెడ్) """
+        if path != self.current_path: return
+        event_log.event('track_ready', path)
+        self.error_skips = 0
+        if self.resume_position:
+            self.player.seek(self.resume_position)
+            self.resume_position = 0
+        self.is_loading = False
+        # లోడ్ అవుతుండగా పాజ్ నొక్కితే ప్లే చేయం
+        if self.is_playing: self.player.play()
+        self.update_seek_tick()
+        self.player.preload_next(self.queue.peek_next())
+
+    def refresh_preload(self):
+        """ క్యూ మారితే (ఆర్డర్, shuffle, repeat, play next) ముందే సిద్ధం చేసే పాటను సరిచేస్తుంది """
+        if self.player.is_prepared and self.current_path:
+            upcoming = self.queue.peek_next()
+            if upcoming: self.player.preload_next(upcoming)
+            else: self.player.cancel_next()
+
+    def on_gapless_advance(self, path):
+        """ ప్లేయర్ ఇప్పటికే తర్వాతి పాటను ప్లే చేస్తోంది - టైటిల్, ఆర్ట్, క్యూ మాత్రమే మారుస్తాం """
+        event_log.event('track_gapless', path)
+        if self.queue.advance(auto=True) != path: self.queue.jump(path, remember=False)
+        self.current_title = self.track_title(path)
+        self.current_path = path
+        self.current_art = "album_art.jpg"
+        self.save_queue()
+        self.save_playback_state()
+        self.load_art(path)
+        self.update_seek_tick()
+        self.player.preload_next(self.queue.peek_next())
+
+    def on_track_complete(self):
+        """ పాట అయిపోయింది, తర్వాతిది ముందే సిద్ధం కాలేదు """
+        path = self.queue.advance(auto=True)
+        if path: self.play_song(path, self.track_title(path))
+        else: self.is_playing = False   # repeat ఆఫ్ - క్యూ చివరికి వచ్చాం
+
+    def on_player_error(self, path, what, extra):
+        event_log.event('player_error', f"{path} ({what}/{extra})")
+        event_log.write('error', f"MediaPlayer error {what}/{extra}: {path}", with_recent=True)
+        self.is_loading = False
+        self.is_playing = False
+        toast(f"Cannot play {os.path.basename(path or '')} ({what}/{extra})")
+        # ప్లే అవ్వని పాట దాటి తర్వాతిది
+        if path != self.current_path or self.error_skips >= self.ERROR_SKIPS: return
+        self.error_skips += 1
+        path = self.queue.advance(auto=True)
+        if path and path != self.current_path: self.play_song(path, self.track_title(path))
 
     def toggle_play(self):
         if self.is_playing: self.player.pause(); self.is_playing = False
         else: self.player.play(); self.is_playing = True
 
     def play_next(self, *args):
-        if not self.all_songs_list: return
-        self.current_song_index = (self.current_song_index + 1) % len(self.all_songs_list)
-        path = self.all_songs_list[self.current_song_index]
-        self.play_song(path, os.path.basename(path))
+        path = self.queue.advance()
+        if path: self.play_song(path, self.track_title(path))
 
     def play_prev(self, *args):
-        if not self.all_songs_list: return
-        self.current_song_index = (self.current_song_index - 1) % len(self.all_songs_list)
-        path = self.all_songs_list[self.current_song_index]
-        self.play_song(path, os.path.basename(path))
+        path = self.queue.retreat()
+        if path: self.play_song(path, self.track_title(path))
+
+    def on_is_playing(self, instance, value):
+        self.update_seek_tick()
+        self.update_state_tick()
+
+    def update_state_tick(self):
+        """ ప్లే అవుతున్నంత సేపు పొజిషన్ ని స్టోర్ లో (మెమరీ) నవీకరిస్తుంది; ఆగితే టైమర్ ఆపి చివరి పొజిషన్ ఒక్కసారి """
+        active = self.is_playing and not self.app_paused
+        if active and self.playback_event is None:
+            self.playback_event = Clock.schedule_interval(self.save_playback_state, self.PLAYBACK_SAVE)
+        elif not active and self.playback_event is not None:
+            self.playback_event.cancel()
+            self.playback_event = None
+        self.save_playback_state()
+
+    def save_playback_state(self, *args):
+        """ పాట, పొజిషన్, వాల్యూమ్ - put_lazy, కాబట్టి ప్రతిసారీ డిస్క్ రైట్ కాదు """
+        # build() కంటే ముందు (బెంచ్ మార్క్ లు, టెస్ట్ లు) స్టోర్ ఉండదు
+        if self.store is None: return
+        position = self.player.get_pos() if self.player.is_prepared else self.resume_position
+        self.store.put_lazy('playback', path=self.current_path, title=self.current_title,
+                            position=round(position, 1), volume=round(self.volume, 2))
+
+    def restore_playback(self):
+        """ రీలాంచ్: చివరి పాటను అదే పొజిషన్ లో సిద్ధం చేస్తుంది - పాజ్ లో, ప్లే నొక్కగానే అక్కడి నుండే """
+        if self.current_path or not self.store.exists('playback'): return
+        state = self.store.get('playback')
+        path = state.get('path')
+        if not path or not os.path.exists(path): return
+        self.current_path = path
+        self.current_title = state.get('title') or self.track_title(path)
+        self.resume_position = float(state.get('position') or 0)
+        self.mini_player_opacity = 1
+        if self.queue.current != path: self.queue.jump(path, remember=False)
+        self.is_loading = True
+        self.load_trigger()
+
+    def set_volume(self, instance, value):
+        if abs(value - self.volume) < 0.005: return
+        self.volume = value
+        self.player.set_volume(value)
+        self.save_playback_state()
+
+    def update_seek_tick(self, *args):
+        """ ఫుల్ ప్లేయర్ కనిపిస్తూ ప్లే అవుతుంటే స్మూత్ టిక్; లేకపోతే టైమర్ ఆపేస్తాం """
+        active = self.full_player_visible and self.is_playing and not self.app_paused
+        if active and self.seek_event is None:
+            self.player.sync_position()
+            self.seek_event = Clock.schedule_interval(self.update_music_state, self.SEEK_TICK)
+        elif not active and self.seek_event is not None:
+            self.seek_event.cancel()
+            self.seek_event = None
+        if self.full_player_visible: self.update_music_state(0)
 
     def update_music_state(self, dt):
-        if not self.is_playing: return
-        if self.player.is_complete():
-            self.play_next()
-            return
+        """ సీక్ బార్, టైమ్ లేబుల్ - కాష్ చేసిన పొజిషన్ నుండే, JNI కాల్ లేదు """
         if hasattr(self, 'seek_slider') and self.seek_slider:
             pos = self.player.get_pos(); dur = self.player.get_duration()
             if dur > 0:
@@ -885,24 +4415,173 @@ class PrasadProApp(MDApp):
                 if hasattr(self, 'lbl_time'):
                     self.lbl_time.text = f"{curr_min:02}:{curr_sec:02} / {tot_min:02}:{tot_sec:02}"
 
+    def set_full_player_visible(self, visible):
+        self.full_player_visible = visible
+        self.update_seek_tick()
+
     def on_slider_seek(self, instance, touch):
-        if instance.collide_point(*touch.pos): self.player.seek(instance.value)
+        if instance.collide_point(*touch.pos):
+            self.player.seek(instance.value)
+            self.save_playback_state()
 
     # --- WORKING FOLDERS ---
-    def file_manager_gallery_open(self): self.fm_gallery.show("/storage/emulated/0/")
-    def close_fm_gallery(self, *args): self.fm_gallery.close()
-    def file_manager_video_open(self): self.fm_video.show("/storage/emulated/0/")
-    def close_fm_video(self, *args): self.fm_video.close()
-    def file_manager_docs_open(self): self.fm_docs.show("/storage/emulated/0/")
-    def close_fm_docs(self, *args): self.fm_docs.close()
+    # kind: (exit_manager, select_path, MEDIA_TYPES కీ) - మొదటిసారి ఓపెన్ చేసినప్పుడే MDFileManager తయారవుతుంది
+    FILE_MANAGERS = {
+        'music': ('close_fm', 'select_path', 'audio'),
+        'video': ('close_fm_video', 'select_video', 'video'),
+        'gallery': ('close_fm_gallery', 'select_gallery', 'image'),
+        'docs': ('close_fm_docs', 'select_generic', 'document'),
+    }
+
+    def file_manager(self, kind):
+        manager = self.file_managers.get(kind)
+        if manager is None:
+            from kivymd.uix.filemanager import MDFileManager
+            exit_manager, select_path, media = self.FILE_MANAGERS[kind]
+            manager = MDFileManager(exit_manager=getattr(self, exit_manager), select_path=getattr(self, select_path), ext=list(MEDIA_TYPES[media]))
+            self.file_managers[kind] = manager
+        return manager
+
+    def close_file_manager(self, kind):
+        # ఎప్పుడూ ఓపెన్ చేయని మేనేజర్ ని క్లోజ్ చేయడానికి తయారు చేయం
+        if kind in self.file_managers: self.file_managers[kind].close()
+
+    def file_manager_gallery_open(self): self.file_manager('gallery').show("/storage/emulated/0/")
+    def close_fm_gallery(self, *args): self.close_file_manager('gallery')
+    def file_manager_video_open(self): self.file_manager('video').show("/storage/emulated/0/")
+    def close_fm_video(self, *args): self.close_file_manager('video')
+    def file_manager_docs_open(self): self.file_manager('docs').show("/storage/emulated/0/")
+    def close_fm_docs(self, *args): self.close_file_manager('docs')
 
     def select_video(self, path):
-        self.close_fm_video(); self.open_external_intent(path, "video/*")
+        self.close_fm_video(); self.open_external_intent(path, MEDIA_MIME['video'])
 
     def select_generic(self, path):
-        self.fm_gallery.close(); self.fm_docs.close()
-        mime = "image/*" if path.lower().endswith(('.jpg', '.png', '.jpeg')) else "*/*"
-        self.open_external_intent(path, mime)
+        self.close_fm_docs()
+        self.open_external_intent(path, MEDIA_MIME.get(media_type(path), "*/*"))
+
+    # --- GALLERY (IN-APP GRID) ---
+    # మొదటి ఫోల్డర్: చివరిగా చూసింది, లేకపోతే కెమెరా ఫోటోలు
+    GALLERY_FOLDERS = ("/storage/emulated/0/DCIM/Camera", "/storage/emulated/0/DCIM", "/storage/emulated/0/Pictures")
+    gallery_model = None
+    gallery_thumbs = None
+    gallery_loader = None
+    gallery_folder = ""
+
+    def build_gallery_screen(self):
+        if self.root.has_screen('gallery'): return
+        self.gallery_model = TrackDataModel()
+        self.gallery_thumbs = GalleryThumbnails(ArtCache('vault_gallery_cache', GalleryThumbnails.CACHE_BUDGET))
+        self.root.add_widget(Builder.load_string(GALLERY_SCREEN_KV))
+
+    def open_gallery(self, folder=None):
+        if folder is None:
+            saved = self.store.get('gallery').get('folder') if self.store.exists('gallery') else None
+            candidates = ((saved,) if saved else ()) + self.GALLERY_FOLDERS
+            folder = next((f for f in candidates if os.path.isdir(f)), "/storage/emulated/0")
+        self.build_gallery_screen()
+        self.root.current = 'gallery'
+        self.gallery_thumbs.resume()
+        # పాత గ్రిడ్ కనిపిస్తూనే ఉంటుంది; కొత్త ఫోటోల కోసం ప్రతిసారీ బ్యాక్ గ్రౌండ్ లో మళ్ళీ లిస్ట్
+        if self.gallery_loader: self.gallery_loader.cancel()
+        self.gallery_folder = folder
+        self.gallery_title = os.path.basename(folder.rstrip('/')) or folder
+        self.gallery_loader = GalleryLoader(on_done=self.on_gallery_loaded)
+        self.gallery_loader.start(folder)
+
+    def on_gallery_loaded(self, folder, paths):
+        if folder != self.gallery_folder: return
+        self.gallery_model.data = GalleryView(paths)
+        self.gallery_title = f"{os.path.basename(folder.rstrip('/')) or folder} ({len(paths)})"
+        self.store.put('gallery', folder=folder)
+        event_log.event('gallery', f"{folder} ({len(paths)})")
+
+    def close_gallery(self):
+        if self.gallery_loader: self.gallery_loader.cancel()
+        self.gallery_thumbs.suspend()
+        self.root.current = 'main'
+
+    def select_gallery(self, path):
+        self.close_fm_gallery()
+        self.open_gallery(path if os.path.isdir(path) else os.path.dirname(path))
+
+    def open_gallery_item(self, path):
+        """ ఫుల్ స్క్రీన్ వ్యూ బయటి గ్యాలరీ యాప్ లో """
+        self.open_external_intent(path, MEDIA_MIME['image'])
+
+    # --- VIDEO LIBRARY ---
+    video_library = None
+    video_model = None
+    video_scanner = None
+    video_posters = None
+
+    def build_video_screen(self):
+        if self.root.has_screen('videos'): return
+        self.video_library = VideoIndex('vault_videos.db')
+        self.poster_cache = ArtCache('vault_poster_cache', VideoPosterPipeline.CACHE_BUDGET)
+        self.video_frames = video_frames()
+        self.video_model = TrackDataModel()
+        self.video_refresh = Clock.create_trigger(self.load_videos, 0.5)
+        self.root.add_widget(Builder.load_string(VIDEO_SCREEN_KV))
+
+    def open_videos(self):
+        self.build_video_screen()
+        self.root.current = 'videos'
+        self.load_videos()
+        self.scan_videos()
+
+    def load_videos(self, *args):
+        """ ఇండెక్స్ నుండి వెంటనే లిస్ట్ - స్టోరేజ్ చదవకుండా, పోస్టర్ తీయకుండా """
+        try: rows = self.video_library.all_videos()
+        except Exception as e:
+            print(f"Video Library Error: {str(e)}")
+            return
+        cache_dir = self.poster_cache.cache_dir
+        data = []
+        for path, name, duration, poster in rows:
+            info = os.path.basename(os.path.dirname(path))
+            if duration:
+                mins, secs = divmod(int(duration), 60)
+                hours, mins = divmod(mins, 60)
+                info = (f"{hours}:{mins:02}:{secs:02}" if hours else f"{mins}:{secs:02}") + "  •  " + info
+            data.append({'path': path, 'title': os.path.splitext(name)[0], 'info': info,
+                         'poster': os.path.join(cache_dir, poster) if poster else ""})
+        self.video_model.data = data
+        self.video_title = f"Movies ({len(data)})" if data else "Movies"
+
+    def scan_videos(self):
+        """ మారిన ఫోల్డర్లు మాత్రమే చదువుతుంది (ఫోల్డర్ mtime లు ఇండెక్స్ లో) """
+        if self.video_scanner and self.video_scanner.running: return
+        self.video_scanner = LibraryScanner(self.video_library, ScanRules(VIDEO_ROOTS), MEDIA_TYPES['video'],
+                                            on_batch=self.on_video_batch, on_done=self.on_video_scan_done)
+        self.video_scanner.start()
+
+    def on_video_batch(self, *args):
+        self.video_refresh()
+
+    def on_video_scan_done(self, added, removed):
+        event_log.event('videos', f"scan +{added} -{removed}")
+        self.video_refresh()
+        self.start_video_posters()
+
+    def start_video_posters(self):
+        if self.video_posters and self.video_posters.running: return
+        paths = self.video_library.untagged_paths()
+        if not paths: return
+        self.video_posters = VideoPosterPipeline(self.video_library, self.poster_cache, self.video_frames,
+                                                 on_batch=self.on_video_batch, on_done=self.on_video_posters_done)
+        self.video_posters.start(paths)
+
+    def on_video_posters_done(self, count):
+        event_log.event('videos', f"posters {count}")
+        self.video_refresh()
+
+    def close_videos(self):
+        # పోస్టర్లు బ్యాక్ గ్రౌండ్ లో కొనసాగుతాయి - తర్వాత ఓపెన్ చేసినప్పుడు సిద్ధంగా ఉంటాయి
+        self.root.current = 'main'
+
+    def play_video(self, path):
+        self.open_external_intent(path, MEDIA_MIME['video'])
 
     def open_external_intent(self, path, mime):
         if platform == 'android':
@@ -924,19 +4603,92 @@ class PrasadProApp(MDApp):
         if not self.player.open_system_dolby(): toast("Dolby Settings unavailable")
 
     def toggle_surround(self, instance, value):
+        if value == self.spatial_audio: return
+        self.spatial_audio = value
+        self.save_ui_state()
         if self.player.toggle_spatial_audio(value): toast(f"Spatial Audio: {'ACTIVE' if value else 'OFF'}")
 
+    # --- PERFORMANCE OVERLAY (METRICS) ---
+    def toggle_metrics_overlay(self, instance, value):
+        if value == self.metrics_overlay: return
+        self.metrics_overlay = value
+        self.store.put('debug', overlay=value)
+        metrics.enable(value)
+        if value: self.show_metrics_overlay()
+        else: self.hide_metrics_overlay()
+
+    def show_metrics_overlay(self):
+        """ స్క్రీన్ పైన చిన్న టెక్స్ట్ - సెకనుకు ఒకసారి మాత్రమే అప్ డేట్ (ఓవర్ లే వల్లే ఫ్రేమ్ లు ఆగకూడదు) """
+        if self.metrics_label is None:
+            from kivy.uix.label import Label
+            from kivy.graphics import Color, Rectangle
+            self.metrics_label = Label(size_hint=(None, None), font_size=dp(10), halign='left', color=(0.6, 1, 0.6, 1))
+            self.metrics_label.bind(texture_size=self.metrics_label.setter('size'))
+            with self.metrics_label.canvas.before:
+                Color(0, 0, 0, 0.65)
+                self.metrics_bg = Rectangle()
+        if self.metrics_label.parent is None: Window.add_widget(self.metrics_label)
+        if self.metrics_event is None:
+            self.metrics_event = Clock.schedule_interval(self.update_metrics_overlay, self.METRICS_REFRESH)
+        self.update_metrics_overlay(0)
+
+    def hide_metrics_overlay(self):
+        if self.metrics_event is not None:
+            self.metrics_event.cancel()
+            self.metrics_event = None
+        if self.metrics_label is not None and self.metrics_label.parent is not None:
+            Window.remove_widget(self.metrics_label)
+
+    def update_metrics_overlay(self, dt):
+        summary = metrics.summary()
+        frames = summary['frames']
+        lines = [f"FPS {frames.get('fps', 0)}  frame p95 {frames.get('p95_ms', 0)} ms  max {frames.get('max_ms', 0)}  jank {frames.get('janky', 0)}"]
+        for name, stats in sorted(summary['spans'].items()):
+            lines.append(f"{name}  x{stats['count']}  last {stats['last_ms']}  p95 {stats['p95_ms']} ms")
+        label = self.metrics_label
+        label.text = "\n".join(lines)
+        label.texture_update()
+        label.pos = (dp(6), Window.height - label.height - dp(30))
+        self.metrics_bg.pos = label.pos
+        self.metrics_bg.size = label.size
+
+    def export_metrics(self):
+        if not metrics.enabled:
+            toast("Turn on Performance Overlay first")
+            return
+        try:
+            path = metrics.export(startup_ms=self.startup_times, tracks=len(self.track_store))
+            toast(f"Metrics saved: {path}")
+        except Exception as e:
+            print(f"Metrics Error: {str(e)}")
+            toast("Could not save metrics")
+
     # --- FULL PLAYER OVERLAY ---
+    @metrics.timed('open_full_player')
     def open_full_player(self):
+        # ఒక్కసారే కడతాం, తర్వాత అదే ModalView ని మళ్ళీ ఓపెన్ చేస్తాం
+        if self.modal is None: self.build_full_player()
+        self.modal.open()
+
+    def build_full_player(self):
+        """ టైటిల్, ఆర్ట్, ప్లే ఐకాన్ లు యాప్ ప్రాపర్టీలకు ఒక్కసారి మాత్రమే బైండ్ అవుతాయి """
+        from kivy.uix.modalview import ModalView
+        from kivymd.uix.floatlayout import MDFloatLayout
+        from kivymd.uix.boxlayout import MDBoxLayout
+        from kivymd.uix.card import MDCard
+        from kivymd.uix.label import MDLabel, MDIcon
+        from kivymd.uix.button import MDIconButton, MDFillRoundFlatButton
+        from kivymd.uix.slider import MDSlider
+        from kivymd.uix.fitimage import FitImage
         self.modal = ModalView(size_hint=(1, 1), background_color=[0,0,0,1], overlay_color=[0,0,0,1])
         content = MDFloatLayout()
         
-        self.full_player_bg = FitImage(source=self.current_art, opacity=0.38)
+        self.full_player_bg = FitImage(source=self.art_bg, opacity=0.38)
         content.add_widget(self.full_player_bg)
         
         content.add_widget(MDLabel(text="NOW PLAYING", halign="center", pos_hint={"center_y": 0.95}, theme_text_color="Custom", text_color=[1, 0.8, 0, 1], font_style="Overline", bold=True))
         
-        self.full_player_art = FitImage(source=self.current_art, size_hint=(None, None), size=("330dp", "330dp"), pos_hint={"center_x": .5, "center_y": .66}, radius=[32,])
+        self.full_player_art = FitImage(source=self.art_large, size_hint=(None, None), size=("330dp", "330dp"), pos_hint={"center_x": .5, "center_y": .66}, radius=[32,])
         card = MDCard(size_hint=(None, None), size=("330dp", "330dp"), pos_hint={"center_x": .5, "center_y": .66}, radius=[32,], elevation=14)
         card.add_widget(self.full_player_art)
         content.add_widget(card)
@@ -951,6 +4703,13 @@ class PrasadProApp(MDApp):
         self.seek_slider.bind(on_touch_up=self.on_slider_seek)
         content.add_widget(self.seek_slider)
         
+        # VOLUME - ప్లేయర్ వాల్యూమ్ (సిస్టమ్ వాల్యూమ్ కాదు), రీలాంచ్ తర్వాత కూడా గుర్తుంటుంది
+        content.add_widget(MDIcon(icon="volume-low", size_hint=(None, None), size=("24dp", "24dp"), pos_hint={"center_x": .17, "center_y": 0.27}, theme_text_color="Custom", text_color=[1, 1, 1, 0.6]))
+        self.volume_slider = MDSlider(min=0, max=1, step=0.01, value=self.volume, hint=False, pos_hint={"center_x": .5, "center_y": 0.27}, size_hint=(0.56, None), height="36dp", color=[1, 1, 1, 0.8])
+        self.volume_slider.bind(value=self.set_volume)
+        content.add_widget(self.volume_slider)
+        content.add_widget(MDIcon(icon="volume-high", size_hint=(None, None), size=("24dp", "24dp"), pos_hint={"center_x": .83, "center_y": 0.27}, theme_text_color="Custom", text_color=[1, 1, 1, 0.6]))
+        
         controls = MDBoxLayout(orientation='horizontal', spacing="40dp", adaptive_size=True, pos_hint={"center_x": .5, "center_y": .20})
         btn_prev = MDIconButton(icon="skip-previous", icon_size="58sp", theme_text_color="Custom", text_color=[1,1,1,1], on_release=self.play_prev)
         self.btn_play_full = MDIconButton(icon="pause-circle" if self.is_playing else "play-circle", icon_size="95sp", theme_text_color="Custom", text_color=[1, 0.8, 0, 1], on_release=lambda x: self.toggle_full_play())
@@ -961,6 +4720,13 @@ class PrasadProApp(MDApp):
         controls.add_widget(btn_next)
         content.add_widget(controls)
         
+        # SHUFFLE / REPEAT - టైమ్ లేబుల్ కి రెండు వైపులా
+        self.btn_shuffle = MDIconButton(pos_hint={"center_x": .1, "center_y": 0.39}, theme_text_color="Custom", on_release=self.toggle_shuffle)
+        self.btn_repeat = MDIconButton(pos_hint={"center_x": .9, "center_y": 0.39}, theme_text_color="Custom", on_release=self.cycle_repeat)
+        content.add_widget(self.btn_shuffle)
+        content.add_widget(self.btn_repeat)
+        self.update_queue_icons()
+        
         # MINIMIZE BUTTON
         minimize_btn = MDFillRoundFlatButton(
             text="MINIMIZE", 
@@ -976,19 +4742,35 @@ class PrasadProApp(MDApp):
         content.add_widget(min_arrow)
         
         self.modal.add_widget(content)
-        self.modal.open()
-        self.bind(current_title=lambda inst, val: setattr(self.full_player_label, 'text', val))
+        self.modal.bind(on_open=lambda *a: self.set_full_player_visible(True),
+                        on_dismiss=lambda *a: self.set_full_player_visible(False))
+        self.bind(current_title=self.full_player_label.setter('text'),
+                  art_bg=self.full_player_bg.setter('source'),
+                  art_large=self.full_player_art.setter('source'),
+                  is_playing=self.update_full_play_icon,
+                  shuffle_mode=self.update_queue_icons,
+                  repeat_mode=self.update_queue_icons)
+
+    def update_full_play_icon(self, *args):
+        self.btn_play_full.icon = "pause-circle" if self.is_playing else "play-circle"
+
+    def update_queue_icons(self, *args):
+        on, off = [1, 0.8, 0, 1], [1, 1, 1, 0.5]
+        self.btn_shuffle.icon = "shuffle-variant" if self.shuffle_mode else "shuffle-disabled"
+        self.btn_shuffle.text_color = on if self.shuffle_mode else off
+        self.btn_repeat.icon = {'one': "repeat-once", 'all': "repeat"}.get(self.repeat_mode, "repeat-off")
+        self.btn_repeat.text_color = off if self.repeat_mode == 'off' else on
 
     def toggle_full_play(self):
-        self.toggle_play(); self.btn_play_full.icon = "pause-circle" if self.is_playing else "play-circle"
+        self.toggle_play()
 
     # --- MAIN FILE MANAGER CALL ---
     def file_manager_open(self): 
         # FIX: Opens Music File Manager when clicking Folder
-        self.fm_music.show("/storage/emulated/0/")
+        self.file_manager('music').show("/storage/emulated/0/")
         
-    def close_fm(self, *args): self.fm_music.close()
-    def select_path(self, path): self.close_fm(); self.play_song(path, os.path.basename(path))
+    def close_fm(self, *args): self.close_file_manager('music')
+    def select_path(self, path): self.close_fm(); self.queue.jump(path); self.play_song(path, self.track_title(path))
 
 if __name__ == '__main__':
     PrasadProApp().run()
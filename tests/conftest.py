@@ -0,0 +1,12 @@
+""" టెస్ట్ లకు కామన్ సెటప్: రిపో రూట్, benchmarks (fakes) ని path లో పెట్టి, Kivy ని హెడ్ లెస్ గా లోడ్ చేస్తుంది """
+import os
+import sys
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+os.environ.setdefault("KIVY_NO_FILELOG", "1")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "benchmarks")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,156 @@
+""" NativeAudioPlayer స్టేట్ మార్పులు - నకిలీ MediaPlayer తో (prepare ఆలస్యం, లిస్నర్లు వేరే థ్రెడ్ లో) """
+import threading
+import time
+
+import pytest
+from kivy.clock import Clock
+
+import main
+from fakes import FakeMediaPlayer
+
+
+class QuickPlayer(FakeMediaPlayer):
+    prepare_latency = 0.02
+    duration_ms = 150
+
+
+class BrokenPlayer(QuickPlayer):
+    """ '.bad' ఫైల్స్ prepare లో లోపం ఇస్తాయి (ఆండ్రాయిడ్ లో MEDIA_ERROR_UNKNOWN / ERROR_UNSUPPORTED) """
+    def prepareAsync(self):
+        if not self.source.endswith('.bad'): return super().prepareAsync()
+        self.state = 'preparing'
+        def fail():
+            self.state = 'error'
+            if self.on_error: self.on_error.onError(self, 1, -1010)
+        timer = threading.Timer(self.prepare_latency, fail)
+        timer.daemon = True
+        timer.start()
+
+
+class SyncPlayer(QuickPlayer):
+    """ లిస్నర్లను పిలిచిన థ్రెడ్ లోనే ఇస్తుంది - reset పాత prepare కి error, prepareAsync వెంటనే onPrepared """
+    def reset(self):
+        stale = self.state == 'preparing'
+        super().reset()
+        if stale and self.on_error: self.on_error.onError(self, -38, 0)
+
+    def prepareAsync(self):
+        self.prepare_calls += 1
+        self._prepared()
+        if self.on_prepared: self.on_prepared.onPrepared(self)
+
+
+def pump(until, timeout=3.0):
+    """ Kivy Clock ని చేత్తో తిప్పుతుంది (యాప్ లూప్ లేకుండా) - until() నిజం అయ్యే వరకు """
+    end = time.monotonic() + timeout
+    while not until():
+        assert time.monotonic() < end, "timed out"
+        Clock.tick()
+        time.sleep(0.005)
+
+
+class Harness:
+    """ యాప్ చేసేదే: సిద్ధమైతే ప్లే + తర్వాతిది ప్రీలోడ్, అయిపోతే / లోపం వస్తే క్యూ లో తర్వాతిది """
+    def __init__(self, cls, paths, gapless=False):
+        self.player = main.NativeAudioPlayer(media_player_cls=cls)
+        self.queue = main.PlayQueue()
+        self.queue.set_tracks(paths)
+        self.gapless = gapless
+        self.events = []
+        self.player.on_complete = self.complete
+        self.player.on_track_changed = self.changed
+        self.player.on_error = self.error
+
+    def play(self, path):
+        self.queue.jump(path)
+        assert self.player.load(path, on_ready=self.ready)
+
+    def ready(self, path):
+        self.events.append(('ready', path))
+        self.player.play()
+        if self.gapless: self.player.preload_next(self.queue.peek_next())
+
+    def complete(self):
+        self.events.append(('complete', self.queue.current))
+        path = self.queue.advance(auto=True)
+        if path: self.play(path)
+
+    def changed(self, path):
+        self.queue.advance(auto=True)
+        self.events.append(('changed', path))
+        if self.gapless: self.player.preload_next(self.queue.peek_next())
+
+    def error(self, path, what, extra):
+        self.events.append(('error', path))
+        path = self.queue.advance(auto=True)
+        if path: self.play(path)
+
+
+def test_load_is_async_and_becomes_prepared():
+    h = Harness(QuickPlayer, ['/m/a.mp3'])
+    h.play('/m/a.mp3')
+    assert not h.player.is_prepared and h.player.loading_path == '/m/a.mp3'
+    pump(lambda: h.events)
+    assert h.events == [('ready', '/m/a.mp3')]
+    assert h.player.is_prepared and h.player.loading_path is None
+    assert h.player.get_duration() == pytest.approx(0.15)
+    assert h.player.player.state == 'started'
+
+
+def test_rapid_loads_prepare_only_the_latest():
+    h = Harness(QuickPlayer, ['/m/a.mp3', '/m/b.mp3', '/m/c.mp3'])
+    for path in h.queue.paths: h.play(path)
+    pump(lambda: h.events)
+    time.sleep(QuickPlayer.prepare_latency * 2)
+    Clock.tick()
+    assert h.events == [('ready', '/m/c.mp3')]
+    assert h.player.player.prepared_sources == ['/m/c.mp3']
+
+
+def test_complete_loads_next_track():
+    h = Harness(QuickPlayer, ['/m/a.mp3', '/m/b.mp3'])
+    h.play('/m/a.mp3')
+    pump(lambda: ('ready', '/m/b.mp3') in h.events)
+    assert h.events == [('ready', '/m/a.mp3'), ('complete', '/m/a.mp3'), ('ready', '/m/b.mp3')]
+    pump(lambda: h.events[-1] == ('complete', '/m/b.mp3'))
+    assert h.queue.advance(auto=True) is None     # repeat ఆఫ్ - క్యూ చివర
+
+
+def test_gapless_hands_off_to_preloaded_player():
+    h = Harness(QuickPlayer, ['/m/a.mp3', '/m/b.mp3'], gapless=True)
+    h.play('/m/a.mp3')
+    pump(lambda: ('changed', '/m/b.mp3') in h.events)
+    assert h.events == [('ready', '/m/a.mp3'), ('changed', '/m/b.mp3')]
+    assert h.player.player.source == '/m/b.mp3' and h.player.player.state == 'started'
+    assert h.player.next_player.state == 'idle'    # పూర్తైన ప్లేయర్ reset అయింది
+
+
+def test_error_skips_to_next_track():
+    h = Harness(BrokenPlayer, ['/m/a.bad', '/m/b.mp3'])
+    h.play('/m/a.bad')
+    pump(lambda: ('ready', '/m/b.mp3') in h.events)
+    assert h.events == [('error', '/m/a.bad'), ('ready', '/m/b.mp3')]
+    assert h.player.is_prepared and h.player.player.state == 'started'
+
+
+def test_broken_preload_keeps_current_track():
+    h = Harness(BrokenPlayer, ['/m/a.mp3', '/m/b.bad'], gapless=True)
+    h.play('/m/a.mp3')
+    pump(lambda: h.events and h.player.next_path is None)
+    assert h.events == [('ready', '/m/a.mp3')]
+    assert h.player.is_prepared and not h.player.next_ready
+
+
+def test_listeners_delivered_on_calling_thread_do_not_deadlock():
+    h = Harness(SyncPlayer, ['/m/a.mp3', '/m/b.mp3'])
+    done = threading.Event()
+    def tap():
+        h.play('/m/a.mp3')
+        h.player.player.state = 'preparing'     # reset లో పాత prepare కి error వస్తుంది
+        h.play('/m/b.mp3')
+        done.set()
+    threading.Thread(target=tap, daemon=True).start()
+    assert done.wait(2), "load() deadlocked on a synchronously delivered listener"
+    pump(lambda: h.events)
+    Clock.tick()
+    assert h.events == [('ready', '/m/b.mp3')]